@@ -0,0 +1,177 @@
+# ===================== PRUEBA DE CARGA DE LA API =====================
+# Levanta serve_api.py en un subproceso (o usa una API que ya esté corriendo con --url) y le tira pedidos desde
+# muchas conexiones HTTP/1.1 keep-alive a la vez, con asyncio y sockets crudos (sin dependencias extra, así el
+# cliente gasta lo menos posible y lo que se mide es el servidor). Mezcla las rutas de la API: tops, países,
+# cumpleaños al azar, victorias de pilotos y escuderías, y algunos rangos de temporadas distintos del completo.
+#
+# Corre dos rondas: una pidiendo el cuerpo (con gzip/br si la API los tiene) y otra revalidando con
+# If-None-Match, que debería contestar todo con 304. Reporta pedidos por segundo, latencia p50/p95/p99,
+# bytes recibidos y los códigos de estado.
+#
+# Uso:
+#   python benchmarks/bench_api.py [--conexiones 64] [--segundos 10] [--salida api.json]
+#   python benchmarks/bench_api.py --url http://127.0.0.1:8600
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(CARPETA)
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def leer_json(url):
+    with urllib.request.urlopen(url) as respuesta:
+        return json.load(respuesta)
+
+
+def esperar(url, segundos=120):
+    limite = time.monotonic() + segundos
+    while time.monotonic() < limite:
+        try:
+            return leer_json(url + "/api")
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"La API no respondió en {url}")
+
+
+# Rutas para la mezcla, con los nombres reales que tiene la API
+def rutas(url, semilla):
+    azar = random.Random(semilla)
+    indice = leer_json(url + "/api")["datos"]
+    temporadas = indice["temporadas"]
+    pilotos = leer_json(url + "/api/pilotos")["datos"]
+    escuderias = leer_json(url + "/api/escuderias")["datos"]
+
+    lista = ["/api", "/api/paises", "/api/top/pilotos", "/api/top/escuderias", "/api/top/paises?n=10"]
+    lista += [f"/api/cumpleanos?mes={azar.randint(1, 12)}&dia={azar.randint(1, 28)}" for _ in range(40)]
+    lista += ["/api/pilotos/" + urllib.parse.quote(nombre) for nombre in azar.sample(pilotos, min(20, len(pilotos)))]
+    lista += ["/api/escuderias/" + urllib.parse.quote(nombre) for nombre in azar.sample(escuderias, min(10, len(escuderias)))]
+    # Algunos rangos de temporadas distintos del completo (se calculan en el primer pedido y después van al LRU)
+    for _ in range(10):
+        desde = azar.choice(temporadas)
+        hasta = azar.choice([t for t in temporadas if t >= desde])
+        lista.append(f"/api/top/pilotos?desde={desde}&hasta={hasta}")
+    return lista
+
+
+# ===================== CLIENTE =====================
+
+async def leer_respuesta(lector):
+    linea_estado = await lector.readline()
+    if not linea_estado:
+        raise ConnectionError("el servidor cerró la conexión")
+    estado = int(linea_estado.split()[1])
+    cabeceras = {}
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        cabeceras[nombre.strip().lower()] = valor.strip()
+    largo = int(cabeceras.get("content-length", 0))
+    cuerpo = await lector.readexactly(largo) if largo else b""
+    return estado, cabeceras, cuerpo
+
+
+async def conexion(host, puerto, pedidos, etags, revalidar, hasta, resultados, azar):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        while time.perf_counter() < hasta:
+            ruta = azar.choice(pedidos)
+            cabeceras = f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: br, gzip\r\n"
+            if revalidar and ruta in etags:
+                cabeceras += f"If-None-Match: {etags[ruta]}\r\n"
+            inicio = time.perf_counter()
+            escritor.write((cabeceras + "\r\n").encode("latin-1"))
+            estado, respuesta, cuerpo = await leer_respuesta(lector)
+            resultados["latencias"].append(time.perf_counter() - inicio)
+            resultados["estados"][estado] = resultados["estados"].get(estado, 0) + 1
+            resultados["bytes"] += len(cuerpo)
+            if "etag" in respuesta:
+                etags[ruta] = respuesta["etag"]
+    finally:
+        escritor.close()
+
+
+async def ronda(host, puerto, pedidos, etags, revalidar, conexiones, segundos, semilla):
+    resultados = {"latencias": [], "estados": {}, "bytes": 0}
+    hasta = time.perf_counter() + segundos
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        conexion(host, puerto, pedidos, etags, revalidar, hasta, resultados, random.Random(semilla + i))
+        for i in range(conexiones)
+    ))
+    duracion = time.perf_counter() - inicio
+    latencias = sorted(resultados["latencias"])
+    cuantil = lambda q: latencias[min(len(latencias) - 1, int(q * len(latencias)))] * 1000  # noqa: E731
+    return {
+        "pedidos": len(latencias),
+        "pedidos_por_s": round(len(latencias) / duracion, 1),
+        "p50_ms": round(cuantil(0.50), 3),
+        "p95_ms": round(cuantil(0.95), 3),
+        "p99_ms": round(cuantil(0.99), 3),
+        "media_ms": round(statistics.fmean(latencias) * 1000, 3),
+        "bytes_por_pedido": round(resultados["bytes"] / len(latencias), 1),
+        "estados": {str(k): v for k, v in sorted(resultados["estados"].items())},
+    }
+
+
+def benchmark(url, conexiones, segundos, semilla):
+    partes = urllib.parse.urlsplit(url)
+    pedidos = rutas(url, semilla)
+    etags = {}
+    # Una pasada para que los rangos nuevos ya estén calculados y tener los ETags
+    asyncio.run(ronda(partes.hostname, partes.port, pedidos, etags, False, 1, 0.5, semilla))
+    return {
+        "rutas": len(pedidos),
+        "conexiones": conexiones,
+        "completo": asyncio.run(ronda(partes.hostname, partes.port, pedidos, etags, False, conexiones, segundos, semilla)),
+        "revalidando": asyncio.run(ronda(partes.hostname, partes.port, pedidos, etags, True, conexiones, segundos, semilla)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API local")
+    parser.add_argument("--url", help="API ya levantada (si no, se levanta una con serve_api.py)")
+    parser.add_argument("--conexiones", type=int, default=64)
+    parser.add_argument("--segundos", type=float, default=10)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    args = parser.parse_args()
+
+    servidor = None
+    url = args.url
+    if url is None:
+        puerto = puerto_libre()
+        url = f"http://127.0.0.1:{puerto}"
+        servidor = subprocess.Popen([sys.executable, os.path.join(RAIZ, "serve_api.py"), "--puerto", str(puerto)],
+                                    stdout=subprocess.DEVNULL)
+    try:
+        esperar(url.rstrip("/"))
+        salida = benchmark(url.rstrip("/"), args.conexiones, args.segundos, args.semilla)
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
+
+    texto = json.dumps(salida, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
@@ -0,0 +1,269 @@
+# ===================== BENCHMARK DE RERUNS (AppTest) =====================
+# Corre f_1_birthday_gp_app.py sin navegador con streamlit.testing.v1.AppTest y mide cada interacción:
+# tiempo, memoria pico (tracemalloc), memoria de Arrow y cantidad/tamaño de los elementos que la app manda
+# al navegador. (tracemalloc solo ve la memoria de Python: los buffers de Arrow van por su propio allocator,
+# por eso los mido aparte con pa.total_allocated_bytes().)
+# Lo hace con el almacén de los 50s y con almacenes sintéticos 10x / 100x / 1000x (ver datos_sinteticos.py).
+#
+# Uso:
+#   python benchmarks/bench_app.py                                  -> imprime el JSON con los resultados
+#   python benchmarks/bench_app.py --salida resultados.json
+#   python benchmarks/bench_app.py --guardar-baseline               -> guarda benchmarks/baseline_app.json
+#   python benchmarks/bench_app.py --margen 0.25                    -> compara con benchmarks/baseline_app.json
+#   python benchmarks/bench_app.py --baseline ''                    -> sin comparar
+# Termina con código 1 si alguna medición empeora más que el margen respecto del baseline, o si algún rerun
+# ya con caché tarda más que el presupuesto (--presupuesto, en segundos).
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(CARPETA)
+APP = os.path.join(RAIZ, "f_1_birthday_gp_app.py")
+BASELINE = os.path.join(CARPETA, "baseline_app.json")
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, CARPETA)
+
+import pyarrow as pa  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import datos_sinteticos  # noqa: E402
+import f1_almacen  # noqa: E402
+import f1_datos  # noqa: E402
+
+
+# ===================== INTERACCIONES =====================
+# Cada paso recibe el AppTest ya cargado, toca un widget y hace el rerun.
+
+def selectbox(at, etiqueta):
+    return next(w for w in at.selectbox if w.label == etiqueta)
+
+
+def boton(at, etiqueta):
+    return next(w for w in at.button if w.label.startswith(etiqueta))
+
+
+def cumple_acierto(at):
+    selectbox(at, "Día").select(13)
+    selectbox(at, "Mes").select("Mayo")
+    at.run()
+
+
+def cumple_sin_carrera(at):
+    selectbox(at, "Día").select(1)
+    selectbox(at, "Mes").select("Enero")
+    at.run()
+
+
+def elegir_piloto(at):
+    selectbox(at, "Selecciona un piloto ganador").select("Juan Manuel Fangio")
+    at.run()
+
+
+def elegir_escuderia(at):
+    selectbox(at, "Selecciona una escudería ganadora").select("Ferrari")
+    at.run()
+
+
+def test_pregunta(i):
+    def paso(at):
+        at.selectbox(key=f"preg_{i}").select_index(1)
+        at.run()
+    return paso
+
+
+def test_resultado(at):
+    boton(at, "Descubrir").click()
+    at.run()
+
+
+def trivia_responder(at):
+    at.radio[0].set_value(at.radio[0].options[1])
+    boton(at, "Comprobar respuesta").click()
+    at.run()
+
+
+def trivia_siguiente(at):
+    boton(at, "Siguiente pregunta").click()
+    at.run()
+
+
+PASOS = [
+    ("cumple_acierto", cumple_acierto),
+    ("cumple_sin_carrera", cumple_sin_carrera),
+    ("piloto", elegir_piloto),
+    ("escuderia", elegir_escuderia),
+    ("test_pregunta_1", test_pregunta(0)),
+    ("test_pregunta_2", test_pregunta(1)),
+    ("test_pregunta_3", test_pregunta(2)),
+    ("test_resultado", test_resultado),
+]
+PREGUNTAS_TRIVIA = 6
+for n in range(1, PREGUNTAS_TRIVIA + 1):
+    PASOS.append((f"trivia_{n}_responder", trivia_responder))
+    PASOS.append((f"trivia_{n}_siguiente", trivia_siguiente))
+
+
+# ===================== MEDICIÓN =====================
+
+def elementos(at):
+    def recorrer(nodo):
+        for hijo in getattr(nodo, "children", {}).values():
+            yield hijo
+            yield from recorrer(hijo)
+
+    cantidad, tamanio = 0, 0
+    for nodo in recorrer(at._tree):
+        proto = getattr(nodo, "proto", None)
+        if proto is not None and hasattr(proto, "ByteSize"):
+            cantidad += 1
+            tamanio += proto.ByteSize()
+    return cantidad, tamanio
+
+
+def vaciar_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    f1_datos.leer_particion.cache_clear()
+    f1_almacen.almacen().vaciar()
+
+
+# La trivia sortea las preguntas con una semilla por sesión; la fijo para que cada corrida (y el baseline)
+# responda siempre las mismas preguntas con las mismas opciones
+SEMILLA_TRIVIA = 1950
+
+
+def nueva_app(periodo):
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.session_state["trivia_semilla"] = SEMILLA_TRIVIA
+    if periodo:
+        at.run()
+        selectbox(at, "Período").select(periodo)
+    return at
+
+
+def medir(paso, at, memoria):
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    paso(at)
+    tiempo = time.perf_counter() - inicio
+    pico = 0
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if at.exception:
+        raise RuntimeError(f"La app tiró una excepción: {at.exception[0].message}")
+    return tiempo, pico, pa.total_allocated_bytes()
+
+
+# Una corrida completa del escenario: carga en frío y después todos los pasos en orden
+def escenario(periodo, memoria):
+    resultados = {}
+    vaciar_caches()
+    at = nueva_app(periodo)
+    if periodo:
+        vaciar_caches()
+    resultados["carga_fria"] = medir(lambda a: a.run(), at, memoria) + elementos(at)
+    resultados["rerun_caliente"] = medir(lambda a: a.run(), at, memoria) + elementos(at)
+    for nombre, paso in PASOS:
+        resultados[nombre] = medir(paso, at, memoria) + elementos(at)
+    return resultados
+
+
+def benchmark(escalas, repeticiones, periodo):
+    salida = {}
+    for factor in escalas:
+        with tempfile.TemporaryDirectory() as carpeta:
+            filas = datos_sinteticos.construir_almacen(factor, carpeta)
+            f1_datos.usar_historia(carpeta)
+
+            # Primero mido los tiempos (sin tracemalloc, que los infla) y después la memoria en otra corrida
+            tiempos = [escenario(periodo, memoria=False) for _ in range(repeticiones)]
+            memoria = escenario(periodo, memoria=True)
+
+        pasos = {}
+        for nombre in tiempos[0]:
+            pasos[nombre] = {
+                "tiempo_s": round(statistics.median(t[nombre][0] for t in tiempos), 4),
+                "memoria_pico_kb": round(memoria[nombre][1] / 1024, 1),
+                "arrow_kb": round(memoria[nombre][2] / 1024, 1),
+                "elementos": tiempos[0][nombre][3],
+                "bytes": tiempos[0][nombre][4],
+            }
+        salida[f"x{factor}"] = {"filas": filas, "pasos": pasos}
+    return salida
+
+
+# ===================== COMPARACIÓN CON EL BASELINE =====================
+# Para no fallar por ruido en pasos muy rápidos, cada métrica tiene además un piso absoluto
+
+PISOS = {"tiempo_s": 0.02, "memoria_pico_kb": 256, "arrow_kb": 256, "elementos": 0, "bytes": 256}
+
+
+def regresiones(actual, baseline, margen):
+    problemas = []
+    for escala, datos in actual.items():
+        for paso, metricas in datos["pasos"].items():
+            previo = baseline.get(escala, {}).get("pasos", {}).get(paso)
+            if not previo:
+                continue
+            for metrica, valor in metricas.items():
+                limite = max(previo[metrica] * (1 + margen), previo[metrica] + PISOS[metrica])
+                if valor > limite:
+                    problemas.append(f"{escala} / {paso} / {metrica}: {valor} (baseline {previo[metrica]})")
+    return problemas
+
+
+def fuera_de_presupuesto(actual, presupuesto):
+    return [
+        f"{escala} / {paso}: {metricas['tiempo_s']} s (presupuesto {presupuesto} s)"
+        for escala, datos in actual.items()
+        for paso, metricas in datos["pasos"].items()
+        if paso != "carga_fria" and metricas["tiempo_s"] > presupuesto
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de reruns de la app con AppTest")
+    parser.add_argument("--escalas", type=int, nargs="+", default=sorted(datos_sinteticos.ESCALAS))
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--periodo", default="Toda la historia", help="opción del selector de período ('' = la de por defecto)")
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    parser.add_argument("--baseline", default=BASELINE if os.path.exists(BASELINE) else None,
+                        help="JSON con el que comparar (por defecto benchmarks/baseline_app.json; '' = no comparar)")
+    parser.add_argument("--margen", type=float, default=0.25, help="cuánto puede empeorar cada métrica (0.25 = 25%%)")
+    parser.add_argument("--presupuesto", type=float, default=2.0, help="máximo en segundos para un rerun con caché")
+    parser.add_argument("--guardar-baseline", action="store_true")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline and not args.guardar_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    resultados = benchmark(args.escalas, args.repeticiones, args.periodo)
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    if args.guardar_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
+
+    problemas = fuera_de_presupuesto(resultados, args.presupuesto)
+    if baseline:
+        problemas += regresiones(resultados, baseline, args.margen)
+    if problemas:
+        print("\nRegresiones:", file=sys.stderr)
+        for problema in problemas:
+            print(f"  - {problema}", file=sys.stderr)
+        sys.exit(1)
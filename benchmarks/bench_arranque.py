@@ -0,0 +1,107 @@
+# ===================== BENCHMARK DE ARRANQUE =====================
+# Mide lo que paga un proceso nuevo (por ejemplo cuando el autoscaling levanta otra instancia):
+# - cuánto tarda en importarse cada librería en un intérprete limpio;
+# - cuánto tarda la primera corrida de la app hasta mandar el primer elemento al navegador, y hasta terminar.
+# Cada medición corre en un subproceso nuevo para que nada venga ya importado ni cacheado.
+#
+# Uso:
+#   python benchmarks/bench_arranque.py [--repeticiones 5] [--salida arranque.json]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(CARPETA)
+APP = os.path.join(RAIZ, "f_1_birthday_gp_app.py")
+
+MODULOS = ["streamlit", "numpy", "pandas", "pyarrow", "altair", "pydeck", "f1_datos", "f1_indices", "f1_agregados", "f1_graficos", "f1_mapa", "f1_consultas", "f1_temporadas", "f1_puntos", "f1_trivia", "f1_duelos", "f1_estatico"]
+
+
+# ===================== LO QUE CORRE EN CADA SUBPROCESO =====================
+
+def hijo_importar(modulo):
+    sys.path.insert(0, RAIZ)
+    inicio = time.perf_counter()
+    __import__(modulo)
+    return {"import_s": time.perf_counter() - inicio}
+
+
+def hijo_primer_elemento():
+    sys.path.insert(0, RAIZ)
+    # Lo que importa el servidor antes de atender a nadie (no cuenta para el primer elemento)
+    inicio_servidor = time.perf_counter()
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+    servidor_s = time.perf_counter() - inicio_servidor
+
+    # Anoto cuándo sale el primer mensaje con un elemento (delta) hacia el navegador
+    marcas = {}
+    enqueue_original = ScriptRunContext.enqueue
+
+    def enqueue(self, msg):
+        if "primer_elemento" not in marcas and msg.WhichOneof("type") == "delta":
+            marcas["primer_elemento"] = time.perf_counter()
+        return enqueue_original(self, msg)
+
+    ScriptRunContext.enqueue = enqueue
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    inicio = time.perf_counter()
+    at.run()
+    total = time.perf_counter() - inicio
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {
+        "servidor_import_s": servidor_s,
+        "primer_elemento_s": marcas["primer_elemento"] - inicio,
+        "primera_corrida_s": total,
+    }
+
+
+# ===================== ORQUESTACIÓN =====================
+
+def correr_hijo(*argumentos):
+    salida = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--hijo", *argumentos],
+        capture_output=True, text=True, check=True, cwd=RAIZ,
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def mediana(mediciones):
+    return {clave: round(statistics.median(m[clave] for m in mediciones), 4) for clave in mediciones[0]}
+
+
+def benchmark(repeticiones):
+    importaciones = {
+        modulo: mediana([correr_hijo("importar", modulo) for _ in range(repeticiones)])["import_s"]
+        for modulo in MODULOS
+    }
+    arranque = mediana([correr_hijo("primer-elemento") for _ in range(repeticiones)])
+    return {"import_s": importaciones, "arranque": arranque}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--hijo":
+        if sys.argv[2] == "importar":
+            resultado = hijo_importar(sys.argv[3])
+        else:
+            resultado = hijo_primer_elemento()
+        print(json.dumps(resultado))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío de la app")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    args = parser.parse_args()
+
+    texto = json.dumps(benchmark(args.repeticiones), indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
@@ -0,0 +1,114 @@
+# ===================== BENCHMARK DE GRÁFICOS SERIALIZADOS =====================
+# Compara, para cada escala de datos (ver datos_sinteticos.py), lo que costaba en cada rerun armar y serializar
+# los dos gráficos de barras y el mapa contra lo que cuesta ahora reusar el spec cacheado (f1_graficos.py):
+# - tiempo por rerun: antes = armar el Chart/Deck + to_dict/to_json; ahora = copiar el spec de cada gráfico
+#   (el mapa se manda tal cual);
+# - bytes por rerun: el JSON que viaja por el websocket en cada caso (el de pydeck viene con indentación).
+#
+# Uso:
+#   python benchmarks/bench_graficos.py [--escalas 1 10] [--repeticiones 20] [--salida graficos.json]
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(CARPETA))
+sys.path.insert(0, CARPETA)
+
+import altair as alt  # noqa: E402
+
+import datos_sinteticos  # noqa: E402
+import f1_datos  # noqa: E402
+import f1_graficos  # noqa: E402
+from f1_agregados import CuboVictorias  # noqa: E402
+from f1_mapa import JerarquiaClusters, puntos_circuitos  # noqa: E402
+
+GRAFICOS = [("piloto", "Piloto", "crimson"), ("escuderia", "Escudería", "steelblue")]
+VISTA = (1.2, 20, 0)  # zoom, latitud y longitud de la vista por defecto del mapa
+
+
+# Lo que pasaba antes en cada rerun: armar el Chart y el Deck desde cero y serializarlos
+def sin_cache(cubo, circuitos):
+    specs = []
+    for dimension, columna, color in GRAFICOS:
+        top5 = cubo.top(dimension, 5, [columna, "Victorias"])
+        chart = alt.Chart(top5).mark_bar(color=color).encode(
+            x=alt.X("Victorias:Q", axis=alt.Axis(title="Victorias", format="d")),
+            y=alt.Y(f"{columna}:N", sort='-x', title=""),
+            tooltip=[columna, "Victorias"]
+        ).properties(width=600, height=250)
+        with alt.theme.enable("none"):
+            specs.append(json.dumps(chart.to_dict()))
+    jerarquia = JerarquiaClusters(puntos_circuitos(circuitos, cubo.conteo("circuito")))
+    deck = f1_graficos.deck_circuitos(jerarquia.vista(*VISTA), *VISTA)
+    specs.append(deck.to_json())
+    return specs
+
+
+# Lo que pasa ahora: los specs ya están hechos. Los de Vega-Lite los copio con json.loads (Streamlit modifica
+# el dict) y Streamlit los vuelve a pasar a texto igual que antes; el del mapa se manda tal cual
+def con_cache(graficos, mapa):
+    return [json.dumps(json.loads(spec)) for spec in graficos] + [mapa.to_json()]
+
+
+def cronometrar(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), sum(len(spec.encode("utf-8")) for spec in resultado)
+
+
+def benchmark(escalas, repeticiones):
+    salida = {}
+    for factor in escalas:
+        with tempfile.TemporaryDirectory() as carpeta:
+            filas = datos_sinteticos.construir_almacen(factor, carpeta)
+            f1_datos.usar_historia(carpeta)
+            temporadas = f1_datos.temporadas_disponibles()
+            cubo = CuboVictorias(f1_datos.ganadores(temporadas[0], temporadas[-1]))
+            circuitos = f1_datos.leer_circuitos()
+
+        inicio = time.perf_counter()
+        graficos = [f1_graficos.grafico_barras(cubo.top(d, 5, [c, "Victorias"]), c, color) for d, c, color in GRAFICOS]
+        jerarquia = JerarquiaClusters(puntos_circuitos(circuitos, cubo.conteo("circuito")))
+        mapa = f1_graficos.mapa_circuitos(jerarquia, *VISTA)
+        armado = time.perf_counter() - inicio
+
+        antes_s, antes_bytes = cronometrar(lambda: sin_cache(cubo, circuitos), repeticiones)
+        ahora_s, ahora_bytes = cronometrar(lambda: con_cache(graficos, mapa), repeticiones)
+        salida[f"x{factor}"] = {
+            "filas": filas,
+            "circuitos": len(circuitos),
+            "puntos_mapa": mapa.filas,
+            "armado_unico_s": round(armado, 4),
+            "por_rerun": {
+                "sin_cache_s": round(antes_s, 5),
+                "con_cache_s": round(ahora_s, 5),
+                "ahorro_s": round(antes_s - ahora_s, 5),
+                "sin_cache_bytes": antes_bytes,
+                "con_cache_bytes": ahora_bytes,
+                "ahorro_bytes": antes_bytes - ahora_bytes,
+            },
+        }
+    return salida
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de los gráficos y el mapa serializados")
+    parser.add_argument("--escalas", type=int, nargs="+", default=sorted(datos_sinteticos.ESCALAS))
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    args = parser.parse_args()
+
+    texto = json.dumps(benchmark(args.escalas, args.repeticiones), indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
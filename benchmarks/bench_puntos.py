@@ -0,0 +1,92 @@
+# ===================== BENCHMARK DEL CAMPEONATO =====================
+# Mide cuánto tarda f1_puntos.py en calcular el campeonato de pilotos y constructores de todas las temporadas
+# a la vez, con los almacenes sintéticos 1x / 10x / 100x / 1000x (ver datos_sinteticos.py: todas las posiciones
+# de cada carrera, con años que cruzan varias épocas de reglas). A cada carrera le marco una vuelta rápida al azar.
+# También mide agregar una carrera al final (con_carrera, que recalcula solo esa temporada) contra volver a
+# calcular todo, y revisa que las dos cosas den lo mismo.
+#
+# Uso:
+#   python benchmarks/bench_puntos.py [--escalas 1 10 100 1000] [--repeticiones 5] [--salida puntos.json]
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(CARPETA))
+sys.path.insert(0, CARPETA)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import datos_sinteticos  # noqa: E402
+from f1_puntos import Campeonatos, calcular  # noqa: E402
+
+
+def con_vueltas_rapidas(df, semilla=0):
+    rng = np.random.default_rng(semilla)
+    df = df.copy()
+    carreras = df.groupby(["Year", "Round"]).indices
+    elegidas = [filas[rng.integers(len(filas))] for filas in carreras.values()]
+    df["VueltaRapida"] = False
+    df.loc[df.index[elegidas], "VueltaRapida"] = True
+    return df
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return round(statistics.median(tiempos) * 1000, 2)
+
+
+def escala(factor, repeticiones):
+    df = con_vueltas_rapidas(datos_sinteticos.generar(factor))
+    # La última carrera queda aparte para agregarla después
+    ultimo = df["Year"].max()
+    ronda = df.loc[df["Year"] == ultimo, "Round"].max()
+    es_ultima = (df["Year"] == ultimo) & (df["Round"] == ronda)
+    sin_ultima, ultima = df[~es_ultima], df[es_ultima]
+
+    campeonatos = Campeonatos(sin_ultima)
+    completo = Campeonatos(df)
+    agregado = campeonatos.con_carrera(ultima)
+    for columna in ("pilotos", "escuderias"):
+        pd.testing.assert_frame_equal(getattr(agregado, columna).reset_index(drop=True),
+                                      getattr(completo, columna).reset_index(drop=True), check_dtype=False)
+
+    return {
+        "factor": factor,
+        "filas": len(df),
+        "temporadas": int(df["Year"].nunique()),
+        "carreras": int(df.groupby(["Year", "Round"]).ngroups),
+        "todo_ms": medir(lambda: calcular(df), repeticiones),
+        "agregar_una_carrera_ms": medir(lambda: campeonatos.con_carrera(ultima), repeticiones),
+        "una_temporada_ms": medir(lambda: completo.temporada_pilotos(int(ultimo)), repeticiones),
+        "filas_en_posiciones": len(completo.pilotos) + len(completo.escuderias),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del cálculo del campeonato")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        choices=sorted(datos_sinteticos.ESCALAS))
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    args = parser.parse_args()
+
+    resultados = []
+    for factor in args.escalas:
+        resultados.append(escala(factor, args.repeticiones))
+        print(json.dumps(resultados[-1], ensure_ascii=False), file=sys.stderr)
+
+    texto = json.dumps(resultados, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
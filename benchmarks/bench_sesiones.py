@@ -0,0 +1,290 @@
+# ===================== PRUEBA DE CARGA CON SESIONES CONCURRENTES =====================
+# ¿Cuántos visitantes a la vez aguanta un proceso de Streamlit antes de que los reruns se vuelvan lentos?
+# Levanta la app con `streamlit run` en un puerto libre y abre N sesiones simuladas por el mismo websocket que usa
+# el navegador (/_stcore/stream, mensajes protobuf BackMsg/ForwardMsg), sin navegador y sin internet.
+#
+# Cada sesión hace lo que haría el navegador: pide la primera corrida, guarda el id de cada widget a medida que
+# llegan los elementos, y para interactuar manda un rerun con el estado de todos sus widgets (con el fragment_id
+# si el widget está dentro de un st.fragment). Cada sesión repite al azar uno de estos guiones, con una pausa
+# (tiempo para pensar) entre interacción e interacción:
+# - cumpleaños: elige día y mes;
+# - explorador: elige un piloto y una escudería;
+# - trivia: responde las 6 preguntas (elegir opción, comprobar, siguiente).
+#
+# La concurrencia sube por niveles (--niveles); en cada nivel se mide la latencia de cada rerun (desde que se
+# manda hasta que llega script_finished: p50/p95/p99), reruns por segundo, CPU y RSS del proceso de Streamlit
+# (leídos de /proc, así que es solo para Linux).
+#
+# Uso:
+#   python benchmarks/bench_sesiones.py [--niveles 1 5 10 25 50] [--segundos 20] [--pausa 1] [--salida sesiones.json]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(CARPETA)
+APP = os.path.join(RAIZ, "f_1_birthday_gp_app.py")
+
+MESES = ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio", "Agosto", "Septiembre", "Octubre",
+         "Noviembre", "Diciembre"]
+PREGUNTAS_TRIVIA = 6
+TICKS = os.sysconf("SC_CLK_TCK")
+
+
+# ===================== SERVIDOR =====================
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def levantar_servidor(puerto):
+    comando = [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true", "--server.port", str(puerto),
+               "--server.address", "127.0.0.1", "--server.fileWatcherType", "none",
+               "--browser.gatherUsageStats", "false", "--global.developmentMode", "false"]
+    servidor = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health") as respuesta:
+                if respuesta.status == 200:
+                    return servidor
+        except OSError:
+            time.sleep(0.2)
+    servidor.terminate()
+    raise SystemExit("Streamlit no arrancó")
+
+
+# CPU (segundos de usuario + sistema) y memoria residente del proceso, leídos de /proc
+def cpu_s(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        campos = f.read().rsplit(")", 1)[1].split()
+    return (int(campos[11]) + int(campos[12])) / TICKS
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for linea in f:
+            if linea.startswith("VmRSS:"):
+                return int(linea.split()[1]) / 1024
+    return 0.0
+
+
+# ===================== SESIÓN SIMULADA =====================
+
+class Sesion:
+    def __init__(self, url, azar):
+        self.url = url
+        self.azar = azar
+        self.ws = None
+        # Etiqueta -> (id, fragment_id) del último widget con esa etiqueta, y opciones de cada widget
+        self.widgets = {}
+        self.opciones = {}
+        # Estado de todos los widgets, como lo manda el navegador en cada rerun
+        self.estados = {}
+        self.latencias = []
+        self.errores = 0
+
+    async def conectar(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+        inicio = time.perf_counter()
+        await self.rerun(None, medir=False)
+        return time.perf_counter() - inicio
+
+    async def cerrar(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, fragment_id, medir=True):
+        mensaje = BackMsg()
+        mensaje.rerun_script.query_string = ""
+        mensaje.rerun_script.page_script_hash = ""
+        if fragment_id:
+            mensaje.rerun_script.fragment_id = fragment_id
+        mensaje.rerun_script.widget_states.widgets.extend(self.estados.values())
+        inicio = time.perf_counter()
+        await self.ws.send(mensaje.SerializeToString())
+        await self.esperar_fin()
+        if medir:
+            self.latencias.append(time.perf_counter() - inicio)
+        # Los botones valen True solo en el rerun en que se tocaron
+        for id_widget in [i for i, estado in self.estados.items() if estado.HasField("trigger_value")]:
+            del self.estados[id_widget]
+
+    async def esperar_fin(self):
+        while True:
+            mensaje = ForwardMsg()
+            mensaje.ParseFromString(await self.ws.recv())
+            tipo = mensaje.WhichOneof("type")
+            if tipo == "delta":
+                self.leer_delta(mensaje.delta)
+            elif tipo == "script_finished":
+                return
+
+    def leer_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo == "exception":
+            self.errores += 1
+        widget = getattr(elemento, tipo)
+        if getattr(widget, "id", "") and hasattr(widget, "label"):
+            self.widgets[widget.label] = (widget.id, delta.fragment_id)
+            if hasattr(widget, "options"):
+                self.opciones[widget.label] = list(widget.options)
+
+    # ----- interacciones -----
+
+    async def elegir(self, etiqueta, valor):
+        id_widget, fragment_id = self.widgets[etiqueta]
+        self.estados[id_widget] = WidgetState(id=id_widget, string_value=valor)
+        await self.rerun(fragment_id)
+
+    async def tocar(self, etiqueta):
+        id_widget, fragment_id = self.widgets[etiqueta]
+        self.estados[id_widget] = WidgetState(id=id_widget, trigger_value=True)
+        await self.rerun(fragment_id)
+
+    async def pausa(self, media):
+        if media > 0:
+            await asyncio.sleep(self.azar.expovariate(1 / media))
+
+    async def cumpleanos(self, media):
+        await self.elegir("Día", str(self.azar.randint(1, 28)))
+        await self.pausa(media)
+        await self.elegir("Mes", self.azar.choice(MESES))
+
+    async def explorador(self, media):
+        for etiqueta in ("Selecciona un piloto ganador", "Selecciona una escudería ganadora"):
+            opciones = self.opciones.get(etiqueta, [])[1:]  # sin el "--"
+            if opciones:
+                await self.elegir(etiqueta, self.azar.choice(opciones))
+                await self.pausa(media)
+
+    async def trivia(self, media):
+        for _ in range(PREGUNTAS_TRIVIA):
+            if "Opciones:" not in self.widgets or "Comprobar respuesta" not in self.widgets:
+                return
+            await self.elegir("Opciones:", self.azar.choice(self.opciones["Opciones:"][1:]))
+            await self.pausa(media)
+            await self.tocar("Comprobar respuesta")
+            await self.pausa(media)
+            if "Siguiente pregunta" in self.widgets:
+                await self.tocar("Siguiente pregunta")
+                await self.pausa(media)
+
+
+GUIONES = ("cumpleanos", "explorador", "trivia")
+
+
+async def usuario(url, semilla, hasta, media, resultados):
+    azar = random.Random(semilla)
+    sesion = None
+    try:
+        while time.perf_counter() < hasta:
+            # Cada sesión hace un guion y la trivia la termina (como alguien que después recarga la página), así
+            # la trivia se puede volver a jugar desde la primera pregunta
+            if sesion is None:
+                sesion = Sesion(url, azar)
+                resultados["cargas"].append(await sesion.conectar())
+            guion = azar.choice(GUIONES)
+            await getattr(sesion, guion)(media)
+            await sesion.pausa(media)
+            if guion == "trivia":
+                await terminar(sesion, resultados)
+                sesion = None
+    except Exception as error:  # una sesión que se cae cuenta como error, las demás siguen
+        resultados["caidas"].append(repr(error))
+    finally:
+        if sesion is not None:
+            await terminar(sesion, resultados)
+
+
+async def terminar(sesion, resultados):
+    resultados["latencias"].extend(sesion.latencias)
+    resultados["errores"] += sesion.errores
+    await sesion.cerrar()
+
+
+async def medir_proceso(pid, hasta, muestras):
+    while time.perf_counter() < hasta:
+        muestras.append(rss_mb(pid))
+        await asyncio.sleep(0.25)
+
+
+async def nivel(url, pid, sesiones, segundos, media, semilla):
+    resultados = {"cargas": [], "latencias": [], "errores": 0, "caidas": []}
+    muestras_rss = []
+    cpu_inicio, inicio = cpu_s(pid), time.perf_counter()
+    hasta = inicio + segundos
+    await asyncio.gather(
+        medir_proceso(pid, hasta, muestras_rss),
+        *(usuario(url, semilla * 1000 + i, hasta, media, resultados) for i in range(sesiones)),
+    )
+    duracion = time.perf_counter() - inicio
+    cpu = cpu_s(pid) - cpu_inicio
+
+    latencias = sorted(resultados["latencias"])
+    cuantil = lambda q: round(latencias[min(len(latencias) - 1, int(q * len(latencias)))] * 1000, 1) if latencias else None  # noqa: E731
+    cargas = sorted(resultados["cargas"])
+    return {
+        "sesiones": sesiones,
+        "reruns": len(latencias),
+        "reruns_por_s": round(len(latencias) / duracion, 2),
+        "p50_ms": cuantil(0.50),
+        "p95_ms": cuantil(0.95),
+        "p99_ms": cuantil(0.99),
+        "carga_inicial_p50_ms": round(statistics.median(cargas) * 1000, 1) if cargas else None,
+        "cpu_pct": round(cpu / duracion * 100, 1),
+        "rss_mb_max": round(max(muestras_rss, default=rss_mb(pid)), 1),
+        "excepciones_en_la_app": resultados["errores"],
+        "sesiones_caidas": len(resultados["caidas"]),
+    }
+
+
+def benchmark(niveles, segundos, media, semilla):
+    puerto = puerto_libre()
+    servidor = levantar_servidor(puerto)
+    url = f"ws://127.0.0.1:{puerto}/_stcore/stream"
+    try:
+        salida = {"rss_mb_en_reposo": round(rss_mb(servidor.pid), 1), "niveles": []}
+        for sesiones in niveles:
+            resultado = asyncio.run(nivel(url, servidor.pid, sesiones, segundos, media, semilla))
+            print(json.dumps(resultado, ensure_ascii=False), file=sys.stderr)
+            salida["niveles"].append(resultado)
+    finally:
+        servidor.terminate()
+        servidor.wait()
+    return salida
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones de Streamlit simuladas")
+    parser.add_argument("--niveles", type=int, nargs="+", default=[1, 5, 10, 25, 50], help="sesiones a la vez en cada nivel")
+    parser.add_argument("--segundos", type=float, default=20, help="duración de cada nivel")
+    parser.add_argument("--pausa", type=float, default=1.0, help="pausa media entre interacciones (s, 0 = sin pausa)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--salida", help="archivo donde guardar el JSON")
+    args = parser.parse_args()
+
+    texto = json.dumps(benchmark(args.niveles, args.segundos, args.pausa, args.semilla), indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
@@ -0,0 +1,94 @@
+# ===================== DATOS SINTÉTICOS PARA LOS BENCHMARKS =====================
+# Arma un almacén "inflado" a partir del de los 50s para medir cómo escala la app.
+# - Repite el bloque de 10 temporadas hacia adelante (1960, 1970, ...) moviendo las fechas.
+# - Copia cada carrera varias veces dentro de la temporada (unos días después, con otro nombre de GP).
+# - Cada bloque y cada copia corre en circuitos "nuevos": los de los 50s movidos unos grados al azar, así el mapa
+#   también tiene más puntos a medida que crece la escala.
+# - Agrega pilotos clasificados detrás del ganador (Position 2, 3, ...) con nombres y escuderías inventados, y
+#   desde la escala 10x también algunos no clasificados por carrera (Position vacía), como en el export de Ergast.
+# Las filas originales siguen estando (Fangio, Ferrari, etc.), así las interacciones del benchmark encuentran datos.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import f1_datos  # noqa: E402
+
+# factor -> (bloques de 10 temporadas, copias de cada carrera por temporada, pilotos clasificados por carrera,
+#            pilotos no clasificados por carrera)
+ESCALAS = {
+    1: (1, 1, 1, 0),
+    10: (1, 1, 10, 2),
+    100: (4, 1, 25, 5),
+    1000: (8, 5, 25, 5),
+}
+
+
+def generar(factor, semilla=0):
+    bloques, copias, clasificados, no_clasificados = ESCALAS[factor]
+    rng = np.random.default_rng(semilla)
+    base = f1_datos.construir_dataset()
+
+    carreras = []
+    for bloque in range(bloques):
+        for copia in range(copias):
+            c = base.copy()
+            c["Year"] = c["Year"] + 10 * bloque
+            c["Date_Parsed"] = c["Date_Parsed"] + pd.DateOffset(years=10 * bloque) + pd.Timedelta(days=3 * copia)
+            c["Date"] = [f"{d.day} {f1_datos.MESES_EN[d.month - 1]} {d.year}" for d in c["Date_Parsed"]]
+            if copia:
+                c["Grand Prix"] = c["Grand Prix"] + f" {copia + 1}"
+            if bloque or copia:
+                c["Circuitos"] = c["Circuitos"] + f" {bloque * copias + copia + 1}"
+            carreras.append(c)
+    carreras = pd.concat(carreras, ignore_index=True)
+    carreras["Round"] = carreras.groupby("Year")["Date_Parsed"].rank(method="first").astype(int)
+
+    # Detrás de cada ganador agrego pilotos inventados (unos 800 pilotos y 170 escuderías como en la historia real)
+    pilotos = np.array([f"Piloto Sintético {i:03d}" for i in range(800)])
+    escuderias = np.array([f"Escudería Sintética {i:03d}" for i in range(170)])
+    filas = [carreras]
+    for posicion in [*range(2, clasificados + 1), *[None] * no_clasificados]:
+        resto = carreras.copy()
+        resto["Position"] = pd.array([posicion] * len(resto), dtype="Int8")
+        resto["Driver"] = pilotos[rng.integers(0, len(pilotos), len(resto))]
+        resto["Team"] = escuderias[rng.integers(0, len(escuderias), len(resto))]
+        filas.append(resto)
+    df = pd.concat(filas, ignore_index=True).sort_values(["Year", "Round", "Position"], kind="stable", na_position="last")
+    df["Fuente"] = f"sintético x{factor}"
+    return df.reset_index(drop=True)
+
+
+# Coordenadas de los circuitos inventados: las del circuito original más un corrimiento al azar
+def circuitos(df, semilla=0):
+    rng = np.random.default_rng(semilla)
+    base = f1_datos.tabla_circuitos().set_index("Circuito")
+    filas = []
+    for nombre in df["Circuitos"].unique():
+        original = nombre if nombre in base.index else nombre.rsplit(" ", 1)[0]
+        if original not in base.index:
+            continue
+        lat, lon, pais = base.loc[original, ["Lat", "Lon", "País"]]
+        if nombre != original:
+            lat, lon = np.clip(lat + rng.uniform(-4, 4), -80, 80), lon + rng.uniform(-6, 6)
+        filas.append({"Circuito": nombre, "Lat": lat, "Lon": lon, "País": pais})
+    return pd.DataFrame(filas)
+
+
+def construir_almacen(factor, carpeta):
+    df = generar(factor)
+    f1_datos.escribir_historia(df, [], carpeta, circuitos=circuitos(df))
+    return len(df)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera un almacén sintético escalado")
+    parser.add_argument("factor", type=int, choices=sorted(ESCALAS))
+    parser.add_argument("carpeta")
+    args = parser.parse_args()
+    print(f"{construir_almacen(args.factor, args.carpeta)} filas en {args.carpeta}")
@@ -0,0 +1,36 @@
+# ===================== BUILD DE LAS IMÁGENES =====================
+# Genera las versiones WebP de las imágenes en static/img/ (ver f1_recursos.py). Necesita Pillow.
+# Uso:
+#   python build_assets.py              -> achica los originales de assets/fuente/
+#   python build_assets.py --descargar  -> antes baja los originales que falten desde su link (necesita internet)
+
+import argparse
+import os
+import sys
+
+import f1_recursos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera las imágenes locales de la app")
+    parser.add_argument("--descargar", action="store_true", help="bajar los originales que falten en assets/fuente/")
+    args = parser.parse_args()
+
+    if args.descargar:
+        for nombre, datos in f1_recursos.IMAGENES.items():
+            if not os.path.exists(os.path.join(f1_recursos.FUENTES, datos["archivo"])):
+                print(f"Bajando {datos['remota']}")
+                f1_recursos.descargar(nombre)
+
+    imagenes = f1_recursos.construir_recursos()
+    faltan = False
+    for nombre, datos in f1_recursos.IMAGENES.items():
+        if nombre not in imagenes:
+            print(f"ERROR: falta {os.path.join(f1_recursos.FUENTES, datos['archivo'])} (la app la sigue mostrando desde "
+                  f"{datos['remota']}; corré python build_assets.py --descargar)",
+                  file=sys.stderr)
+            faltan = True
+            continue
+        detalle = ", ".join(f"{v['ancho']}px ({v['bytes'] // 1024} KB)" for v in imagenes[nombre]["variantes"])
+        print(f"{nombre}: {detalle}")
+    if faltan:
+        sys.exit(1)
@@ -0,0 +1,30 @@
+# ===================== BUILD DEL DATASET =====================
+# Genera el almacén por temporada en datos/historia/.
+# Uso:
+#   python build_dataset.py                  -> CSV de los 50s + datos/correcciones.json (solo ganadores)
+#                                             + datos/circuitos.csv (coordenadas de los circuitos)
+#   python build_dataset.py --ergast CARPETA -> toda la historia con clasificaciones completas, a partir de los
+#                                             CSV del export de Ergast (races, results, drivers, constructors, circuits)
+# (Si el almacén de los 50s no existe o está viejo, la app también lo genera sola la primera vez que carga.)
+
+import argparse
+import os
+
+import f1_datos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construye el almacén de resultados por temporada")
+    parser.add_argument("--ergast", help="carpeta con los CSV del export de Ergast")
+    args = parser.parse_args()
+
+    if args.ergast:
+        df = f1_datos.construir_desde_ergast(args.ergast)
+        circuitos = f1_datos.circuitos_desde_ergast(args.ergast)
+        fuentes = [os.path.join(args.ergast, f"{nombre}.csv") for nombre in ("races", "results", "drivers", "constructors", "circuits")]
+    else:
+        df = f1_datos.construir_dataset()
+        circuitos = f1_datos.tabla_circuitos()
+        fuentes = f1_datos.FUENTES_50S
+
+    manifiesto = f1_datos.escribir_historia(df, fuentes, circuitos=circuitos)
+    print(f"Almacén generado en {f1_datos.HISTORIA}: {len(manifiesto['temporadas'])} temporadas, {len(df)} resultados")
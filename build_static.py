@@ -0,0 +1,32 @@
+# ===================== BUILD DE LAS SECCIONES FIJAS =====================
+# Renderiza una sola vez las secciones que son iguales para todos (¿por qué los 50s?, los top 5, los países con
+# más carreras, la vista inicial del mapa y el cierre) en un paquete JSON por rango de temporadas, para la versión
+# actual del almacén (ver f1_estatico.py). La app los incrusta tal cual; si falta alguno, lo arma ella la primera
+# vez. Los paquetes de versiones anteriores del almacén, o renderizados con otro código, se borran.
+# Uso:
+#   python build_static.py                          -> la primera década y toda la historia
+#   python build_static.py --rango 1950 1955 --rango 1960 1969
+
+import argparse
+import os
+import time
+
+import f1_almacen
+import f1_estatico
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Renderiza las secciones fijas de la app para la versión actual de los datos")
+    parser.add_argument("--rango", nargs=2, type=int, action="append", metavar=("DESDE", "HASTA"),
+                        help="rango de temporadas (se puede repetir); por defecto la primera década y toda la historia")
+    args = parser.parse_args()
+
+    almacen = f1_almacen.Almacen(intervalo=0)
+    actual = almacen.actual()
+    rangos = [tuple(rango) for rango in args.rango] if args.rango else f1_estatico.rangos_por_defecto(actual.temporadas)
+    for desde, hasta in rangos:
+        inicio = time.perf_counter()
+        paquete = f1_estatico.armar(almacen.consultas(actual, desde, hasta), almacen.circuitos(actual), desde, hasta)
+        ruta = f1_estatico.guardar(paquete, actual.version)
+        print(f"{desde}-{hasta}: {os.path.relpath(ruta)} ({os.path.getsize(ruta) // 1024} KB, {time.perf_counter() - inicio:.2f} s)")
+    for nombre in f1_estatico.limpiar(actual.version):
+        print(f"Borrado {nombre} (otra versión del almacén o del código que lo renderiza)")
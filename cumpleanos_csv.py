@@ -0,0 +1,69 @@
+# ===================== CUMPLEAÑOS EN LOTE (CSV -> CSV) =====================
+# Responde "¿hubo un GP en tu cumpleaños?" para un CSV entero sin abrir la app. Lee el CSV de a pedazos,
+# resuelve cada pedazo de una con Consultas.cumpleanos_lote (numpy, sin loops por fila) y va escribiendo el
+# resultado, así la memoria no depende del tamaño del archivo.
+#
+# El CSV de entrada tiene que tener columnas "mes" y "dia" (números), o una columna "fecha" (AAAA-MM-DD;
+# el año no importa). Las columnas de entrada se copian tal cual a la salida, seguidas del resultado.
+# Uso:
+#   python cumpleanos_csv.py cumples.csv resultados.csv
+#   python cumpleanos_csv.py - - < cumples.csv > resultados.csv       -> entrada y salida estándar
+#   python cumpleanos_csv.py cumples.csv resultados.csv --desde 1950 --hasta 1959 --lote 500000
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+import f1_datos
+from f1_consultas import Consultas
+
+
+def meses_y_dias(lote):
+    if "mes" in lote and "dia" in lote:
+        meses = pd.to_numeric(lote["mes"], errors="coerce")
+        dias = pd.to_numeric(lote["dia"], errors="coerce")
+    elif "fecha" in lote:
+        # Saco mes y día del texto en vez de convertir a fecha, así un 29 de febrero de un año no bisiesto
+        # sigue contando como cumpleaños
+        partes = lote["fecha"].str.extract(r"^\s*\d{4}-(\d{1,2})-(\d{1,2})")
+        meses = pd.to_numeric(partes[0], errors="coerce")
+        dias = pd.to_numeric(partes[1], errors="coerce")
+    else:
+        raise SystemExit("El CSV necesita columnas 'mes' y 'dia', o una columna 'fecha'")
+    # Lo que no se pudo leer queda como mes 0, que cumpleanos_lote marca como fecha no válida
+    return meses.fillna(0).astype("int64").to_numpy(), dias.fillna(0).astype("int64").to_numpy()
+
+
+def procesar(consultas, entrada, salida, tamanio_lote):
+    total = 0
+    for numero, lote in enumerate(pd.read_csv(entrada, chunksize=tamanio_lote, dtype=str, keep_default_na=False)):
+        resultado = consultas.cumpleanos_lote(*meses_y_dias(lote))
+        resultado.index = lote.index
+        pd.concat([lote, resultado], axis=1).to_csv(salida, header=numero == 0, index=False)
+        total += len(lote)
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Busca el GP de cada cumpleaños de un CSV")
+    parser.add_argument("entrada", help="CSV de entrada ('-' = entrada estándar)")
+    parser.add_argument("salida", help="CSV de salida ('-' = salida estándar)")
+    parser.add_argument("--desde", type=int, help="primera temporada (por defecto, la primera del almacén)")
+    parser.add_argument("--hasta", type=int, help="última temporada (por defecto, la última del almacén)")
+    parser.add_argument("--lote", type=int, default=250_000, help="filas que se procesan de una vez")
+    args = parser.parse_args()
+
+    temporadas = f1_datos.temporadas_disponibles()
+    consultas = Consultas.rango(args.desde or temporadas[0], args.hasta or temporadas[-1])
+
+    inicio = time.perf_counter()
+    entrada = sys.stdin if args.entrada == "-" else args.entrada
+    if args.salida == "-":
+        total = procesar(consultas, entrada, sys.stdout, args.lote)
+    else:
+        with open(args.salida, "w", encoding="utf-8", newline="") as f:
+            total = procesar(consultas, entrada, f, args.lote)
+    segundos = time.perf_counter() - inicio
+    print(f"{total} cumpleaños en {segundos:.1f} s ({total / max(segundos, 1e-9) * 60:,.0f} por minuto)", file=sys.stderr)
@@ -0,0 +1,69 @@
+# ===================== AGREGADOS PRECALCULADOS =====================
+# Antes cada gráfico y cada tabla hacía su propio value_counts() en cada rerun. Acá cuento las victorias una
+# sola vez por dimensión (piloto, escudería, país, GP, circuito y año) y dejo el ranking denso ya calculado, así las
+# secciones solo leen un pedazo de estas tablas. No usa Streamlit; la app lo guarda con st.cache_resource.
+
+import pandas as pd
+
+# Columna del DataFrame de ganadores -> nombre que uso en las tablas
+DIMENSIONES = {
+    "piloto": "Winner",
+    "escuderia": "Team",
+    "pais": "País",
+    "gp": "Grand Prix",
+    "circuito": "Circuitos",
+    "anio": "Year",
+}
+
+
+def contar(df, columna):
+    # value_counts ordena de mayor a menor y en los empates respeta el orden en que aparecen en los datos
+    conteo = df[columna].value_counts()
+    tabla = pd.DataFrame({"Nombre": conteo.index.astype(object), "Victorias": conteo.to_numpy(dtype="int64")})
+    tabla = tabla[tabla["Victorias"] > 0].reset_index(drop=True)
+    # Ranking denso: los empatados comparten puesto y el siguiente no salta números (1, 1, 2, ...)
+    tabla["Ranking"] = tabla["Victorias"].rank(method="dense", ascending=False).astype("int64")
+    return tabla
+
+
+class CuboVictorias:
+    def __init__(self, ganadores_df):
+        self.filas = len(ganadores_df)
+        self.tablas = {nombre: contar(ganadores_df, columna) for nombre, columna in DIMENSIONES.items()}
+        # Victorias de cada piloto y escudería por temporada (para mirar la evolución año a año)
+        self.por_temporada = {
+            nombre: (ganadores_df.groupby([DIMENSIONES[nombre], "Year"], observed=True)
+                     .size().rename("Victorias").reset_index())
+            for nombre in ("piloto", "escuderia")
+        }
+
+    def tabla(self, dimension):
+        return self.tablas[dimension].copy(deep=False)  # vista nueva: la tabla guardada es compartida
+
+    # Los primeros n como en value_counts().head(n), con las columnas ya renombradas y el índice desde 1
+    def top(self, dimension, n, columnas=("Nombre", "Victorias")):
+        top = self.tablas[dimension].head(n)[["Nombre", "Victorias"]].copy()
+        top.columns = list(columnas)
+        top.index += 1
+        return top
+
+    # Todos los que están entre los n primeros puestos distintos (respetando empates), cortado a n filas
+    def top_con_empates(self, dimension, n, columnas=("Nombre", "Victorias")):
+        tabla = self.tablas[dimension]
+        top = tabla[tabla["Ranking"] <= n].head(n)[["Nombre", "Victorias"]].copy()
+        top.columns = list(columnas)
+        top.index = range(1, len(top) + 1)
+        return top
+
+    # Los que comparten el primer puesto y cuántas victorias tienen
+    def lideres(self, dimension):
+        tabla = self.tablas[dimension]
+        if tabla.empty:
+            return [], 0
+        primeros = tabla[tabla["Ranking"] == 1]
+        return primeros["Nombre"].tolist(), int(primeros["Victorias"].iloc[0])
+
+    # Como Series nombre -> victorias (lo que devolvía value_counts)
+    def conteo(self, dimension):
+        tabla = self.tablas[dimension]
+        return pd.Series(tabla["Victorias"].to_numpy(), index=tabla["Nombre"].to_numpy())
@@ -0,0 +1,372 @@
+# ===================== REGISTRO DE DATOS POR VERSIÓN (RECARGA EN CALIENTE) =====================
+# Antes los datos y todo lo que se calcula a partir de ellos quedaban en cachés sin relación con los archivos:
+# si se publicaba una temporada nueva había que reiniciar la app. Acá hay un registro por proceso (lo comparten
+# la app, todas sus sesiones y la API) donde todo queda guardado con la versión del almacén como parte de la clave
+# (ver f1_datos.version_de: el hash del manifest, que cambia con el contenido de cualquier archivo).
+#
+# - Cada rerun pide al principio una foto de los datos (actual()) y usa esa misma versión hasta terminar, así
+#   una sesión nunca mezcla datos de dos versiones.
+# - Un hilo vigía revisa cada pocos segundos si cambiaron las fuentes (el CSV, las correcciones, los circuitos)
+#   o el manifest (por ejemplo porque alguien corrió build_dataset.py). Si cambiaron, rehace el almacén en
+#   segundo plano, arma para la versión nueva lo mismo que estaba en uso en la actual (mismos rangos de
+#   temporadas, mismos índices) y recién ahí la publica, con una sola asignación. Mientras tanto todos siguen
+#   usando la versión anterior, y después de publicarla nadie arranca con el caché vacío.
+# - Lo guardado tiene un presupuesto de memoria (F1_MEMORIA_MB): si se pasa, se descarta primero lo de versiones
+#   viejas y después lo usado hace más tiempo.
+# No usa Streamlit.
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+import f1_datos
+import f1_estatico
+from f1_consultas import Consultas
+from f1_duelos import MatrizDuelos
+from f1_temporadas import Temporada
+from f1_trivia import BancoTrivia
+
+PRESUPUESTO_MB = float(os.environ.get("F1_MEMORIA_MB", 512))
+# Cada cuántos segundos se revisan los archivos (0 = no vigilar)
+INTERVALO_S = float(os.environ.get("F1_VIGILAR_S", 5))
+
+
+# Memoria aproximada de lo que guardo (DataFrames, arrays de numpy y objetos armados con ellos)
+def estimar_memoria(valor, vistos=None):
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return 0
+    vistos.add(id(valor))
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(deep=True).sum())
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, (str, bytes)):
+        return sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_memoria(k, vistos) + estimar_memoria(v, vistos) for k, v in valor.items())
+    if isinstance(valor, (list, tuple, set, deque)):
+        return sys.getsizeof(valor) + sum(estimar_memoria(v, vistos) for v in valor)
+    if hasattr(valor, "__dict__"):
+        return sys.getsizeof(valor) + estimar_memoria(vars(valor), vistos)
+    return sys.getsizeof(valor)
+
+
+# Calcula de antemano las cached_property de un objeto (todas, o solo las que se nombran)
+def calentar_propiedades(valor, nombres=None):
+    nombres = dir(type(valor)) if nombres is None else nombres
+    for nombre in list(nombres):
+        if isinstance(getattr(type(valor), nombre, None), cached_property):
+            getattr(valor, nombre)
+
+
+# Una versión del almacén: el manifest ya leído, con el que se leen siempre los mismos archivos
+class Version:
+    def __init__(self, carpeta, manifiesto):
+        self.carpeta = carpeta
+        self.manifiesto = manifiesto
+        self.version = f1_datos.version_de(manifiesto)
+        self.temporadas = f1_datos.temporadas_disponibles(manifiesto)
+
+    def ganadores(self, desde, hasta):
+        return f1_datos.ganadores(desde, hasta, self.manifiesto)
+
+    def resultados(self, desde, hasta):
+        return f1_datos.resultados(desde, hasta, self.manifiesto)
+
+    def circuitos(self):
+        return f1_datos.leer_circuitos(self.manifiesto)
+
+    def trivia(self):
+        tabla = f1_datos.leer_trivia(self.manifiesto)
+        return None if tabla is None else BancoTrivia(tabla)
+
+
+class Almacen:
+    def __init__(self, presupuesto_mb=PRESUPUESTO_MB, intervalo=INTERVALO_S):
+        self.presupuesto = presupuesto_mb * 2 ** 20
+        self.intervalo = intervalo
+        self.candado = threading.Lock()
+        self.candado_version = threading.Lock()
+        # (versión, clave) -> valor, del usado hace más tiempo al más reciente
+        self.entradas = OrderedDict()
+        # Lo que ocupa cada entrada, medido una vez al guardarla, y la suma de todas
+        self.tamanios = {}
+        self.total = 0
+        # La versión que se está preparando para publicar (ver preparar): se cuida igual que la actual
+        self.preparando = None
+        # Lo que se está armando en este momento, para que dos sesiones no armen lo mismo a la vez
+        self.en_construccion = {}
+        self.suscriptores = []
+        self._actual = None
+        self.firma = None
+        self.vigia = None
+        self.recargas = 0
+        self.ultimo_error = None
+
+    # ===================== VERSIÓN ACTUAL =====================
+
+    def cargar(self):
+        # (manifiesto() rehace el almacén si está desactualizado; después del arranque eso lo hace el vigía)
+        return Version(f1_datos.HISTORIA, f1_datos.manifiesto())
+
+    # La foto de los datos que tiene que usar un rerun (o un pedido de la API) de principio a fin
+    def actual(self):
+        actual = self._actual
+        if actual is None or actual.carpeta != f1_datos.HISTORIA:
+            # Primera vez, o se cambió de almacén con f1_datos.usar_historia: esta sí la cargo en el momento
+            with self.candado_version:
+                if self._actual is None or self._actual.carpeta != f1_datos.HISTORIA:
+                    self.firma = self.firma_archivos()
+                    self.publicar(self.cargar())
+                actual = self._actual
+        return actual
+
+    def publicar(self, nueva):
+        self._actual = nueva  # una sola asignación: cada rerun ve la versión vieja o la nueva, nunca algo a medias
+        self.recargas += 1
+        self.ajustar()
+
+    # Funciones a las que aviso antes de publicar una versión nueva, para que preparen lo suyo (ver f1_api.py)
+    def suscribir(self, funcion):
+        self.suscriptores.append(funcion)
+
+    # ===================== ENTRADAS =====================
+
+    def obtener(self, version, clave, construir):
+        llave = (version.version, clave)
+        with self.candado:
+            if llave in self.entradas:
+                self.entradas.move_to_end(llave)
+                return self.entradas[llave]
+            listo = self.en_construccion.get(llave)
+            propio = listo is None
+            if propio:
+                listo = self.en_construccion[llave] = threading.Event()
+
+        if not propio:
+            listo.wait()
+            with self.candado:
+                if llave in self.entradas:
+                    return self.entradas[llave]
+            return construir()  # el que lo estaba armando falló; lo intento yo
+
+        try:
+            valor = construir()
+            tamanio = estimar_memoria(valor)  # (fuera del candado: con mucha historia tarda)
+            with self.candado:
+                self.entradas[llave] = valor
+                self.tamanios[llave] = tamanio
+                self.total += tamanio
+        finally:
+            with self.candado:
+                del self.en_construccion[llave]
+            listo.set()
+        self.ajustar()
+        return valor
+
+    def consultas(self, version, desde, hasta):
+        return self.obtener(version, ("consultas", desde, hasta), lambda: Consultas(version.ganadores(desde, hasta)))
+
+    def circuitos(self, version):
+        return self.obtener(version, ("circuitos",), version.circuitos)
+
+    def trivia(self, version):
+        return self.obtener(version, ("trivia",), version.trivia)
+
+    # El detalle de una temporada (ver f1_temporadas.py): se arma la primera vez que alguien la abre
+    def temporada(self, version, year):
+        return self.obtener(version, ("temporada", year), lambda: Temporada(year, version.resultados(year, year)))
+
+    # Las secciones fijas ya renderizadas (ver f1_estatico.py): las del paquete que dejó build_static.py, o
+    # armadas acá la primera vez si no hay paquete para esta versión y rango
+    def estatico(self, version, desde, hasta):
+        def construir():
+            paquete = f1_estatico.leer(version.version, desde, hasta)
+            if paquete is None:
+                paquete = f1_estatico.armar(self.consultas(version, desde, hasta), self.circuitos(version), desde, hasta)
+            return f1_estatico.Paquete(paquete)
+
+        return self.obtener(version, ("estatico", desde, hasta), construir)
+
+    # La matriz del cara a cara (ver f1_duelos.py), de pilotos ("Driver") o de escuderías ("Team")
+    def duelos(self, version, desde, hasta, columna):
+        return self.obtener(version, ("duelos", desde, hasta, columna),
+                            lambda: MatrizDuelos(version.resultados(desde, hasta), columna))
+
+    # Vuelve a medir una entrada que creció después de guardarla (por ejemplo al calcular sus cached_property)
+    def remedir(self, version, clave):
+        llave = (version.version, clave)
+        with self.candado:
+            valor = self.entradas.get(llave)
+        if valor is None:
+            return
+        tamanio = estimar_memoria(valor)
+        with self.candado:
+            if llave in self.tamanios:
+                self.total += tamanio - self.tamanios[llave]
+                self.tamanios[llave] = tamanio
+        self.ajustar()
+
+    # Si lo guardado se pasa del presupuesto, descarto primero lo de versiones viejas, después lo de la actual si
+    # ya se está preparando otra, y recién al final lo de la versión que se está preparando (o la actual); dentro
+    # de cada grupo, lo usado hace más tiempo. Lo último que se usó nunca, así el que lo acaba de pedir no se queda
+    # sin nada. No se vuelve a medir nada: los tamaños se guardan al guardar cada entrada.
+    # Las sesiones que todavía tienen algo descartado en la mano lo pueden seguir usando; solo deja de estar acá.
+    def ajustar(self, preparando=None):
+        actual = self._actual.version if self._actual is not None else None
+        preparando = preparando or self.preparando
+        nueva = preparando or actual
+
+        def prioridad(llave):
+            if llave[0] == nueva:
+                return 2
+            return 1 if llave[0] == actual else 0
+
+        with self.candado:
+            if self.total <= self.presupuesto or not self.entradas:
+                return self.total
+            ultima = next(reversed(self.entradas))
+            orden = sorted((llave for llave in self.entradas if llave != ultima), key=prioridad)  # (sorted es estable)
+            for llave in orden:
+                if self.total <= self.presupuesto:
+                    break
+                self.total -= self.tamanios.pop(llave, 0)
+                del self.entradas[llave]
+            return self.total
+
+    def vaciar(self):
+        with self.candado:
+            self.entradas.clear()
+            self.tamanios.clear()
+            self.total = 0
+        self._actual = None
+
+    def memoria(self):
+        with self.candado:
+            return [{"version": version, "clave": clave, "bytes": self.tamanios.get((version, clave), 0)}
+                    for version, clave in self.entradas]
+
+    # ===================== VIGÍA =====================
+
+    # Fecha y tamaño de las fuentes y del manifest: si no cambió nada, no hace falta ni leer los archivos
+    def firma_archivos(self):
+        rutas = list(f1_datos.FUENTES_50S) + [f1_datos.ruta_manifiesto()]
+        firma = []
+        for ruta in rutas:
+            try:
+                estado = os.stat(ruta)
+                firma.append((ruta, estado.st_mtime_ns, estado.st_size))
+            except OSError:
+                firma.append((ruta, None, None))
+        return tuple(firma)
+
+    def revisar(self):
+        firma = self.firma_archivos()
+        if firma == self.firma or self._actual is None:
+            return False
+        # Si cambió el contenido de alguna fuente rehago el almacén (si solo cambió la fecha, no se rehace nada)
+        if f1_datos.historia_desactualizada():
+            f1_datos.construir_historia_50s()
+        self.firma = self.firma_archivos()
+        nueva = Version(f1_datos.HISTORIA, f1_datos.leer_manifiesto())
+        if nueva.version == self._actual.version:
+            return False
+        try:
+            self.preparar(nueva)
+            self.publicar(nueva)
+        finally:
+            self.preparando = None
+        return True
+
+    # Armo para la versión nueva lo mismo que estaba guardado para la actual, con los mismos índices ya hechos
+    def preparar(self, nueva):
+        anterior = self._actual.version
+        self.preparando = nueva.version
+        with self.candado:
+            en_uso = [(clave, valor) for (version, clave), valor in self.entradas.items() if version == anterior]
+        for clave, valor in en_uso:
+            if clave[0] == "consultas":
+                nuevo = self.consultas(nueva, *clave[1:])
+            elif clave[0] == "temporada":
+                nuevo = self.temporada(nueva, clave[1])
+            elif clave[0] == "duelos":
+                self.duelos(nueva, *clave[1:])
+                continue
+            elif clave[0] == "estatico":
+                self.estatico(nueva, *clave[1:])
+                continue
+            elif clave[0] == "circuitos":
+                self.circuitos(nueva)
+                continue
+            elif clave[0] == "trivia":
+                self.trivia(nueva)
+                continue
+            else:
+                continue
+            calentar_propiedades(nuevo, vars(valor))
+            self.remedir(nueva, clave)
+        for funcion in self.suscriptores:
+            funcion(nueva)
+
+    # ===================== CALENTAMIENTO AL ARRANCAR =====================
+    # Arma de una vez todo lo que la primera sesión tendría que armar en el momento (ver serve_app.py): para cada
+    # rango de temporadas las consultas con su cubo e índices, las secciones fijas y las matrices del cara a cara;
+    # además los circuitos, la trivia y el detalle de las temporadas que se piden. Devuelve cuánto tardó cada paso.
+    def calentar(self, version, rangos, temporadas=()):
+        tiempos = []
+
+        def paso(nombre, funcion):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append((nombre, time.perf_counter() - inicio))
+
+        for desde, hasta in rangos:
+            paso(f"consultas {desde}-{hasta}", lambda: (calentar_propiedades(self.consultas(version, desde, hasta)),
+                                                       self.remedir(version, ("consultas", desde, hasta))))
+            paso(f"secciones fijas {desde}-{hasta}", lambda: self.estatico(version, desde, hasta))
+            paso(f"cara a cara {desde}-{hasta}", lambda: [self.duelos(version, desde, hasta, columna) for columna in ("Driver", "Team")])
+        paso("circuitos", lambda: self.circuitos(version))
+        paso("trivia", lambda: self.trivia(version))
+        if temporadas:
+            paso(f"temporadas {temporadas[0]}-{temporadas[-1]}",
+                 lambda: [(calentar_propiedades(self.temporada(version, year)), self.remedir(version, ("temporada", year)))
+                          for year in temporadas])
+        return tiempos
+
+    def vigilar(self):
+        if self.vigia is not None or self.intervalo <= 0:
+            return
+        self.vigia = threading.Thread(target=self._vigilar, name="f1-vigia", daemon=True)
+        self.vigia.start()
+
+    def _vigilar(self):
+        while True:
+            time.sleep(self.intervalo)
+            try:
+                self.revisar()
+                self.ultimo_error = None
+            except Exception as error:  # si falla la recarga se sigue sirviendo la versión anterior
+                self.ultimo_error = repr(error)
+
+
+_almacen = None
+_candado_almacen = threading.Lock()
+
+
+# El registro del proceso (se crea la primera vez, con el vigía andando)
+def almacen():
+    global _almacen
+    with _candado_almacen:
+        if _almacen is None:
+            _almacen = Almacen()
+            _almacen.vigilar()
+    return _almacen
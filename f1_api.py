@@ -0,0 +1,356 @@
+# ===================== API LOCAL (JSON, SOLO LECTURA) =====================
+# Otras herramientas necesitan lo mismo que calcula la app (tops, carreras por país, el buscador de cumpleaños,
+# las victorias de cada piloto y escudería) y no pueden leer una página de Streamlit. Este módulo arma una API
+# HTTP chica con Starlette (viene con Streamlit) que responde esas consultas en JSON usando f1_consultas.py.
+#
+# Cada respuesta se arma una sola vez: el JSON, su versión con gzip y con brotli (si está instalado) quedan
+# guardados, con un ETag fuerte que incluye la versión del almacén (si se regenera, cambian todos). Si el cliente
+# manda If-None-Match con el ETag que ya tiene (fuerte o débil, uno o varios, o "*"), contesta 304 sin cuerpo. Al arrancar ya deja calculado todo lo
+# del rango completo de temporadas (tops, países, los 366 cumpleaños y las victorias de cada piloto y escudería);
+# los otros rangos se calculan la primera vez que se piden y se guardan en un LRU. Si se publica una versión nueva
+# del almacén, se precalcula todo de nuevo en segundo plano y se cambia de una (ver f1_almacen.py).
+# Ver serve_api.py para levantarla y benchmarks/bench_api.py para la prueba de carga.
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.routing import Route
+
+import f1_almacen
+from f1_consultas import nombre_gp, texto_paises_lideres
+from f1_indices import DIAS_POR_MES, fecha_valida
+
+try:
+    import brotli  # opcional: si no está, solo se ofrece gzip
+except ImportError:
+    brotli = None
+
+TIPO_JSON = "application/json; charset=utf-8"
+# Los clientes pueden guardar la respuesta pero tienen que revalidarla (con el ETag es un 304 sin cuerpo)
+CACHE_CONTROL = "public, no-cache"
+# Debajo de este tamaño comprimir no ahorra nada
+MIN_COMPRIMIR = 256
+MAX_RESPUESTAS = 4096  # respuestas de otros rangos que guardo (LRU)
+MAX_TOP = 50
+TOPS = {"pilotos": ("piloto", "Piloto"), "escuderias": ("escuderia", "Escudería"), "paises": ("pais", "País")}
+
+
+# Convierte lo que venga de numpy/pandas/arrow a tipos de JSON
+def a_json(valor):
+    if hasattr(valor, "item"):
+        return valor.item()
+    return str(valor)
+
+
+def registros(df):
+    return df.astype(object).to_dict(orient="records")
+
+
+class ErrorConsulta(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+# ===================== RESPUESTAS PRECALCULADAS =====================
+
+class RespuestaJSON:
+    def __init__(self, datos, version):
+        self.cuerpos = {"identity": json.dumps(datos, ensure_ascii=False, separators=(",", ":"), default=a_json).encode("utf-8")}
+        if len(self.cuerpos["identity"]) >= MIN_COMPRIMIR:
+            self.cuerpos["gzip"] = gzip.compress(self.cuerpos["identity"], compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.cuerpos["br"] = brotli.compress(self.cuerpos["identity"], quality=11)
+
+        # Un ETag por codificación (son bytes distintos), todos con la versión del almacén y el hash del JSON
+        base = f"{version}-{hashlib.sha256(self.cuerpos['identity']).hexdigest()[:16]}"
+        self.etags = {codificacion: f'"{base}"' if codificacion == "identity" else f'"{base}-{codificacion}"'
+                      for codificacion in self.cuerpos}
+
+    # Elijo la codificación según Accept-Encoding (brotli antes que gzip si el cliente acepta las dos)
+    def codificacion(self, accept_encoding):
+        aceptadas = codificaciones_aceptadas(accept_encoding)
+        for codificacion in ("br", "gzip"):
+            if codificacion in self.cuerpos and codificacion in aceptadas:
+                return codificacion
+        return "identity"
+
+    # If-None-Match usa la comparación débil (RFC 9110 §13.1.2): W/"x" coincide con "x". Importa porque los
+    # proxies que comprimen por su cuenta (nginx con gzip, por ejemplo) convierten el ETag fuerte en débil.
+    # Puede traer varios ETag separados por comas, o "*" (cualquier versión).
+    def coincide(self, if_none_match):
+        if not if_none_match:
+            return False
+        etiquetas = {etiqueta_opaca(etiqueta) for etiqueta in if_none_match.split(",")}
+        return "*" in etiquetas or not etiquetas.isdisjoint(self.etags.values())
+
+    def responder(self, request):
+        codificacion = self.codificacion(request.headers.get("accept-encoding", ""))
+        cabeceras = {"ETag": self.etags[codificacion], "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+        if self.coincide(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=cabeceras)
+        if codificacion != "identity":
+            cabeceras["Content-Encoding"] = codificacion
+        return Response(self.cuerpos[codificacion], media_type=TIPO_JSON, headers=cabeceras)
+
+
+def etiqueta_opaca(etiqueta):
+    etiqueta = etiqueta.strip()
+    return etiqueta[2:] if etiqueta.startswith("W/") else etiqueta
+
+
+def codificaciones_aceptadas(accept_encoding):
+    aceptadas = set()
+    for parte in accept_encoding.split(","):
+        nombre, _, parametros = parte.strip().partition(";")
+        q = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                q = float(parametros[2:])
+            except ValueError:
+                q = 0.0
+        if nombre and q > 0:
+            aceptadas.add(nombre.strip().lower())
+    if "*" in aceptadas:
+        aceptadas |= {"br", "gzip"}
+    return aceptadas
+
+
+# ===================== CONSULTAS =====================
+# Cada consulta recibe un objeto Consultas (el del rango pedido) y devuelve algo que se pueda pasar a JSON
+
+def datos_top(consultas, dimension, n):
+    nombre, columna = TOPS[dimension]
+    if dimension == "paises":
+        top = consultas.top_paises(n)
+    else:
+        top = consultas.cubo.top(nombre, n, [columna, "Victorias"])
+    return [{"puesto": int(puesto), **fila} for puesto, fila in zip(top.index, registros(top))]
+
+
+def datos_paises(consultas):
+    tabla = consultas.cubo.tabla("pais")
+    paises, cantidad = consultas.paises_con_mas_carreras()
+    return {
+        "lideres": paises,
+        "carreras_lideres": cantidad,
+        "texto": texto_paises_lideres(paises, cantidad) if paises else None,
+        "paises": [{"pais": pais, "carreras": carreras, "ranking": ranking}
+                   for pais, carreras, ranking in zip(tabla["Nombre"], tabla["Victorias"].tolist(), tabla["Ranking"].tolist())],
+    }
+
+
+def fila_carrera(carrera):
+    return {
+        "anio": carrera["Year"],
+        "gp": nombre_gp(carrera["Grand Prix"]),
+        "fecha": carrera["Date_Parsed"].strftime("%Y-%m-%d"),
+        "ganador": carrera["Winner"],
+        "escuderia": carrera["Team"],
+    }
+
+
+def datos_cumpleanos(consultas, mes, dia):
+    carreras = consultas.carreras_del_dia(mes, dia)
+    cercana = consultas.carrera_mas_cercana(mes, dia)
+    return {
+        "mes": mes,
+        "dia": dia,
+        "carreras": [fila_carrera(carrera) for _, carrera in carreras.iterrows()],
+        "mas_cercana": None if cercana is None else fila_carrera(cercana),
+        "mensaje_mas_cercana": consultas.mensaje_mas_cercana(mes, dia),
+    }
+
+
+def datos_victorias(indice, nombre):
+    tabla = indice.victorias(nombre)
+    if tabla is None:
+        raise ErrorConsulta(404, f"No hay victorias de '{nombre}' en esas temporadas")
+    return {"nombre": nombre, "victorias": len(tabla), "carreras": registros(tabla)}
+
+
+# ===================== API =====================
+
+# Las respuestas de una versión del almacén. Cuando se publica una versión nueva (ver f1_almacen.py) se arma
+# otro objeto de estos con todo precalculado y recién ahí reemplaza al anterior.
+class RespuestasVersion:
+    def __init__(self, almacen, version):
+        self.almacen = almacen
+        self.version = version
+        self.temporadas = version.temporadas
+        self.rango_completo = (self.temporadas[0], self.temporadas[-1])
+        # Las del rango completo quedan fijas; las demás en un LRU
+        self.fijas = {}
+        self.respuestas = OrderedDict()
+        # Los cálculos corren en el threadpool y el LRU se toca también desde el event loop
+        self.candado = threading.Lock()
+
+    # ----- parámetros -----
+
+    def rango(self, parametros):
+        try:
+            desde = int(parametros.get("desde", self.rango_completo[0]))
+            hasta = int(parametros.get("hasta", self.rango_completo[1]))
+        except ValueError:
+            raise ErrorConsulta(400, "desde y hasta tienen que ser años") from None
+        desde, hasta = max(desde, self.rango_completo[0]), min(hasta, self.rango_completo[1])
+        if desde > hasta:
+            raise ErrorConsulta(400, f"No hay temporadas en ese rango (hay de {self.rango_completo[0]} a {self.rango_completo[1]})")
+        return desde, hasta
+
+    # Los Consultas de cada rango quedan en el registro del proceso (con su presupuesto de memoria)
+    def consultas_de(self, rango):
+        return self.almacen.consultas(self.version, *rango)
+
+    # ----- caché de respuestas -----
+
+    # La clave es la consulta ya normalizada (el rango resuelto, sin importar el orden de los parámetros)
+    def guardada(self, clave):
+        respuesta = self.fijas.get(clave)
+        if respuesta is not None:
+            return respuesta
+        with self.candado:
+            respuesta = self.respuestas.get(clave)
+            if respuesta is not None:
+                self.respuestas.move_to_end(clave)
+        return respuesta
+
+    def guardar(self, clave, respuesta):
+        if clave[1] == self.rango_completo:
+            self.fijas[clave] = respuesta
+            return
+        with self.candado:
+            self.respuestas[clave] = respuesta
+            if len(self.respuestas) > MAX_RESPUESTAS:
+                self.respuestas.popitem(last=False)
+
+    def calcular(self, clave):
+        consulta, rango, *argumentos = clave
+        consultas = self.consultas_de(rango)
+        if consulta == "top":
+            datos = datos_top(consultas, *argumentos)
+        elif consulta == "paises":
+            datos = datos_paises(consultas)
+        elif consulta == "cumpleanos":
+            datos = datos_cumpleanos(consultas, *argumentos)
+        elif consulta == "lista":
+            datos = getattr(consultas, argumentos[0]).opciones
+        elif consulta == "victorias":
+            datos = datos_victorias(getattr(consultas, argumentos[0]), argumentos[1])
+        else:
+            datos = {"version": self.version.version, "temporadas": self.temporadas, "rutas": list(RUTAS)}
+        version = self.version.version
+        return RespuestaJSON({"version": version, "desde": rango[0], "hasta": rango[1], "datos": datos}, version)
+
+    def respuesta(self, clave):
+        respuesta = self.guardada(clave)
+        if respuesta is None:
+            respuesta = self.calcular(clave)
+            self.guardar(clave, respuesta)
+        return respuesta
+
+    # Todo lo del rango completo, para que las consultas más comunes nunca tengan que calcularse en un pedido
+    def precalcular(self):
+        rango = self.rango_completo
+        claves = [("indice", rango), ("paises", rango), ("lista", rango, "pilotos"), ("lista", rango, "escuderias")]
+        claves += [("top", rango, dimension, 5) for dimension in TOPS]
+        claves += [("cumpleanos", rango, mes, dia) for mes in range(1, 13) for dia in range(1, DIAS_POR_MES[mes - 1] + 1)]
+        completo = self.consultas_de(rango)
+        for entidad in ("pilotos", "escuderias"):
+            claves += [("victorias", rango, entidad, nombre) for nombre in getattr(completo, entidad).opciones]
+        for clave in claves:
+            self.respuesta(clave)
+        return len(claves)
+
+    # ----- rutas -----
+
+    def clave(self, consulta, request):
+        parametros = request.query_params
+        rango = self.rango(parametros)
+        if consulta == "top":
+            dimension = request.path_params["dimension"]
+            if dimension not in TOPS:
+                raise ErrorConsulta(404, f"No hay top de '{dimension}' (hay {', '.join(TOPS)})")
+            try:
+                n = int(parametros.get("n", 5))
+            except ValueError:
+                raise ErrorConsulta(400, "n tiene que ser un número") from None
+            return ("top", rango, dimension, max(1, min(n, MAX_TOP)))
+        if consulta == "cumpleanos":
+            try:
+                mes, dia = int(parametros["mes"]), int(parametros["dia"])
+            except (KeyError, ValueError):
+                raise ErrorConsulta(400, "Faltan mes y dia (números)") from None
+            if not fecha_valida(mes, dia):
+                raise ErrorConsulta(400, "Esa fecha no existe")
+            return ("cumpleanos", rango, mes, dia)
+        if consulta in ("pilotos", "escuderias"):
+            if "nombre" in request.path_params:
+                return ("victorias", rango, consulta, request.path_params["nombre"])
+            return ("lista", rango, consulta)
+        return (consulta, rango)
+
+
+
+class API:
+    def __init__(self, precalcular=True):
+        self.almacen = f1_almacen.almacen()
+        self.precalcular = precalcular
+        self.estado = self.preparar(self.almacen.actual())
+        self.almacen.suscribir(self.cambiar_version)
+
+    def preparar(self, version):
+        estado = RespuestasVersion(self.almacen, version)
+        if self.precalcular:
+            estado.precalcular()
+        return estado
+
+    # La llama el vigía del registro con la versión nueva ya armada, antes de publicarla
+    def cambiar_version(self, version):
+        self.estado = self.preparar(version)
+
+    async def atender(self, consulta, request):
+        estado = self.estado  # todo el pedido se responde con la misma versión
+        try:
+            clave = estado.clave(consulta, request)
+            respuesta = estado.guardada(clave)
+            if respuesta is None:
+                # Calcular puede tardar (leer temporadas, armar índices): lo hago fuera del event loop
+                respuesta = await run_in_threadpool(estado.respuesta, clave)
+        except ErrorConsulta as error:
+            return Response(json.dumps({"error": error.mensaje}, ensure_ascii=False), status_code=error.estado, media_type=TIPO_JSON)
+        return respuesta.responder(request)
+
+    def endpoint(self, consulta):
+        async def atender(request):
+            return await self.atender(consulta, request)
+        return atender
+
+
+# Ruta -> consulta
+RUTAS = {
+    "/api": "indice",
+    "/api/top/{dimension}": "top",
+    "/api/paises": "paises",
+    "/api/cumpleanos": "cumpleanos",
+    "/api/pilotos": "pilotos",
+    "/api/pilotos/{nombre:path}": "pilotos",
+    "/api/escuderias": "escuderias",
+    "/api/escuderias/{nombre:path}": "escuderias",
+}
+
+
+def crear_app(precalcular=True):
+    api = API(precalcular)
+    rutas = [Route(ruta, api.endpoint(consulta), methods=["GET", "HEAD"]) for ruta, consulta in RUTAS.items()]
+    app = Starlette(routes=rutas)
+    app.state.api = api
+    return app
@@ -0,0 +1,210 @@
+# ===================== CONSULTAS (SIN STREAMLIT) =====================
+# Todas las preguntas que responde la app, en un módulo que se puede importar desde cualquier lado (la app,
+# scripts, la consola): carreras en un cumpleaños, la carrera más cercana, victorias por piloto y escudería,
+# los tops y el país con más carreras con su texto de empates. La app guarda un objeto Consultas por versión
+# de los datos y rango de temporadas en el registro (ver f1_almacen.py); los índices se arman recién la primera
+# vez que se usan.
+#
+# Además tiene versiones en lote con numpy (cumpleanos_lote) para responder millones de cumpleaños de una vez,
+# sin recorrer fila por fila (ver cumpleanos_csv.py).
+#
+# Un mismo objeto Consultas lo comparten todas las sesiones, así que es de solo lectura: sus arrays de numpy
+# quedan con writeable=False (escribir encima falla en vez de cambiarle los datos a todos) y las tablas salen
+# como vistas nuevas (copy(deep=False)). De las tablas se encarga Copy-on-Write de pandas: si alguien modifica su
+# vista se copia solo lo que toca, y to_numpy()/.values ya devuelven arrays de solo lectura.
+
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from f1_agregados import CuboVictorias
+from f1_datos import ganadores, gp_to_country, month_translation
+from f1_indices import DIAS_DEL_ANIO, DIAS_POR_MES, IndiceCumpleanos, IndiceEntidades, dia_del_anio
+
+COLUMNAS_CUMPLEANOS = ["Year", "Grand Prix", "Date", "Winner", "Team"]
+
+# Copy-on-Write viene activado por defecto desde pandas 3; con versiones anteriores lo activo acá
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+# Marca como de solo lectura todos los arrays de numpy de un objeto (sueltos o dentro de dicts, listas, atributos).
+# Los objetos de pandas no los toco: con Copy-on-Write ya no se pueden modificar por debajo desde afuera.
+def solo_lectura(valor, vistos=None):
+    vistos = set() if vistos is None else vistos
+    if id(valor) in vistos:
+        return valor
+    vistos.add(id(valor))
+    if isinstance(valor, np.ndarray):
+        valor.flags.writeable = False
+    elif isinstance(valor, (pd.DataFrame, pd.Series, pd.Index, pd.api.extensions.ExtensionArray)):
+        pass
+    elif isinstance(valor, dict):
+        for elemento in valor.values():
+            solo_lectura(elemento, vistos)
+    elif isinstance(valor, (list, tuple)):
+        for elemento in valor:
+            solo_lectura(elemento, vistos)
+    elif hasattr(valor, "__dict__"):
+        solo_lectura(vars(valor), vistos)
+    return valor
+
+
+# Pongo en mayúscula solo la primera letra (capitalize() me bajaría el resto a minúscula)
+def primera_mayuscula(texto):
+    return texto[0].upper() + texto[1:] if texto else texto
+
+
+def nombre_gp(gp):
+    return gp_to_country[gp] if gp in gp_to_country else gp
+
+
+def fecha_en_espanol(fecha):
+    return f"{fecha.day} {month_translation[fecha.strftime('%b')]} {fecha.year}"
+
+
+# Texto del país (o países empatados) con más carreras
+def texto_paises_lideres(paises, cantidad):
+    if len(paises) == 1:
+        texto = f"{paises[0]} fue el país con más Grandes Premios: {cantidad} en total."
+    elif len(paises) == 2:
+        pais1, pais2 = paises
+        # "Francia e Italia", pero "Italia y Francia"
+        conjuncion = "e" if pais2.strip().lower().startswith("i") else "y"
+        texto = f"{pais1} {conjuncion} {pais2} fueron los países con más Grandes Premios: {cantidad} cada uno."
+    else:
+        lista_paises = ", ".join(paises[:-1]) + f" y {paises[-1]}"
+        texto = f"{lista_paises} fueron los países con más Grandes Premios: {cantidad} cada uno."
+    return primera_mayuscula(texto)
+
+
+class Consultas:
+    def __init__(self, ganadores_df):
+        # Una fila por carrera con su ganador (como la devuelve f1_datos.ganadores). El DataFrame pasa a ser
+        # de este objeto: queda de solo lectura.
+        self._ganadores = solo_lectura(ganadores_df)
+
+    @classmethod
+    def rango(cls, desde, hasta):
+        return cls(ganadores(desde, hasta))
+
+    # Cada uno recibe su propia vista (sin copiar los datos)
+    @property
+    def ganadores(self):
+        return self._ganadores.copy(deep=False)
+
+    @cached_property
+    def cubo(self):
+        return solo_lectura(CuboVictorias(self._ganadores))
+
+    @cached_property
+    def cumpleanos(self):
+        return solo_lectura(IndiceCumpleanos(self._ganadores["Date_Parsed"]))
+
+    @cached_property
+    def pilotos(self):
+        return solo_lectura(IndiceEntidades(self._ganadores, "Winner", ["Year", "Grand Prix", "Date", "Team"]))
+
+    @cached_property
+    def escuderias(self):
+        return solo_lectura(IndiceEntidades(self._ganadores, "Team", ["Year", "Grand Prix", "Date", "Winner"]))
+
+    # ===================== CUMPLEAÑOS =====================
+
+    def carreras_del_dia(self, mes, dia):
+        return self._ganadores.iloc[self.cumpleanos.exactas(mes, dia)]
+
+    def carrera_mas_cercana(self, mes, dia):
+        posicion = self.cumpleanos.mas_cercana(mes, dia)
+        return None if posicion is None else self._ganadores.iloc[posicion]
+
+    def mensaje_mas_cercana(self, mes, dia):
+        carrera = self.carrera_mas_cercana(mes, dia)
+        if carrera is None:
+            return None
+        fecha_str = fecha_en_espanol(carrera["Date_Parsed"])
+        mensaje = (f"El GP de {nombre_gp(carrera['Grand Prix'])} en {fecha_str} fue la carrera más cercana a tu cumple. "
+                   f"Ganó {carrera['Winner']} con {carrera['Team']}.")
+        return primera_mayuscula(mensaje)
+
+    # Versión en lote: recibe arrays de meses y días y devuelve un DataFrame con una fila por cumpleaños.
+    # Todo sale de tablas y de np.searchsorted sobre el índice, sin ningún loop de Python por cumpleaños.
+    def cumpleanos_lote(self, meses, dias):
+        meses = np.asarray(meses, dtype=np.int64)
+        dias = np.asarray(dias, dtype=np.int64)
+        valida = (meses >= 1) & (meses <= 12)
+        valida &= (dias >= 1) & (dias <= np.asarray(DIAS_POR_MES)[np.clip(meses, 1, 12) - 1])
+
+        n = len(meses)
+        cantidad = np.zeros(n, dtype=np.int64)
+        exacta = np.full(n, -1, dtype=np.int64)
+        cercana = np.full(n, -1, dtype=np.int64)
+        distancia = np.full(n, -1, dtype=np.int64)
+
+        indice = self.cumpleanos
+        if len(indice) and valida.any():
+            m, d = meses[valida], dias[valida]
+            cantidad[valida], exacta[valida] = indice.exactas_lote(m, d)
+            cercanas = indice.mas_cercanas(m, d)
+            cercana[valida] = cercanas
+            # Distancia en días del calendario (dando la vuelta por Año Nuevo)
+            dia_carrera = dia_del_anio(self.meses_carreras[cercanas], self.dias_carreras[cercanas])
+            diferencia = np.abs(dia_carrera - dia_del_anio(m, d))
+            distancia[valida] = np.minimum(diferencia, DIAS_DEL_ANIO - diferencia)
+
+        resultado = pd.DataFrame({"valida": valida, "carreras_ese_dia": cantidad})
+        resultado = pd.concat([resultado, self.columnas_en(exacta, ""), self.columnas_en(cercana, "cercana_")], axis=1)
+        resultado["dias_de_distancia"] = distancia
+        return resultado
+
+    @cached_property
+    def meses_carreras(self):
+        return solo_lectura(self._ganadores["Date_Parsed"].dt.month.to_numpy(dtype=np.int64))
+
+    @cached_property
+    def dias_carreras(self):
+        return solo_lectura(self._ganadores["Date_Parsed"].dt.day.to_numpy(dtype=np.int64))
+
+    # Columnas de texto de cada carrera como arrays de numpy, para sacar miles de filas de una con np.take
+    @cached_property
+    def columnas_texto(self):
+        return solo_lectura({
+            "gp": np.array([nombre_gp(gp) for gp in self._ganadores["Grand Prix"]] + [""], dtype=object),
+            "fecha_gp": np.append(self._ganadores["Date_Parsed"].dt.strftime("%Y-%m-%d").to_numpy(dtype=object), ""),
+            "ganador": np.append(self._ganadores["Winner"].to_numpy(dtype=object), ""),
+            "escuderia": np.append(self._ganadores["Team"].to_numpy(dtype=object), ""),
+        })
+
+    def columnas_en(self, posiciones, prefijo):
+        # La posición -1 cae en el "" que agregué al final de cada columna
+        return pd.DataFrame({
+            f"{prefijo}{nombre}": valores[posiciones] for nombre, valores in self.columnas_texto.items()
+        })
+
+    # ===================== PILOTOS, ESCUDERÍAS Y PAÍSES =====================
+
+    def victorias_piloto(self, nombre):
+        return self.pilotos.victorias(nombre)
+
+    def victorias_escuderia(self, nombre):
+        return self.escuderias.victorias(nombre)
+
+    def top_pilotos(self, n=5):
+        return self.cubo.top("piloto", n, ["Piloto", "Victorias"])
+
+    def top_escuderias(self, n=5):
+        return self.cubo.top("escuderia", n, ["Escudería", "Victorias"])
+
+    def top_paises(self, n=5):
+        return self.cubo.top_con_empates("pais", n, ["País", "Carreras"])
+
+    # (cada carrera tiene un ganador, así que las victorias por país son las carreras de ese país)
+    def paises_con_mas_carreras(self):
+        return self.cubo.lideres("pais")
+
+    def texto_paises_con_mas_carreras(self):
+        paises, cantidad = self.paises_con_mas_carreras()
+        if not paises:
+            return None
+        return texto_paises_lideres(paises, cantidad)
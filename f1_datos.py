@@ -0,0 +1,445 @@
+# ===================== DATOS DE LA APP =====================
+# Acá está todo lo que tiene que ver con armar el dataset: las traducciones, las correcciones manuales
+# y el almacén ya procesado que lee la app. No usa Streamlit, así que también lo puedo correr por consola
+# (ver build_dataset.py).
+#
+# El almacén guarda los resultados partidos por temporada (datos/historia/temporada=AAAA.arrow), con una fila
+# por piloto clasificado en cada carrera. Con el CSV de los 50s solo hay ganadores (Position = 1), pero con un
+# export completo (formato Ergast) entra toda la historia desde 1950 con todas las posiciones.
+# Piloto, escudería, GP, país y circuito se guardan como diccionario (categorías), que ocupa mucho menos
+# cuando los mismos nombres se repiten en miles de filas.
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+CSV_ORIGEN = os.path.join(CARPETA, "F1_1950s_Race_Results_FULL.csv")
+CORRECCIONES = os.path.join(CARPETA, "datos", "correcciones.json")
+CIRCUITOS = os.path.join(CARPETA, "datos", "circuitos.csv")  # coordenadas de los circuitos de los 50s
+FUENTES_50S = [CSV_ORIGEN, CORRECCIONES, CIRCUITOS]
+# Se puede apuntar a otro almacén con la variable de entorno F1_HISTORIA (por ejemplo para los benchmarks)
+HISTORIA = os.environ.get("F1_HISTORIA", os.path.join(CARPETA, "datos", "historia"))
+
+# ===================== TRADUCCIÓN DE NOMBRES =====================
+# Para que se entienda mejor, traduzco los nombres de los GP a países, y también los meses a español
+
+gp_to_country = {
+    "British": "Reino Unido", "French": "Francia", "Italian": "Italia", "German": "Alemania",
+    "Monaco": "Mónaco", "Belgian": "Bélgica", "Dutch": "Países Bajos", "Swiss": "Suiza",
+    "Argentine": "Argentina", "Indianapolis 500": "Estados Unidos", "Spanish": "España",
+    "Portuguese": "Portugal", "Moroccan": "Marruecos"
+}
+
+month_translation = {
+    "Jan": "Enero", "Feb": "Febrero", "Mar": "Marzo", "Apr": "Abril", "May": "Mayo", "Jun": "Junio",
+    "Jul": "Julio", "Aug": "Agosto", "Sep": "Septiembre", "Oct": "Octubre", "Nov": "Noviembre", "Dec": "Diciembre"
+}
+
+# Traducción de GP a circuito específico (esto me sirve más adelante para el mapa y los tooltips)
+gp_to_circuits = {
+    "Argentine": ["Autódromo Juan y Oscar Gálvez"],
+    "Belgian": ["Spa-Francorchamps"],
+    "British": ["Silverstone", "Aintree"],
+    "Dutch": ["Zandvoort"],
+    "French": ["Reims-Gueux", "Rouen-Les-Essarts"],
+    "German": ["Nürburgring", "AVUS"],
+    "Indianapolis 500": ["Indianapolis Motor Speedway"],
+    "Italian": ["Autodromo Nazionale Monza", "Circuito di Pescara"],
+    "Monaco": ["Circuit de Monaco"],
+    "Moroccan": ["Ain-Diab Circuit"],
+    "Portuguese": ["Boavista", "Monsanto Park"],
+    "Spanish": ["Pedralbes"],
+    "Swiss": ["Bremgarten"]
+}
+
+# Países de los circuitos tal como vienen en el export de Ergast (en inglés). Si falta alguno queda en inglés.
+pais_ergast = {
+    "UK": "Reino Unido", "France": "Francia", "Italy": "Italia", "Germany": "Alemania", "Monaco": "Mónaco",
+    "Belgium": "Bélgica", "Netherlands": "Países Bajos", "Switzerland": "Suiza", "Argentina": "Argentina",
+    "USA": "Estados Unidos", "United States": "Estados Unidos", "Spain": "España", "Portugal": "Portugal",
+    "Morocco": "Marruecos", "Brazil": "Brasil", "Mexico": "México", "Canada": "Canadá", "Japan": "Japón",
+    "Austria": "Austria", "Hungary": "Hungría", "Sweden": "Suecia", "South Africa": "Sudáfrica",
+    "Australia": "Australia", "Malaysia": "Malasia", "China": "China", "Bahrain": "Baréin",
+    "Turkey": "Turquía", "Singapore": "Singapur", "Korea": "Corea del Sur", "India": "India",
+    "Abu Dhabi": "Emiratos Árabes Unidos", "UAE": "Emiratos Árabes Unidos", "Russia": "Rusia",
+    "Azerbaijan": "Azerbaiyán", "Saudi Arabia": "Arabia Saudita", "Qatar": "Catar", "Vietnam": "Vietnam",
+    "Netherland": "Países Bajos",
+}
+
+# Los GP que se corrieron en más de un circuito: en qué circuito fue cada año (los años que no están usan el
+# primero de gp_to_circuits). Pescara y el GP de Estados Unidos de 1959 (Sebring) no están en gp_to_circuits.
+circuito_por_anio = {
+    "British": {1955: "Aintree", 1957: "Aintree", 1959: "Aintree"},
+    "French": {1952: "Rouen-Les-Essarts", 1957: "Rouen-Les-Essarts"},
+    "German": {1959: "AVUS"},
+    "Portuguese": {1959: "Monsanto Park"},
+    "Pescara": {1957: "Circuito di Pescara"},
+    "United States": {1959: "Sebring"},
+}
+
+MESES_EN = list(month_translation.keys())
+
+# Tipos fijos de cada columna de las particiones, así la app siempre recibe lo mismo
+TEXTO_REPETIDO = pa.dictionary(pa.int32(), pa.string())
+ESQUEMA = pa.schema([
+    ("Year", pa.int16()),
+    ("Round", pa.int8()),
+    ("Grand Prix", TEXTO_REPETIDO),
+    ("Date", pa.string()),
+    ("Date_Parsed", pa.timestamp("ms")),
+    ("Driver", TEXTO_REPETIDO),
+    ("Team", TEXTO_REPETIDO),
+    ("Position", pa.int8()),  # nulo si no clasificó
+    ("Numero", pa.int16()),  # número del auto (sirve para detectar autos compartidos)
+    ("VueltaRapida", pa.bool_()),
+    ("País", TEXTO_REPETIDO),
+    ("Circuitos", TEXTO_REPETIDO),
+    ("Fuente", TEXTO_REPETIDO),
+])
+CATEGORIAS = ["Grand Prix", "Driver", "Team", "País", "Circuitos", "Fuente"]
+
+
+# ===================== CONSTRUCCIÓN DESDE EL CSV DE LOS 50s =====================
+# Junta el CSV original con las correcciones de datos/correcciones.json y completa país y circuitos.
+# Todo esto antes se hacía en cada rerun de la app; ahora se hace una sola vez al construir el almacén.
+
+def construir_dataset(csv_origen=CSV_ORIGEN, correcciones=CORRECCIONES):
+    df = pd.read_csv(csv_origen)
+    df["Date_Parsed"] = pd.to_datetime(df["Date"], format="%d %b %Y", errors='coerce')
+    df = df.dropna(subset=["Date_Parsed"])
+    df["Fuente"] = os.path.basename(csv_origen)
+
+    with open(correcciones, encoding="utf-8") as f:
+        overlay = json.load(f)
+
+    # Agrego las filas faltantes (por ejemplo las 9 ediciones de Indianápolis), cada una con su fuente
+    agregadas = pd.DataFrame(overlay.get("agregar", []))
+    if not agregadas.empty:
+        agregadas["Date_Parsed"] = pd.to_datetime(agregadas["Date"], format="%d %b %Y", errors='coerce')
+        df = pd.concat([df, agregadas], ignore_index=True)
+
+    # País y circuito de cada carrera ya quedan resueltos en el almacén
+    df["País"] = df["Grand Prix"].map(gp_to_country)
+    df["País"] = df["País"].replace(overlay.get("normalizar_pais", {}))
+    df["Circuitos"] = [
+        circuito_por_anio.get(gp, {}).get(year) or (gp_to_circuits.get(gp) or [""])[0]
+        for gp, year in zip(df["Grand Prix"], df["Year"])
+    ]
+
+    # El CSV solo trae al ganador de cada carrera
+    df = df.rename(columns={"Winner": "Driver"})
+    df["Position"] = 1
+    df["Numero"] = pd.NA
+    df["VueltaRapida"] = pd.NA
+    # La ronda sale del orden de las fechas dentro de cada temporada
+    df["Round"] = df.groupby("Year")["Date_Parsed"].rank(method="first").astype(int)
+
+    return df[ESQUEMA.names].reset_index(drop=True)
+
+
+# ===================== CONSTRUCCIÓN DESDE UN EXPORT COMPLETO (ERGAST) =====================
+# Para toda la historia uso los CSV del export de Ergast (races, results, drivers, constructors, circuits).
+# Cada resultado clasificado o no es una fila; position viene como \N cuando el piloto no clasificó.
+
+def construir_desde_ergast(carpeta):
+    def leer(nombre):
+        return pd.read_csv(os.path.join(carpeta, f"{nombre}.csv"), na_values=["\\N"], keep_default_na=False)
+
+    races = leer("races")
+    results = leer("results")
+    drivers = leer("drivers")
+    constructors = leer("constructors")
+    circuits = leer("circuits")
+
+    drivers["Driver"] = drivers["forename"] + " " + drivers["surname"]
+    races = races.merge(circuits[["circuitId", "name", "country"]].rename(columns={"name": "Circuitos"}), on="circuitId")
+    races["Grand Prix"] = races["name"].str.replace(" Grand Prix", "", regex=False)
+    races["Date_Parsed"] = pd.to_datetime(races["date"], format="%Y-%m-%d")
+    races["Date"] = [f"{d.day} {MESES_EN[d.month - 1]} {d.year}" for d in races["Date_Parsed"]]
+    races["País"] = races["Grand Prix"].map(gp_to_country).fillna(races["country"].map(pais_ergast)).fillna(races["country"])
+
+    df = (results
+          .merge(races[["raceId", "year", "round", "Grand Prix", "Date", "Date_Parsed", "País", "Circuitos"]], on="raceId")
+          .merge(drivers[["driverId", "Driver"]], on="driverId")
+          .merge(constructors[["constructorId", "name"]].rename(columns={"name": "Team"}), on="constructorId"))
+    df = df.rename(columns={"year": "Year", "round": "Round", "position": "Position", "number": "Numero"})
+    df["Position"] = df["Position"].astype("Int8")
+    df["Numero"] = df["Numero"].astype("Int16")
+    df["VueltaRapida"] = vueltas_rapidas(df)
+    df["Fuente"] = "Ergast"
+    df = df.sort_values(["Year", "Round", "positionOrder"])
+
+    return df[ESQUEMA.names].reset_index(drop=True)
+
+
+# Quién hizo la vuelta rápida de cada carrera: rank == 1, o si falta el rank, el menor fastestLapTime. Ergast
+# trae esos datos recién desde 2004; en las carreras sin ninguno de los dos queda vacía (no se sabe), no False, y
+# f1_puntos.py no puede dar el punto de la vuelta rápida de los 50s.
+def vueltas_rapidas(df):
+    rapida = pd.Series(pd.NA, index=df.index, dtype="boolean")
+    if "fastestLapTime" in df:
+        partes = df["fastestLapTime"].astype("string").str.extract(r"^(?:(\d+):)?(\d+(?:\.\d+)?)$")
+        segundos = partes[0].astype(float).fillna(0) * 60 + partes[1].astype(float)
+        con_tiempo = segundos.notna().groupby(df["raceId"]).transform("any")
+        rapida = rapida.mask(con_tiempo, segundos == segundos.groupby(df["raceId"]).transform("min"))
+    if "rank" in df:
+        con_rank = df["rank"].notna().groupby(df["raceId"]).transform("any")
+        rapida = rapida.mask(con_rank, df["rank"] == 1)
+    return rapida
+
+
+# ===================== COORDENADAS DE LOS CIRCUITOS =====================
+# Una fila por circuito (nombre como en la columna Circuitos, latitud, longitud y país), para el mapa
+
+def tabla_circuitos(csv=CIRCUITOS):
+    return pd.read_csv(csv)
+
+
+def circuitos_desde_ergast(carpeta):
+    circuits = pd.read_csv(os.path.join(carpeta, "circuits.csv"), na_values=["\\N"], keep_default_na=False)
+    tabla = pd.DataFrame({
+        "Circuito": circuits["name"],
+        "Lat": circuits["lat"].astype(float),
+        "Lon": circuits["lng"].astype(float),
+        "País": circuits["country"].map(pais_ergast).fillna(circuits["country"]),
+    })
+    return tabla.dropna(subset=["Lat", "Lon"]).reset_index(drop=True)
+
+
+# ===================== ESCRITURA DEL ALMACÉN POR TEMPORADA =====================
+# Cada archivo lleva en el nombre un hash de su contenido (temporada=1950.<hash>.arrow) y el manifest dice qué
+# archivo corresponde a cada temporada. Así una versión nueva nunca pisa los archivos que está leyendo la
+# anterior: se escriben los archivos nuevos, se cambia el manifest de una (os.replace) y recién después se borran
+# los viejos. Las temporadas que no cambiaron quedan con el mismo archivo, y el caché de particiones las reusa.
+
+# Huella del contenido de un archivo. La recalculo solo si cambió la fecha o el tamaño del archivo.
+@lru_cache(maxsize=64)
+def huella_archivo(ruta, mtime_ns, tamanio):
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            sha.update(bloque)
+    return sha.hexdigest()[:16]
+
+
+def huella(ruta):
+    if not os.path.exists(ruta):
+        return None
+    estado = os.stat(ruta)
+    return huella_archivo(ruta, estado.st_mtime_ns, estado.st_size)
+
+
+# Las fuentes van en el manifest relativas a la carpeta del proyecto (con "/"), así un checkout copiado o
+# desplegado en otra carpeta sigue reconociendo sus fuentes. Las de afuera (un export de Ergast) quedan absolutas.
+def ruta_fuente(ruta):
+    relativa = os.path.relpath(os.path.abspath(ruta), CARPETA)
+    if relativa == os.pardir or relativa.startswith(os.pardir + os.sep):
+        return os.path.abspath(ruta)
+    return relativa.replace(os.sep, "/")
+
+
+def resolver_fuente(ruta):
+    return ruta if os.path.isabs(ruta) else os.path.join(CARPETA, *ruta.split("/"))
+
+
+def escribir_tabla(tabla, carpeta, prefijo):
+    # Escribo a un archivo temporal y después lo renombro, así nunca queda un archivo a medio escribir
+    temporal = os.path.join(carpeta, f"{prefijo}.{os.getpid()}.tmp")
+    with pa.OSFile(temporal, "wb") as f:
+        with pa.ipc.new_file(f, tabla.schema) as writer:
+            writer.write_table(tabla)
+    nombre = f"{prefijo}.{huella(temporal)[:12]}.arrow"
+    os.replace(temporal, os.path.join(carpeta, nombre))
+    return nombre
+
+
+def archivos_del_manifiesto(manifiesto):
+    archivos = {datos["archivo"] for datos in manifiesto.get("temporadas", {}).values()}
+    for extra in ("circuitos", "trivia"):
+        if manifiesto.get(extra):
+            archivos.add(manifiesto[extra])
+    return archivos
+
+
+def escribir_historia(df, fuentes, carpeta=None, circuitos=None):
+    carpeta = carpeta or HISTORIA
+    os.makedirs(carpeta, exist_ok=True)
+    temporadas = {}
+    for year, temporada in df.groupby("Year", sort=True):
+        tabla = pa.Table.from_pandas(temporada, schema=ESQUEMA, preserve_index=False)
+        temporadas[str(year)] = {"archivo": escribir_tabla(tabla, carpeta, f"temporada={year}"), "filas": len(temporada)}
+
+    # La tabla de circuitos va junto a las temporadas, así el mapa usa siempre la del mismo export
+    archivo_circuitos = None
+    if circuitos is not None:
+        archivo_circuitos = escribir_tabla(pa.Table.from_pandas(circuitos, preserve_index=False), carpeta, "circuitos")
+
+    # El banco de preguntas de la trivia sale de estos mismos datos, así las respuestas siempre coinciden con
+    # lo que muestra la app (ver f1_trivia.py; lo importo acá porque f1_trivia usa este módulo)
+    import f1_trivia
+    archivo_trivia = escribir_tabla(f1_trivia.generar(df, circuitos), carpeta, "trivia")
+
+    manifiesto = {
+        "temporadas": temporadas,
+        "circuitos": archivo_circuitos,
+        "trivia": archivo_trivia,
+        "completo": bool((df["Position"] != 1).any()),
+        # Huella del contenido de cada fuente: si alguna cambia, el almacén está desactualizado
+        "fuentes": {ruta_fuente(ruta): huella(ruta) for ruta in fuentes},
+    }
+    ruta_anterior = os.path.join(carpeta, "manifest.json")
+    anterior = {}
+    if os.path.exists(ruta_anterior):
+        with open(ruta_anterior, encoding="utf-8") as f:
+            anterior = json.load(f)
+    temporal = os.path.join(carpeta, f"manifest.json.{os.getpid()}.tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta_anterior)
+
+    # Borro los archivos que no usa ni esta versión ni la anterior (a la anterior la pueden estar leyendo todavía
+    # las sesiones que no se pasaron a la nueva)
+    en_uso = archivos_del_manifiesto(manifiesto) | archivos_del_manifiesto(anterior)
+    for nombre in os.listdir(carpeta):
+        if nombre.startswith(("temporada=", "circuitos", "trivia")) and nombre.endswith(".arrow"):
+            if nombre not in en_uso:
+                try:
+                    os.remove(os.path.join(carpeta, nombre))
+                except OSError:
+                    pass  # (en Windows no se puede borrar un archivo abierto; queda para la próxima)
+    return manifiesto
+
+
+def ruta_manifiesto():
+    return os.path.join(HISTORIA, "manifest.json")
+
+
+def historia_desactualizada():
+    if not os.path.exists(ruta_manifiesto()):
+        return True
+    with open(ruta_manifiesto(), encoding="utf-8") as f:
+        man = json.load(f)
+    # Un manifest viejo puede tener las rutas absolutas de otra instalación: las reconozco por cómo terminan
+    fuentes_50s = {ruta_fuente(ruta): ruta for ruta in FUENTES_50S}
+    fuentes = {}
+    for ruta, anterior in man["fuentes"].items():
+        if os.path.isabs(ruta):
+            ruta = next((r for r in fuentes_50s if ruta.replace(os.sep, "/").endswith("/" + r)), ruta)
+        fuentes[ruta] = anterior
+    # Solo reconstruyo sola la versión de los 50s; si el almacén vino de otro export lo dejo como está.
+    # (Un almacén de los 50s armado antes de que existieran la tabla de circuitos o el banco de trivia también
+    # se rehace.)
+    if not set(fuentes) <= set(fuentes_50s) or ruta_fuente(CSV_ORIGEN) not in fuentes:
+        return False
+    if set(fuentes) != set(fuentes_50s) or not man.get("trivia") or fuentes != man["fuentes"]:
+        return True
+    return any(huella(resolver_fuente(ruta)) != anterior for ruta, anterior in fuentes.items())
+
+
+def construir_historia_50s():
+    return escribir_historia(construir_dataset(), FUENTES_50S, circuitos=tabla_circuitos())
+
+
+# ===================== LECTURA DEL ALMACÉN =====================
+# Solo leo las particiones de las temporadas que pide la vista. Cada partición se lee con memory map y queda
+# en un caché chico compartido por todo el proceso, así no crece la memoria con toda la historia.
+#
+# Las funciones de lectura reciben opcionalmente el manifest ya leído: así quien necesita una foto fija de los
+# datos (f1_almacen.py, mientras se publica una versión nueva) lee siempre los archivos de la misma versión.
+
+def leer_manifiesto():
+    with open(ruta_manifiesto(), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def manifiesto():
+    if historia_desactualizada():
+        construir_historia_50s()
+    return leer_manifiesto()
+
+
+# Cambia el almacén que se lee (y vacía el caché de particiones del anterior)
+def usar_historia(carpeta):
+    global HISTORIA
+    HISTORIA = carpeta
+    leer_particion.cache_clear()
+
+
+def temporadas_disponibles(man=None):
+    return sorted(int(year) for year in (man or manifiesto())["temporadas"])
+
+
+# Identificador de una versión del almacén: el hash del manifest, que cambia cada vez que cambia algún archivo
+# (los nombres llevan el hash del contenido). Lo uso como parte de la clave de los cachés que dependen de los datos.
+# De las fuentes solo entran las huellas, no las rutas: la versión (y los ETag de la API) no dependen de en qué
+# carpeta está instalada la app.
+def version_de(man):
+    man = dict(man, fuentes=sorted(str(h) for h in man.get("fuentes", {}).values()))
+    return hashlib.sha256(json.dumps(man, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def version_datos():
+    return version_de(manifiesto())
+
+
+# Los nombres de archivo cambian con el contenido, así que la ruta sola alcanza como clave del caché
+@lru_cache(maxsize=32)
+def leer_particion(ruta):
+    with pa.memory_map(ruta, "r") as fuente:
+        return pa.ipc.open_file(fuente).read_all()
+
+
+def leer_temporadas(desde, hasta, man=None):
+    man = man or manifiesto()
+    years = [year for year in temporadas_disponibles(man) if desde <= year <= hasta]
+    if not years:
+        return pa.Table.from_pylist([], schema=ESQUEMA)
+    rutas = [os.path.join(HISTORIA, man["temporadas"][str(year)]["archivo"]) for year in years]
+    tabla = pa.concat_tables([leer_particion(ruta) for ruta in rutas]).unify_dictionaries()
+    return tabla
+
+
+# Paso la tabla de Arrow a pandas: las columnas de texto repetido quedan como Categorical y el resto con
+# ArrowDtype (sin copiar los buffers del memory map)
+def a_pandas(tabla):
+    df = tabla.to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+    for columna in CATEGORIAS:
+        df[columna] = df[columna].cat.remove_unused_categories()
+    return df
+
+
+def resultados(desde, hasta, man=None):
+    return a_pandas(leer_temporadas(desde, hasta, man))
+
+
+# Coordenadas de los circuitos (para el mapa)
+def leer_circuitos(man=None):
+    nombre = (man or manifiesto()).get("circuitos")
+    if not nombre:
+        return pd.DataFrame({"Circuito": [], "Lat": [], "Lon": [], "País": []})
+    with pa.memory_map(os.path.join(HISTORIA, nombre), "r") as fuente:
+        return pa.ipc.open_file(fuente).read_all().to_pandas()
+
+
+# Banco de preguntas de la trivia (None si el almacén es de antes de que existiera)
+def leer_trivia(man=None):
+    nombre = (man or manifiesto()).get("trivia")
+    if not nombre:
+        return None
+    with pa.memory_map(os.path.join(HISTORIA, nombre), "r") as fuente:
+        return pa.ipc.open_file(fuente).read_all()
+
+
+# Vista de ganadores: una fila por carrera con las mismas columnas que usaba la app con el CSV original
+def ganadores(desde, hasta, man=None):
+    tabla = leer_temporadas(desde, hasta, man)
+    tabla = tabla.filter(pc.equal(tabla["Position"], 1))
+    df = a_pandas(tabla).rename(columns={"Driver": "Winner"})
+    return df.reset_index(drop=True)
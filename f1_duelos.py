@@ -0,0 +1,131 @@
+# ===================== CARA A CARA ENTRE PILOTOS O ESCUDERÍAS =====================
+# Para comparar dos pilotos (o dos escuderías): en cuántas carreras corrieron los dos, cuántas veces terminó
+# cada uno delante del otro y en qué carreras, y las victorias de cada uno por temporada.
+#
+# Hacer eso con un join de todos los resultados contra sí mismos en cada consulta es caro con toda la historia.
+# Acá armo una sola vez por versión de los datos (queda en el registro, ver f1_almacen.py) una matriz dispersa
+# entidad x entidad en formato CSR, con numpy (no hace falta scipy):
+# - cada fila es una entidad y sus columnas son las entidades con las que compartió alguna carrera, ordenadas;
+# - cada celda apunta a un tramo contiguo de "encuentros" (carrera, posición de uno, posición del otro), así
+#   la lista de carreras compartidas de un par sale de una rebanada, sin buscar en los resultados.
+# Buscar un par es leer dónde empieza la fila y una búsqueda binaria entre sus columnas.
+# Para las escuderías cuenta el auto mejor ubicado de cada una en cada carrera. Un piloto no clasificado
+# (posición vacía) queda detrás de todos los clasificados. No usa Streamlit.
+
+import numpy as np
+import pandas as pd
+
+from f1_consultas import nombre_gp, solo_lectura
+from f1_indices import IndiceBusqueda
+
+# Posición que uso para los no clasificados (detrás de cualquier clasificado)
+NO_CLASIFICADO = np.iinfo(np.int16).max
+
+
+class MatrizDuelos:
+    def __init__(self, resultados_df, columna):
+        df = resultados_df
+        year = df["Year"].to_numpy(dtype=np.int64)
+        ronda = df["Round"].to_numpy(dtype=np.int64)
+        # (Position es int8 de Arrow y el 32767 no entra: primero la paso a 64 bits y después relleno los vacíos)
+        posicion = df["Position"].astype("Int64").fillna(NO_CLASIFICADO).to_numpy(dtype=np.int64)
+        # Con el CSV de los 50s solo están los ganadores: casi no hay carreras en común para comparar
+        self.solo_ganadores = not ((posicion > 1) & (posicion != NO_CLASIFICADO)).any()
+        codigos, nombres = df[columna].factorize(sort=True)
+        self.nombres = tuple(str(nombre) for nombre in nombres)
+        self.ids = {nombre: i for i, nombre in enumerate(self.nombres)}
+        n = len(self.nombres)
+
+        # Carreras (año, ronda) con su nombre y fecha, para la tabla de carreras compartidas
+        clave_carrera = year * 1000 + ronda
+        carreras, primera_fila, carrera = np.unique(clave_carrera, return_index=True, return_inverse=True)
+        self.carreras = pd.DataFrame({
+            "Año": year[primera_fila],
+            "Gran Premio": [nombre_gp(gp) for gp in df["Grand Prix"].to_numpy(dtype=object)[primera_fila]],
+            "Fecha": df["Date"].to_numpy(dtype=object)[primera_fila],
+        })
+
+        # Una participación por (carrera, entidad): la mejor posición (para las escuderías, el mejor auto)
+        orden = np.lexsort((posicion, codigos, carrera))
+        carrera, codigos, posicion = carrera[orden], codigos[orden], posicion[orden]
+        primero = np.ones(len(orden), dtype=bool)
+        primero[1:] = (carrera[1:] != carrera[:-1]) | (codigos[1:] != codigos[:-1])
+        carrera, codigos, posicion = carrera[primero], codigos[primero], posicion[primero]
+
+        # Todos los pares de participantes de cada carrera, sin loops: cada participación se repite tantas veces
+        # como participantes tiene su carrera y se cruza con cada uno de ellos
+        inicio = np.searchsorted(carrera, carrera, side="left")
+        tamanio = np.bincount(carrera, minlength=len(carreras))[carrera]
+        uno = np.repeat(np.arange(len(carrera)), tamanio)
+        desplazamiento = np.arange(len(uno)) - np.repeat(np.cumsum(tamanio) - tamanio, tamanio)
+        otro = inicio[uno] + desplazamiento
+        distintos = uno != otro
+        uno, otro = uno[distintos], otro[distintos]
+
+        # Ordeno los encuentros por (entidad, rival, carrera): cada par queda en un tramo contiguo
+        par = codigos[uno].astype(np.int64) * n + codigos[otro]
+        orden = np.lexsort((carrera[uno], par))
+        par, uno, otro = par[orden], uno[orden], otro[orden]
+        self.encuentro_carrera = carrera[uno].astype(np.int32)
+        self.encuentro_propia = posicion[uno].astype(np.int16)
+        self.encuentro_rival = posicion[otro].astype(np.int16)
+
+        pares, self.par_inicio = np.unique(par, return_index=True)
+        self.par_inicio = np.append(self.par_inicio, len(par))
+        self.columnas = (pares % max(n, 1)).astype(np.int32)
+        filas = pares // max(n, 1)
+        self.fila_inicio = np.searchsorted(filas, np.arange(n + 1), side="left")
+
+        # Cuántas veces terminó cada uno delante, por par (prefijo acumulado sobre los encuentros)
+        delante = np.concatenate([[0], np.cumsum(self.encuentro_propia < self.encuentro_rival)])
+        self.par_delante = delante[self.par_inicio[1:]] - delante[self.par_inicio[:-1]]
+
+        # Victorias por temporada de cada entidad, también en tramos contiguos por entidad
+        ganadas = posicion == 1
+        victorias = pd.DataFrame({"id": codigos[ganadas], "Año": self.carreras["Año"].to_numpy()[carrera[ganadas]]})
+        victorias = victorias.groupby(["id", "Año"]).size().rename("Victorias").reset_index()
+        self.victorias_id = victorias["id"].to_numpy()
+        self.victorias = victorias[["Año", "Victorias"]]
+        self.victorias_inicio = np.searchsorted(self.victorias_id, np.arange(n + 1), side="left")
+
+        # Buscador por nombre, con los que más carreras corrieron primero
+        self.busqueda = IndiceBusqueda(self.nombres, np.bincount(codigos, minlength=n))
+        solo_lectura(self)
+
+    def __contains__(self, nombre):
+        return nombre in self.ids
+
+    # Posición del par (a, b) entre las celdas de la matriz, o None si nunca corrieron juntos
+    def celda(self, a, b):
+        inicio, fin = self.fila_inicio[a], self.fila_inicio[a + 1]
+        k = inicio + int(np.searchsorted(self.columnas[inicio:fin], b))
+        return k if k < fin and self.columnas[k] == b else None
+
+    def duelo(self, nombre_a, nombre_b):
+        a, b = self.ids[nombre_a], self.ids[nombre_b]
+        k = self.celda(a, b)
+        if k is None:
+            return {"carreras": 0, "delante_a": 0, "delante_b": 0, "tabla": None}
+        inicio, fin = self.par_inicio[k], self.par_inicio[k + 1]
+        propia, rival = self.encuentro_propia[inicio:fin], self.encuentro_rival[inicio:fin]
+        tabla = self.carreras.iloc[self.encuentro_carrera[inicio:fin]].reset_index(drop=True)
+        tabla[nombre_a] = np.where(propia == NO_CLASIFICADO, "NC", propia.astype(str))
+        tabla[nombre_b] = np.where(rival == NO_CLASIFICADO, "NC", rival.astype(str))
+        tabla.index += 1
+        return {
+            "carreras": int(fin - inicio),
+            "delante_a": int(self.par_delante[k]),
+            "delante_b": int(np.count_nonzero(rival < propia)),
+            "tabla": tabla,
+        }
+
+    # Victorias por temporada de los dos, una columna para cada uno
+    def victorias_por_temporada(self, nombre_a, nombre_b):
+        columnas = {}
+        for nombre in (nombre_a, nombre_b):
+            i = self.ids[nombre]
+            tramo = self.victorias.iloc[self.victorias_inicio[i]:self.victorias_inicio[i + 1]]
+            columnas[nombre] = pd.Series(tramo["Victorias"].to_numpy(), index=tramo["Año"].to_numpy())
+        tabla = pd.DataFrame(columnas).fillna(0).astype("int64").sort_index()
+        tabla.index.name = "Año"
+        return tabla
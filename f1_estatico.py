@@ -0,0 +1,260 @@
+# ===================== SECCIONES FIJAS YA RENDERIZADAS =====================
+# Buena parte de la página es igual para todos los visitantes y en todos los reruns: el estilo a cuadros, la
+# presentación, "¿Por qué volver a los 50s?", los dos gráficos del top 5, el texto y la tabla de los países con
+# más carreras, el mapa en su vista inicial y el cierre. Antes cada rerun completo los volvía a pedir uno por uno
+# (gráficos al caché, tabla pasada a Arrow, jerarquía del mapa, cada título por separado).
+#
+# Acá los renderizo una sola vez por versión del almacén y rango de temporadas en un paquete JSON: HTML ya
+# armado (varios títulos y textos juntos en un solo bloque), los specs de Vega-Lite y el JSON del mapa. La app
+# solo lo incrusta; Python se gasta en las secciones con widgets (cumpleaños, explorador, test, trivia).
+# - python build_static.py escribe los paquetes en datos/estatico/ (uno por rango, con la versión del almacén y
+#   la huella del código que los renderiza en el nombre); la app los lee de ahí y, si falta alguno, lo arma en
+#   memoria la primera vez (queda en el registro por versión, ver f1_almacen.py).
+# - La huella (ver huella_render()) cambia si cambia este módulo, los que arman los gráficos, el mapa y los
+#   textos, o las versiones de altair y pydeck: un paquete renderizado con código viejo no se vuelve a usar
+#   aunque los datos sean los mismos.
+# - La presentación y el estilo no dependen de los datos: son constantes de este módulo y se mandan antes de
+#   cargar pandas, como antes.
+# No usa Streamlit.
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from importlib import metadata
+
+import f1_recursos
+from f1_graficos import MapaSerializado
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+PAQUETES = os.path.join(CARPETA, "datos", "estatico")
+# Si cambia lo que va en el paquete, subo el formato y los paquetes viejos dejan de leerse
+FORMATO = 1
+# Lo que define cómo se renderiza un paquete: los módulos que arman su contenido y las librerías de los specs
+MODULOS_RENDER = ("f1_estatico.py", "f1_graficos.py", "f1_mapa.py", "f1_consultas.py", "f1_agregados.py")
+LIBRERIAS_RENDER = ("altair", "pydeck")
+
+
+# ===================== PRESENTACIÓN (no depende de los datos) =====================
+
+# Acá le doy estilo a toda la página para que tenga un fondo de banderita a cuadros y los textos sean legibles.
+ESTILO = """
+<style>
+html, body, .stApp {
+    height: 100%;
+    margin: 0;
+    padding: 0;
+    background-color: white;
+    background-image: repeating-conic-gradient(#fff 0% 25%, #000 0% 50%);
+    background-size: 40px 40px;
+}
+
+.block-container {
+    background-color: rgba(255, 255, 255, 0.95);
+    padding: 3rem;
+    border-radius: 15px;
+    box-shadow: 0px 0px 10px rgba(0,0,0,0.3);
+}
+
+.block-container h1, .block-container h2, .block-container h3,
+.block-container h4, .block-container h5, .block-container h6,
+.block-container p, .block-container label, .block-container div {
+    color: black !important;
+}
+</style>
+"""
+
+# Un emoji de auto rojo de F1 que pasa al principio para que la app tenga una introducción y no todo sea estático
+ANIMACION = """
+<div style="position:relative; height:160px; overflow:hidden;">
+    <div style="
+        position:absolute;
+        left: 100%;
+        top:20px;
+        animation: drive 3s linear forwards;
+        font-size: 120px;">
+        🏎️💨
+    </div>
+</div>
+
+<style>
+@keyframes drive {
+    0% { left: 100%; }
+    100% { left: -500px; }
+}
+</style>
+"""
+
+TITULO = "<h1 style='text-align: center;'>La Fórmula de los 50s</h1>"
+
+PIE_PORTADA = "Alfa Romeo 158 en el GP de Gran Bretaña, 1950"
+
+INTRO = """
+<div style="background-color: rgba(255, 255, 255, 0.92); padding: 1.5rem; border-radius: 12px; margin-top: 1rem;">
+    <h4 style="color: black;">🏁 Bienvenido a la era dorada de la F1</h4>
+    <p style="color: black; font-size: 16px; line-height: 1.6;">
+        Antes de los autos híbridos, de los cascos ultratecnológicos y de las radios con estrategias complicadas, la Fórmula 1 era puro corazón, instinto y gasolina. Los años 50 fueron el inicio de una leyenda: pilotos temerarios, escuderías míticas y circuitos que permitían la historia vuelta a vuelta.
+    </p>
+    <p style="color: black; font-size: 16px; line-height: 1.6;">
+        Esta página no es solo una base de datos: es un viaje interactivo a la década donde todo comenzó.
+    </p>
+    <p style="color: black; font-size: 16px; font-weight: bold;">
+        Hoy muchos conocen a Verstappen o Hamilton, y pocos recuerdan las historias de Fangio o Ascari. Esta web busca cambiar eso.<br>
+        Explora, juega y descubre. Porque entender el presente de la F1 también es rendir homenaje a su pasado más bravo. 🏎️✨
+    </p>
+</div>
+"""
+
+# En vez de decir "justificación", hago esta sección donde implícitamente explico por qué vale la pena mirar esa década
+POR_QUE = """
+### ⏳ ¿Por qué volver a los 50s?
+
+<p style="font-size: 16px; line-height: 1.6;">
+En la era del streaming, las estadísticas y los monoplazas futuristas, a veces olvidamos cómo empezó todo.
+Los años 50 fueron más que una introducción: fueron una época donde cada victoria era una hazaña y cada circuito, un riesgo real.
+Pocos conocen esta parte de la historia. Esta plataforma te invita a redescubrirla, interactuar con ella y hacerla tuya.
+</p>
+"""
+
+# Esta sección cierra la web dándole sentido a todo el recorrido sin necesidad de decir "esta es una justificación"
+CIERRE = """
+## 📦 ¿Qué nos deja volver al pasado?
+
+<div style="background-color: #ffffffdd; padding: 1.5rem; border-radius: 12px; margin-top: 1rem;">
+    <p style="color: black; font-size: 16px; line-height: 1.7;">
+        A lo largo de esta página vimos que los años 50 no fueron una simple etapa temprana de la Fórmula 1.
+        Fueron un laboratorio de riesgo, de ingenio y de pasión desmedida.
+        Sus protagonistas no tenían simuladores ni telemetría, pero sí una voluntad inquebrantable.
+    </p>
+    <p style="color: black; font-size: 16px; line-height: 1.7;">
+        Quizá al principio te preguntabas por qué mirar tan atrás. Ahora sabes que Fangio no es solo una calle
+        o una estatua, que los circuitos no eran simples pistas y que cada escudería tenía algo que decir.
+        Explorar esta década es también entender de dónde venimos, por qué la F1 es lo que es hoy y a quiénes
+        les debemos cada vuelta de rueda.
+    </p>
+    <p style="color: black; font-size: 16px; line-height: 1.7; font-weight: bold;">
+        Hoy más que nunca, conocer la historia no es nostalgia: es memoria, es homenaje, es conexión.
+    </p>
+</div>
+"""
+
+
+# Estilo, título, portada y presentación en un solo bloque. La imagen sale de static/img/ (ver build_assets.py),
+# o del link original mientras no estén las versiones locales. Sin caché: si se regeneran las imágenes, el
+# próximo rerun ya las usa.
+def cabecera():
+    return ESTILO + TITULO + f1_recursos.html_imagen("portada", PIE_PORTADA) + INTRO
+
+
+# ===================== PERÍODO =====================
+
+# Texto del período para los títulos ("los 50s" si es una década completa)
+def textos_periodo(desde, hasta):
+    if desde % 10 == 0 and hasta == desde + 9:
+        periodo = f"los {desde % 100:02d}s" if desde < 2000 else f"los {desde}s"
+        periodo_largo = f"los años {desde % 100:02d}" if desde < 2000 else f"los años {desde}"
+    elif desde == hasta:
+        periodo = periodo_largo = f"la temporada {desde}"
+    else:
+        periodo = periodo_largo = f"las temporadas {desde}–{hasta}"
+    return periodo, periodo_largo
+
+
+# Los rangos que se ven sin tocar nada (la primera década, como la barra lateral de la app) y toda la historia
+def rangos_por_defecto(temporadas):
+    primera = temporadas[0] // 10 * 10
+    rangos = [(max(primera, temporadas[0]), min(primera + 9, temporadas[-1]))]
+    if rangos[0] != (temporadas[0], temporadas[-1]):
+        rangos.append((temporadas[0], temporadas[-1]))
+    return rangos
+
+
+# ===================== PAQUETE POR VERSIÓN Y RANGO =====================
+
+def tabla_html(df):
+    return df.to_html(border=0, escape=True)
+
+
+def armar(datos, circuitos, desde, hasta):
+    from f1_graficos import grafico_barras, mapa_circuitos
+    from f1_mapa import NIVELES_MAPA, VISTA_MUNDO, JerarquiaClusters, puntos_circuitos
+
+    periodo, periodo_largo = textos_periodo(desde, hasta)
+    cubo = datos.cubo
+    jerarquia = JerarquiaClusters(puntos_circuitos(circuitos, cubo.conteo("circuito")))
+    mapa = mapa_circuitos(jerarquia, NIVELES_MAPA["Mundo"], *VISTA_MUNDO)
+    return {
+        "formato": FORMATO,
+        "render": huella_render(),
+        "desde": desde,
+        "hasta": hasta,
+        "por_que": POR_QUE,
+        "titulo_pilotos": f"### 🏆 Piloto con más victorias en {periodo}",
+        "grafico_pilotos": grafico_barras(cubo.top("piloto", 5, ["Piloto", "Victorias"]), "Piloto", "crimson"),
+        "titulo_escuderias": f"### 🔧 Escudería más dominante de {periodo}",
+        "grafico_escuderias": grafico_barras(cubo.top("escuderia", 5, ["Escudería", "Victorias"]), "Escudería", "steelblue"),
+        "titulo_paises": f"### 🌍 País con más carreras en {periodo}",
+        "texto_paises": datos.texto_paises_con_mas_carreras(),
+        "tabla_paises": tabla_html(datos.top_paises(5)),
+        "titulo_mapa": f"### 🗺️ Mapa de circuitos con carreras en {periodo_largo}",
+        "mapa": {"json": mapa.json, "tooltip": mapa.tooltip, "filas": mapa.filas},
+        "cierre": CIERRE,
+    }
+
+
+# Hash corto del formato, del código de MODULOS_RENDER y de las versiones de LIBRERIAS_RENDER (una vez por proceso)
+@lru_cache(maxsize=1)
+def huella_render():
+    h = hashlib.sha256(f"formato {FORMATO}".encode())
+    for nombre in MODULOS_RENDER:
+        with open(os.path.join(CARPETA, nombre), "rb") as f:
+            h.update(nombre.encode() + b"\0" + f.read())
+    for libreria in LIBRERIAS_RENDER:
+        try:
+            h.update(f"{libreria} {metadata.version(libreria)}".encode())
+        except metadata.PackageNotFoundError:
+            h.update(f"{libreria} -".encode())
+    return h.hexdigest()[:12]
+
+
+def ruta_paquete(version, desde, hasta, carpeta=None):
+    return os.path.join(carpeta or PAQUETES, f"{version}.{huella_render()}.{desde}-{hasta}.json")
+
+
+def guardar(paquete, version, carpeta=None):
+    ruta = ruta_paquete(version, paquete["desde"], paquete["hasta"], carpeta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(paquete, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(ruta + ".tmp", ruta)
+    return ruta
+
+
+# El paquete guardado para esa versión y rango, o None si no está (o lo renderizó otro código)
+def leer(version, desde, hasta, carpeta=None):
+    try:
+        with open(ruta_paquete(version, desde, hasta, carpeta), encoding="utf-8") as f:
+            paquete = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return paquete if paquete.get("formato") == FORMATO and paquete.get("render") == huella_render() else None
+
+
+# Borra los paquetes de otras versiones del almacén o renderizados con otro código
+def limpiar(version, carpeta=None):
+    carpeta = carpeta or PAQUETES
+    borrados = []
+    if os.path.isdir(carpeta):
+        for nombre in os.listdir(carpeta):
+            if nombre.endswith(".json") and not nombre.startswith(f"{version}.{huella_render()}."):
+                os.remove(os.path.join(carpeta, nombre))
+                borrados.append(nombre)
+    return borrados
+
+
+# Lo que usa la app: los textos tal cual y el mapa listo para st.pydeck_chart
+class Paquete:
+    def __init__(self, paquete):
+        for clave, valor in paquete.items():
+            setattr(self, clave, valor)
+        self.mapa = MapaSerializado(paquete["mapa"]["json"], paquete["mapa"]["tooltip"], paquete["mapa"]["filas"])
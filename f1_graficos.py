@@ -0,0 +1,75 @@
+# ===================== GRÁFICOS Y MAPA YA SERIALIZADOS =====================
+# Antes en cada rerun se volvían a armar los dos gráficos de Altair y el Deck de pydeck del mapa, y Streamlit
+# los volvía a pasar a JSON (Vega-Lite y deck.gl). Acá los armo y serializo una sola vez: los gráficos y la vista
+# inicial del mapa van al paquete de las secciones fijas (ver f1_estatico.py) y las otras vistas del mapa la app
+# las guarda con st.cache_resource usando la versión del almacén, el rango de temporadas y la vista como clave,
+# así los reruns solo reusan el texto ya hecho. No usa Streamlit.
+
+import json
+
+
+# ===================== GRÁFICOS DE BARRAS (Altair -> Vega-Lite) =====================
+
+# Gráfico de barras horizontal de un top (pilotos o escuderías). Devuelve el spec de Vega-Lite como texto;
+# la app lo pasa a st.vega_lite_chart con json.loads (Streamlit modifica el dict que recibe, así que cada
+# rerun necesita su propia copia).
+def grafico_barras(top, columna, color):
+    import altair as alt  # solo hace falta cuando el caché no tiene el gráfico
+
+    chart = alt.Chart(top).mark_bar(color=color).encode(
+        x=alt.X("Victorias:Q", axis=alt.Axis(title="Victorias", format="d")),
+        y=alt.Y(f"{columna}:N", sort='-x', title=""),
+        tooltip=[columna, "Victorias"]
+    ).properties(width=600, height=250)
+
+    # Igual que st.altair_chart: sin el tema por defecto de Altair (agrega tamaños que Streamlit no usa)
+    with alt.theme.enable("none"):
+        return json.dumps(chart.to_dict(), separators=(",", ":"))
+
+
+# ===================== MAPA (pydeck -> deck.gl) =====================
+# Los puntos ya vienen agrupados según el zoom (ver f1_mapa.py); acá solo armo el Deck con la vista elegida
+
+TOOLTIP_MAPA = {"text": "{Tooltip}"}
+
+def deck_circuitos(grupos, zoom, lat, lon):
+    import pydeck as pdk  # solo hace falta cuando el caché no tiene el mapa
+
+    # Capa de puntos: el radio va en píxeles (ya calculado por grupo); pickable para que tenga tooltip
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=grupos[["Lon", "Lat", "Radio", "Tooltip"]].to_dict(orient="records"),
+        get_position='[Lon, Lat]',
+        get_radius="Radio",
+        radius_units="pixels",
+        get_fill_color=[255, 0, 0, 180],
+        pickable=True,
+        auto_highlight=True,
+        id="circuitos"  # si no, pydeck le pone un id al azar y el mapa cambia (y se vuelve a montar) en cada envío
+    )
+    view_state = pdk.ViewState(latitude=lat, longitude=lon, zoom=zoom, pitch=0)
+    return pdk.Deck(layers=[layer], initial_view_state=view_state, tooltip=TOOLTIP_MAPA)
+
+
+# st.pydeck_chart solo le pide al Deck su JSON (to_json), el tooltip y la clave de Mapbox. Este objeto ya trae
+# todo resuelto, y el JSON compacto: pydeck lo genera con indentación, que son bytes de más en cada envío.
+# (También se arma con lo guardado en el paquete de las secciones fijas, ver f1_estatico.py.)
+# El tooltip lo pongo yo (TOOLTIP_MAPA), no lo leo del Deck. Streamlit lo busca en el atributo _tooltip, igual
+# que en un Deck de pydeck sin la extensión de Jupyter: si eso cambia en otra versión, tests/test_graficos.py
+# compara lo que manda st.pydeck_chart con este objeto y con el Deck de verdad.
+class MapaSerializado:
+    def __init__(self, json_deck, tooltip, filas):
+        self.filas = filas
+        self.json = json_deck
+        self.tooltip = tooltip
+        self._tooltip = tooltip  # (el nombre que lee st.pydeck_chart)
+        self.mapbox_key = None
+
+    def to_json(self):
+        return self.json
+
+
+def mapa_circuitos(jerarquia, zoom, lat, lon):
+    grupos = jerarquia.vista(zoom, lat, lon)
+    deck = deck_circuitos(grupos, zoom, lat, lon)
+    return MapaSerializado(json.dumps(json.loads(deck.to_json()), separators=(",", ":")), TOOLTIP_MAPA, len(grupos))
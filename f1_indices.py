@@ -0,0 +1,222 @@
+# ===================== ÍNDICES PRECALCULADOS =====================
+# Estructuras que armo una sola vez sobre el DataFrame para que las búsquedas de la app no tengan que
+# recorrer todas las filas en cada rerun. No usan Streamlit; la app las guarda con st.cache_resource.
+
+import unicodedata
+
+import numpy as np
+
+# Días acumulados antes de cada mes en un año bisiesto, así el 29 de febrero también tiene su lugar
+DIAS_POR_MES = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+DIAS_ANTES_DEL_MES = np.cumsum([0] + DIAS_POR_MES[:-1])
+DIAS_DEL_ANIO = 366
+
+
+def dia_del_anio(mes, dia):
+    # Funciona tanto con números sueltos como con arrays de numpy
+    return DIAS_ANTES_DEL_MES[np.asarray(mes) - 1] + np.asarray(dia)
+
+
+def fecha_valida(mes, dia):
+    return 1 <= mes <= 12 and 1 <= dia <= DIAS_POR_MES[mes - 1]
+
+
+# ===================== ÍNDICE DE CUMPLEAÑOS =====================
+# - Un diccionario (mes, día) -> posiciones de las carreras de ese día, para los aciertos exactos en O(1).
+# - Un array ordenado con el día del año de cada carrera, donde busco con np.searchsorted la más cercana
+#   en O(log n). La búsqueda da la vuelta por Año Nuevo: para el 2 de enero la carrera del 30 de diciembre
+#   queda a 3 días, no a 362.
+# Las posiciones son posiciones (iloc) del DataFrame original; el índice no copia ni modifica el DataFrame.
+
+class IndiceCumpleanos:
+    def __init__(self, fechas):
+        fechas = fechas.astype("datetime64[ms]").to_numpy()
+        meses = fechas.astype("datetime64[M]").astype(int) % 12 + 1
+        dias = (fechas - fechas.astype("datetime64[M]")).astype("timedelta64[D]").astype(int) + 1
+
+        # Ordeno por fecha completa para que, dentro del mismo día, las carreras queden cronológicas
+        orden = np.argsort(fechas, kind="stable")
+
+        self.exactas_por_dia = {}
+        for pos in orden:
+            self.exactas_por_dia.setdefault((int(meses[pos]), int(dias[pos])), []).append(int(pos))
+        self.exactas_por_dia = {clave: np.array(pos) for clave, pos in self.exactas_por_dia.items()}
+
+        doy = dia_del_anio(meses, dias)
+        orden_doy = np.argsort(doy[orden], kind="stable")
+        self.posiciones = orden[orden_doy]
+        self.dias_ordenados = doy[self.posiciones]
+
+        # Para consultas en lote: por cada día del año (1..366), cuántas carreras hubo y dónde empiezan en
+        # self.posiciones (así la primera exacta de cada día sale de una tabla, sin diccionario)
+        self.cantidad_por_dia = np.bincount(self.dias_ordenados, minlength=DIAS_DEL_ANIO + 1)
+        self.inicio_por_dia = np.searchsorted(self.dias_ordenados, np.arange(DIAS_DEL_ANIO + 1), side="left")
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def exactas(self, mes, dia):
+        return self.exactas_por_dia.get((mes, dia), np.array([], dtype=int))
+
+    def mas_cercana(self, mes, dia):
+        if len(self) == 0:
+            return None
+        return int(self.mas_cercanas(np.array([mes]), np.array([dia]))[0])
+
+    # Versión vectorizada de exactas: para cada (mes, día) devuelve cuántas carreras hubo ese día y la posición
+    # de la primera (la más vieja), o -1 si no hubo ninguna. Las fechas tienen que ser válidas.
+    def exactas_lote(self, meses, dias):
+        objetivo = dia_del_anio(meses, dias)
+        cantidad = self.cantidad_por_dia[objetivo]
+        inicio = np.minimum(self.inicio_por_dia[objetivo], max(len(self) - 1, 0))
+        primera = np.where(cantidad > 0, self.posiciones[inicio] if len(self) else -1, -1)
+        return cantidad, primera
+
+    # Versión vectorizada: recibe arrays de meses y días y devuelve la posición de la carrera más cercana
+    # para cada uno. Si hay empate entre la anterior y la siguiente, me quedo con la anterior.
+    def mas_cercanas(self, meses, dias):
+        n = len(self.dias_ordenados)
+        objetivo = dia_del_anio(meses, dias)
+        derecha = np.searchsorted(self.dias_ordenados, objetivo, side="left")
+
+        # Candidata siguiente (o la primera del año que viene si me pasé del final)
+        sig = derecha % n
+        dist_sig = (self.dias_ordenados[sig] - objetivo) % DIAS_DEL_ANIO
+
+        # Candidata anterior: la última carrera con día menor; si no hay, la última del año anterior.
+        # Tomo la primera de ese día para que el empate quede en la carrera más vieja.
+        ant_dia = self.dias_ordenados[(derecha - 1) % n]
+        ant = np.searchsorted(self.dias_ordenados, ant_dia, side="left")
+        dist_ant = (objetivo - ant_dia) % DIAS_DEL_ANIO
+
+        elegida = np.where(dist_ant <= dist_sig, ant, sig)
+        return self.posiciones[elegida]
+
+
+# ===================== ÍNDICE INVERTIDO POR PILOTO / ESCUDERÍA =====================
+# Para el explorador: cada nombre apunta a su tabla de victorias ya ordenada por fecha y numerada desde 1.
+# Elegir un piloto o una escudería pasa a ser buscar en un diccionario, sin filtrar todo el DataFrame.
+
+class IndiceEntidades:
+    def __init__(self, df, columna, columnas_tabla):
+        # Lista de opciones ya ordenada para el selectbox
+        self.opciones = tuple(sorted(df[columna].dropna().unique()))
+
+        self.tablas = {}
+        ordenado = df.sort_values(["Year", "Date_Parsed"], kind="stable")
+        for nombre, grupo in ordenado.groupby(columna, observed=True, sort=False):
+            tabla = grupo[columnas_tabla].reset_index(drop=True)
+            tabla.index += 1
+            tabla.index.name = "N°"
+            self.tablas[nombre] = tabla
+
+        # Buscador por nombre, con los que más ganaron primero
+        self.busqueda = IndiceBusqueda(self.opciones, [len(self.tablas.get(nombre, ())) for nombre in self.opciones])
+
+    def __contains__(self, nombre):
+        return nombre in self.tablas
+
+    # Devuelvo una vista nueva: la tabla guardada es la misma para todas las sesiones
+    def victorias(self, nombre):
+        tabla = self.tablas.get(nombre)
+        return None if tabla is None else tabla.copy(deep=False)
+
+
+# ===================== BÚSQUEDA POR NOMBRE =====================
+# Con toda la historia hay más de 800 pilotos y 170 escuderías: una lista con todos no sirve para elegir y es
+# pesada de mandar en cada rerun. Este índice responde "lo que lleva escrito el usuario" con los k mejores:
+# - los nombres se comparan sin tildes ni mayúsculas ("jose froilan" encuentra a José Froilán González);
+# - un trie con cada palabra de cada nombre: "fan", "juan fan" o "j m fangio" encuentran a Fangio recorriendo
+#   solo las letras escritas. Cada nodo guarda ya los nombres que cuelgan de él, ordenados por ranking;
+# - si no alcanza con los prefijos (un error de tipeo, "fango"), un índice de trigramas completa con los más
+#   parecidos: los que tienen la mayor parte de los trigramas de la consulta (comparo contra la consulta y no
+#   contra el nombre entero, que en un nombre de tres palabras tiene muchos trigramas que nadie escribió).
+# Los ids de los nombres son su puesto en el ranking (más victorias primero, después alfabético), así ordenar
+# resultados es ordenar números.
+
+TRIGRAMAS_MINIMO = 0.4
+
+
+def plegar(texto):
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return " ".join("".join(c if c.isalnum() else " " for c in texto).split())
+
+
+def trigramas(texto):
+    # Cada palabra con dos espacios adelante y uno atrás, así el principio de la palabra pesa más
+    return {f"  {palabra} "[i:i + 3] for palabra in texto.split() for i in range(len(palabra) + 1)}
+
+
+class IndiceBusqueda:
+    def __init__(self, nombres, pesos=None):
+        pesos = [0] * len(nombres) if pesos is None else list(pesos)
+        orden = sorted(range(len(nombres)), key=lambda i: (-pesos[i], plegar(nombres[i]), nombres[i]))
+        self.nombres = tuple(nombres[i] for i in orden)
+        self.plegados = tuple(plegar(nombre) for nombre in self.nombres)
+
+        # Trie de palabras: cada nodo es un dict letra -> nodo, y en "" los ids de los nombres que tienen alguna
+        # palabra que empieza con ese prefijo
+        self.trie = {"": []}
+        for id_nombre, plegado in enumerate(self.plegados):
+            prefijos = set()
+            for palabra in plegado.split():
+                nodo = self.trie
+                for i, letra in enumerate(palabra):
+                    nodo = nodo.setdefault(letra, {"": []})
+                    if palabra[:i + 1] not in prefijos:
+                        nodo[""].append(id_nombre)
+                prefijos.update(palabra[:i + 1] for i in range(len(palabra)))
+        self.trie[""] = list(range(len(self.nombres)))
+
+        # Trigramas -> ids de los nombres que lo tienen
+        por_trigrama = {}
+        for id_nombre, plegado in enumerate(self.plegados):
+            for trigrama in trigramas(plegado):
+                por_trigrama.setdefault(trigrama, []).append(id_nombre)
+        self.trigramas = {trigrama: np.array(ids, dtype=np.int64) for trigrama, ids in por_trigrama.items()}
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def con_prefijo(self, palabra):
+        nodo = self.trie
+        for letra in palabra:
+            nodo = nodo.get(letra)
+            if nodo is None:
+                return []
+        return nodo[""]
+
+    # Ids de los nombres que tienen, para cada palabra de la consulta, alguna palabra que empieza así
+    def por_prefijos(self, consulta):
+        ids = None
+        for palabra in sorted(consulta.split(), key=len, reverse=True):
+            encontrados = self.con_prefijo(palabra)
+            ids = set(encontrados) if ids is None else ids.intersection(encontrados)
+            if not ids:
+                return []
+        # Primero los que empiezan con la consulta entera, después el resto (cada grupo por ranking)
+        return sorted(ids, key=lambda i: (not self.plegados[i].startswith(consulta), i))
+
+    def parecidos(self, consulta, k, excluir):
+        propios = trigramas(consulta)
+        listas = [self.trigramas[t] for t in propios if t in self.trigramas]
+        if not listas:
+            return []
+        compartidos = np.bincount(np.concatenate(listas), minlength=len(self.nombres))
+        similitud = compartidos / len(propios)
+        similitud[list(excluir)] = 0
+        candidatos = np.flatnonzero(similitud >= TRIGRAMAS_MINIMO)
+        if len(candidatos) > k:
+            candidatos = candidatos[np.argpartition(-similitud[candidatos], k - 1)[:k]]
+        return sorted(candidatos.tolist(), key=lambda i: (-similitud[i], i))
+
+    # Los k nombres que mejor responden a la consulta (sin consulta, los k primeros del ranking)
+    def buscar(self, consulta, k=20):
+        consulta = plegar(consulta)
+        if not consulta:
+            return list(self.nombres[:k])
+        ids = self.por_prefijos(consulta)[:k]
+        if len(ids) < k:
+            ids += self.parecidos(consulta, k - len(ids), ids)
+        return [self.nombres[i] for i in ids]
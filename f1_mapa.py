@@ -0,0 +1,132 @@
+# ===================== MAPA: CIRCUITOS AGRUPADOS POR ZOOM =====================
+# Con toda la historia hay un punto por circuito, que pueden ser cientos (con los almacenes sintéticos, miles).
+# En vez de mandarlos todos al navegador, precalculo una jerarquía de grupos: para cada nivel de zoom divido el
+# mapa (en proyección Mercator, la misma que usa deck.gl) en una grilla de celdas de unos 64 píxeles y junto en
+# un solo punto los que caen en la misma celda, con la suma de carreras y el centro ponderado.
+# La app manda solo los grupos del zoom elegido que entran en la vista (un nivel de detalle y un centro fijo,
+# el mundo o el circuito principal de un país), así el mapa pesa lo mismo aunque crezca la historia.
+# La vista da la vuelta al mundo: cerca de ±180° de longitud también entran los grupos del otro lado.
+# No usa Streamlit.
+
+import numpy as np
+import pandas as pd
+
+# Celdas por lado del mundo entero en el zoom 0 (un tile de 256 px dividido en celdas de 64 px)
+CELDAS_ZOOM_0 = 4
+# Zooms para los que guardo grupos; con más zoom que el último se muestran los puntos sueltos
+ZOOMS = (1, 2, 3, 4, 5, 6, 7, 8)
+# Tamaño aproximado del mapa en la página (px), para recortar lo que queda fuera de la vista
+ANCHO_VISTA, ALTO_VISTA = 1000, 500
+MAX_NOMBRES_TOOLTIP = 4
+# Nivel de detalle que se elige en la app -> zoom del mapa, y el centro de la vista del mundo entero
+NIVELES_MAPA = {"Mundo": 1.2, "Continente": 3, "País": 5, "Región": 7, "Circuitos": 9}
+VISTA_MUNDO = (20, 0)
+
+
+def mercator(lat, lon):
+    x = (np.asarray(lon, dtype=float) + 180) / 360
+    lat_rad = np.radians(np.clip(np.asarray(lat, dtype=float), -85.05, 85.05))
+    y = (1 - np.log(np.tan(lat_rad) + 1 / np.cos(lat_rad)) / np.pi) / 2
+    return x, y
+
+
+def mercator_inversa(x, y):
+    lon = np.asarray(x) * 360 - 180
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y)))))
+    return lat, lon
+
+
+# Cruzo las carreras de cada circuito con sus coordenadas (los que no tienen coordenadas no se dibujan)
+def puntos_circuitos(circuitos, conteo):
+    carreras = pd.DataFrame({"Circuito": conteo.index, "Carreras": conteo.to_numpy()})
+    puntos = circuitos.merge(carreras[carreras["Carreras"] > 0], on="Circuito")
+    return puntos.rename(columns={"Circuito": "Nombre"})
+
+
+def texto_carreras(n):
+    return f"{n} carrera" if n == 1 else f"{n} carreras"
+
+
+# Radio del círculo en píxeles: crece con la raíz de las carreras para que un grupo grande no tape todo
+def radio(carreras):
+    return np.minimum(3 + 2.5 * np.sqrt(carreras), 40).round(1)
+
+
+class JerarquiaClusters:
+    def __init__(self, puntos, zooms=ZOOMS):
+        # puntos: una fila por circuito con Nombre, Lat, Lon, País y Carreras. Los ordeno de más a menos
+        # carreras, así en cada grupo el primer nombre es el circuito más importante.
+        puntos = puntos.sort_values("Carreras", ascending=False, kind="stable").reset_index(drop=True)
+        self.zooms = tuple(sorted(zooms))
+        x, y = mercator(puntos["Lat"], puntos["Lon"])
+        self.niveles = {z: self.agrupar(puntos, x, y, CELDAS_ZOOM_0 * 2 ** z) for z in self.zooms}
+        # Con el zoom máximo cada circuito es su propio grupo
+        self.sueltos = self.agrupar(puntos, x, y, None)
+
+        # Para centrar el mapa en un país uso su circuito con más carreras (con un promedio de coordenadas el
+        # centro podría caer lejos de todos sus circuitos). Los países van del que tiene más carreras al que menos.
+        total_pais = puntos.groupby("País", sort=False)["Carreras"].sum().sort_values(ascending=False, kind="stable")
+        principal = puntos.drop_duplicates("País").set_index("País")
+        self.centros = {pais: (float(principal.at[pais, "Lat"]), float(principal.at[pais, "Lon"])) for pais in total_pais.index}
+
+    @staticmethod
+    def agrupar(puntos, x, y, celdas):
+        if celdas is None:
+            grupo = np.arange(len(puntos))
+        else:
+            cx = np.minimum((x * celdas).astype(np.int64), celdas - 1)
+            cy = np.minimum((y * celdas).astype(np.int64), celdas - 1)
+            _, grupo = np.unique(cx * celdas + cy, return_inverse=True)
+            grupo = grupo.reshape(-1)
+
+        peso = puntos["Carreras"].to_numpy(dtype=float)
+        carreras = np.bincount(grupo, weights=peso)
+        gx = np.bincount(grupo, weights=x * peso) / carreras
+        gy = np.bincount(grupo, weights=y * peso) / carreras
+        lat, lon = mercator_inversa(gx, gy)
+
+        # Tooltip: el circuito solo, o cuántos circuitos hay en el grupo y los más importantes
+        nombres = pd.Series(puntos["Nombre"].to_numpy()).groupby(grupo, sort=True).agg(list)
+        paises = pd.Series(puntos["País"].to_numpy()).groupby(grupo, sort=True).first()
+        tooltips = []
+        for lista, pais, total in zip(nombres, paises, carreras):
+            if len(lista) == 1:
+                tooltips.append(f"{lista[0]} ({pais}): {texto_carreras(int(total))}")
+            else:
+                texto = ", ".join(lista[:MAX_NOMBRES_TOOLTIP])
+                if len(lista) > MAX_NOMBRES_TOOLTIP:
+                    texto += f" y {len(lista) - MAX_NOMBRES_TOOLTIP} más"
+                tooltips.append(f"{len(lista)} circuitos: {texto_carreras(int(total))}\n{texto}")
+
+        return pd.DataFrame({
+            "Lat": lat.round(4),
+            "Lon": lon.round(4),
+            "Carreras": carreras.astype("int64"),
+            "Radio": radio(carreras),
+            "Tooltip": tooltips,
+            "X": gx,
+            "Y": gy,
+        })
+
+    # Grupos del nivel que corresponde a ese zoom (el más detallado que no supera el zoom pedido)
+    def nivel(self, zoom):
+        if zoom > self.zooms[-1]:
+            return self.sueltos
+        elegibles = [z for z in self.zooms if z <= zoom]
+        return self.niveles[elegibles[-1] if elegibles else self.zooms[0]]
+
+    # Solo los grupos que se ven con ese zoom y centro (con media pantalla de margen para poder moverse un poco).
+    # La distancia en x la mido dando la vuelta al mundo (x va de 0 a 1), así una vista centrada cerca de ±180°
+    # no pierde los grupos del otro lado; a esos les corro la longitud 360° para que se dibujen junto al centro.
+    def vista(self, zoom, lat, lon):
+        grupos = self.nivel(zoom)
+        cx, cy = mercator(lat, lon)
+        escala = 256 * 2 ** zoom
+        dx = (grupos["X"] - cx + 0.5) % 1 - 0.5
+        dentro = (np.abs(dx) <= ANCHO_VISTA / escala) & (np.abs(grupos["Y"] - cy) <= ALTO_VISTA / escala)
+        vuelta = (dx - (grupos["X"] - cx)).round()
+        if not vuelta[dentro].any():
+            return grupos[dentro]
+        grupos = grupos[dentro].copy()
+        grupos["Lon"] += 360 * vuelta[dentro]
+        return grupos
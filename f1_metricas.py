@@ -0,0 +1,166 @@
+# ===================== MÉTRICAS POR SECCIÓN =====================
+# Mide cada sección de la app: cuánto tarda, cuántas filas toca y cuántos bytes le manda al navegador.
+# Es opt-in: se activa con ?debug=1 en la URL o con la variable de entorno F1_DEBUG=1. Si no está activo,
+# empezar() y terminar() vuelven enseguida y no se mide ni se escribe nada.
+#
+# Con las métricas activas:
+# - en la barra lateral aparece el panel con lo que midió el último rerun (ver panel()) y lo que ocupa en memoria
+#   la sesión comparado con los datos compartidos (ver panel_memoria());
+# - cada sección se agrega como una línea JSON a logs/metricas.jsonl para analizarlo después.
+# Los bytes enviados se cuentan envolviendo la función interna con la que el script le pasa los mensajes a la
+# sesión; si una versión de Streamlit no la tiene, las métricas siguen andando sin esa columna. Está probado con
+# las versiones que permite requirements.txt; tests/test_metricas.py avisa si una versión nueva la cambia.
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+LOG = os.environ.get("F1_METRICAS_LOG", os.path.join(CARPETA, "logs", "metricas.jsonl"))
+# Cuántas mediciones guardo en la sesión para el panel: los fragments (test, trivia, mapa) agregan las suyas en
+# cada rerun parcial sin pasar por iniciar(), y sin tope la lista crecería toda la sesión
+MAX_METRICAS = 100
+
+
+class Registro:
+    def __init__(self, seccion, filas=None):
+        self.seccion = seccion
+        self.filas = filas
+        self.ms = 0.0
+        self.bytes = None  # None = no se pudieron contar
+        self.mensajes = None
+
+    def como_dict(self):
+        return {"seccion": self.seccion, "ms": round(self.ms, 2), "filas": self.filas,
+                "bytes": self.bytes, "mensajes": self.mensajes}
+
+
+# La medición en curso de cada script (cada sesión corre su script en su propio hilo)
+_actual = threading.local()
+
+
+class _Medir:
+    def __init__(self, nombre, filas):
+        self.registro = Registro(nombre, filas)
+        self.ctx = get_script_run_ctx()
+        # Envuelvo la función con la que el script le pasa los mensajes a la sesión para contar los bytes reales
+        # que salen (ya con los mensajes repetidos reemplazados por referencias al caché del navegador). Es un
+        # atributo interno de Streamlit: si no está (o no se deja reemplazar) no cuento bytes y listo.
+        self.enqueue_original = getattr(self.ctx, "_enqueue", None)
+        if callable(self.enqueue_original):
+            def contar(msg):
+                self.registro.bytes += msg.ByteSize()
+                self.registro.mensajes += 1
+                self.enqueue_original(msg)
+
+            try:
+                self.ctx._enqueue = contar
+                self.registro.bytes = self.registro.mensajes = 0
+            except (AttributeError, TypeError):
+                self.enqueue_original = None
+        else:
+            self.enqueue_original = None
+        self.inicio = time.perf_counter()
+
+    def cerrar(self):
+        self.registro.ms = (time.perf_counter() - self.inicio) * 1000
+        if self.enqueue_original is not None:
+            self.ctx._enqueue = self.enqueue_original
+        metricas = st.session_state.get("_metricas")
+        if metricas is None:
+            metricas = st.session_state["_metricas"] = deque(maxlen=MAX_METRICAS)
+        metricas.append(self.registro.como_dict())
+        escribir_log(self.registro, self.ctx)
+
+
+def activo():
+    return st.session_state.get("_metricas_activas", False)
+
+
+# Se llama una vez al principio de cada rerun completo
+def iniciar():
+    terminar()
+    st.session_state["_metricas_activas"] = os.environ.get("F1_DEBUG") == "1" or st.query_params.get("debug") == "1"
+    st.session_state["_metricas"] = deque(maxlen=MAX_METRICAS)
+
+
+# empezar("mapa") marca el comienzo de una sección (y cierra la anterior si quedó abierta); terminar() la cierra.
+# Con las métricas apagadas las dos funciones vuelven enseguida sin hacer nada.
+def empezar(nombre, filas=None):
+    if not activo():
+        return
+    terminar()
+    _actual.medicion = _Medir(nombre, filas)
+
+
+# Para anotar cuántas filas tocó la sección cuando se sabe recién adentro
+def filas(cantidad):
+    medicion = getattr(_actual, "medicion", None)
+    if medicion is not None:
+        medicion.registro.filas = cantidad
+
+
+def terminar():
+    medicion = getattr(_actual, "medicion", None)
+    if medicion is not None:
+        _actual.medicion = None
+        medicion.cerrar()
+
+
+def escribir_log(registro, ctx):
+    linea = {"ts": round(time.time(), 3), "sesion": ctx.session_id if ctx else None, **registro.como_dict()}
+    os.makedirs(os.path.dirname(LOG), exist_ok=True)
+    with open(LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+
+# Panel de la barra lateral con lo que se midió en este rerun (más los reruns de fragments desde entonces)
+def panel():
+    if not activo():
+        return
+    metricas = list(st.session_state.get("_metricas", ()))
+    with st.sidebar.expander("🛠️ Métricas por sección", expanded=True):
+        st.dataframe(metricas, use_container_width=True, hide_index=True)
+        total_ms = sum(m["ms"] for m in metricas)
+        texto = f"Total: {total_ms:.1f} ms"
+        if any(m["bytes"] is not None for m in metricas):
+            texto += f", {sum(m['bytes'] or 0 for m in metricas) / 1024:.1f} KB enviados"
+        st.caption(f"{texto}. Log en {LOG}")
+    panel_memoria()
+
+
+# Lo que ocupa esta sesión (su session_state: widgets, trivia, métricas) contra lo que comparten todas las
+# sesiones (el registro de datos de f1_almacen.py). Con muchas sesiones solo debería crecer lo primero, y poco.
+def panel_memoria():
+    import f1_almacen  # (pandas y compañía: solo si el panel está activo)
+
+    estado = st.session_state.to_dict()
+    filas = sorted(({"clave": clave, "tipo": type(valor).__name__, "bytes": f1_almacen.estimar_memoria(valor)}
+                    for clave, valor in estado.items()), key=lambda fila: -fila["bytes"])
+    compartido = f1_almacen.almacen().memoria()
+    with st.sidebar.expander("🧠 Memoria por sesión", expanded=False):
+        st.dataframe(filas, use_container_width=True, hide_index=True)
+        texto = (f"Esta sesión: {sum(f['bytes'] for f in filas) / 1024:.1f} KB en session_state. "
+                 f"Compartido por todas: {sum(e['bytes'] for e in compartido) / 2 ** 20:.1f} MB "
+                 f"({len(compartido)} entradas en el registro).")
+        sesiones = sesiones_activas()
+        if sesiones is not None:
+            texto += f" Sesiones activas: {sesiones}."
+        st.caption(texto)
+
+
+# Cuántas sesiones tiene abiertas el servidor, o None si no se puede saber: sin servidor (por ejemplo con
+# AppTest) no hay runtime, y el contador es interno de Streamlit, así que si cambia no muestro el dato
+def sesiones_activas():
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return None
+    sesiones = getattr(Runtime.instance(), "_session_mgr", None)
+    contar = getattr(sesiones, "num_active_sessions", None)
+    return contar() if callable(contar) else None
@@ -0,0 +1,264 @@
+# ===================== PUNTOS DEL CAMPEONATO =====================
+# Calcula el campeonato de pilotos y de constructores de todas las temporadas de una vez a partir de los
+# resultados completos (una fila por piloto en cada carrera, como f1_datos.resultados), con las reglas de cada
+# época. Todo con arrays de numpy sobre la historia entera, sin loops de Python por carrera ni por piloto:
+# - la tabla de puntos por posición de cada época;
+# - el punto por la vuelta rápida (en los 50s, y de 2019 a 2024 solo si se terminó entre los 10 primeros);
+#   si varios la comparten, se reparte. Ojo: sale de la columna VueltaRapida, y el export de Ergast solo la trae
+#   desde 2004 (ver f1_datos.py). Para los 50s no hay ese dato, así que ese punto no se cuenta y los puntos de
+#   esas temporadas pueden quedar por debajo de los oficiales (la app lo avisa, ver f1_temporadas.py);
+# - las carreras que se suspendieron antes de tiempo y dieron la mitad de los puntos (MEDIOS_PUNTOS), sin punto
+#   por la vuelta rápida;
+# - autos compartidos (dos pilotos con la misma posición en la misma carrera): hasta 1957 se reparten los
+#   puntos, desde 1958 no suman para los pilotos;
+# - solo cuentan los mejores N resultados de cada piloto (entre 1967 y 1980, los mejores de cada mitad);
+# - constructores desde 1958: hasta 1978 suma solo el auto mejor ubicado de cada escudería en cada carrera, y
+#   las 500 Millas de Indianápolis (parte del campeonato de pilotos hasta 1960) nunca contaron para ellos.
+# Para los constructores uso la misma tabla de puntos y los mismos descartes que para los pilotos (los de
+# algunos años fueron un poco distintos), y el desempate es por victorias.
+#
+# Si se agrega una carrera (con_carrera) solo se vuelve a calcular esa temporada; el resto se reusa.
+# No usa Streamlit.
+
+import numpy as np
+import pandas as pd
+
+PRIMER_ANIO_CONSTRUCTORES = 1958
+# Carreras del campeonato de pilotos que no cuentan para el de constructores
+FUERA_DE_CONSTRUCTORES = ("Indianapolis 500",)
+# Carreras que dieron la mitad de los puntos por no completar la distancia: (año, gran premio)
+MEDIOS_PUNTOS = {(1975, "Spanish"), (1975, "Austrian"), (1984, "Monaco"), (1991, "Australian"), (2009, "Malaysian"),
+                 (2021, "Belgian")}
+
+EPOCAS = [
+    {"desde": 1950, "puntos": (8, 6, 4, 3, 2), "vuelta_rapida": 1, "vuelta_rapida_hasta": 0,
+     "compartidos": "dividir", "constructores": "mejor auto"},
+    {"desde": 1958, "puntos": (8, 6, 4, 3, 2), "vuelta_rapida": 1, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "mejor auto"},
+    {"desde": 1960, "puntos": (8, 6, 4, 3, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "mejor auto"},
+    {"desde": 1961, "puntos": (9, 6, 4, 3, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "mejor auto"},
+    {"desde": 1979, "puntos": (9, 6, 4, 3, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "todos"},
+    {"desde": 1991, "puntos": (10, 6, 4, 3, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "todos"},
+    {"desde": 2003, "puntos": (10, 8, 6, 5, 4, 3, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "todos"},
+    {"desde": 2010, "puntos": (25, 18, 15, 12, 10, 8, 6, 4, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "todos"},
+    {"desde": 2019, "puntos": (25, 18, 15, 12, 10, 8, 6, 4, 2, 1), "vuelta_rapida": 1, "vuelta_rapida_hasta": 10,
+     "compartidos": "sin puntos", "constructores": "todos"},
+    {"desde": 2025, "puntos": (25, 18, 15, 12, 10, 8, 6, 4, 2, 1), "vuelta_rapida": 0, "vuelta_rapida_hasta": 0,
+     "compartidos": "sin puntos", "constructores": "todos"},
+]
+
+# Cuántos resultados cuentan para el campeonato (los años que no están cuentan todos). Una tupla es
+# (primera mitad, segunda mitad) de la temporada.
+MEJORES_RESULTADOS = {
+    1950: 4, 1951: 4, 1952: 4, 1953: 4, 1954: 5, 1955: 5, 1956: 5, 1957: 5, 1958: 6, 1959: 5, 1960: 6,
+    1961: 5, 1962: 5, 1963: 6, 1964: 6, 1965: 6, 1966: 5, 1967: (5, 4), 1968: (5, 5), 1969: (5, 4),
+    1970: (6, 5), 1971: (5, 4), 1972: (5, 5), 1973: (7, 6), 1974: (7, 6), 1975: (6, 6), 1976: (7, 7),
+    1977: (8, 7), 1978: (7, 7), 1979: (4, 4), 1980: (5, 5), 1981: 11, 1982: 11, 1983: 11, 1984: 11,
+    1985: 11, 1986: 11, 1987: 11, 1988: 11, 1989: 11, 1990: 11,
+}
+SIN_LIMITE = 1 << 30
+
+# Las reglas pasadas a arrays, para buscarlas por fila con un solo índice
+INICIOS = np.array([epoca["desde"] for epoca in EPOCAS])
+MAX_POSICION = 64
+TABLA_PUNTOS = np.zeros((len(EPOCAS), MAX_POSICION + 1))
+for _i, _epoca in enumerate(EPOCAS):
+    TABLA_PUNTOS[_i, 1:len(_epoca["puntos"]) + 1] = _epoca["puntos"]
+VUELTA_RAPIDA = np.array([epoca["vuelta_rapida"] for epoca in EPOCAS], dtype=float)
+VUELTA_RAPIDA_HASTA = np.array([epoca["vuelta_rapida_hasta"] for epoca in EPOCAS])
+# La vuelta rápida suma para los constructores recién desde 2019 (en los 50s era solo para el piloto)
+VUELTA_RAPIDA_CONSTRUCTORES = INICIOS >= 2019
+DIVIDE_COMPARTIDOS = np.array([epoca["compartidos"] == "dividir" for epoca in EPOCAS])
+MEJOR_AUTO = np.array([epoca["constructores"] == "mejor auto" for epoca in EPOCAS])
+
+
+def epoca_de(year):
+    return EPOCAS[max(0, int(np.searchsorted(INICIOS, year, side="right")) - 1)]
+
+
+def texto_reglas(year):
+    epoca = epoca_de(year)
+    texto = "Puntos por posición: " + "-".join(str(p) for p in epoca["puntos"])
+    if epoca["vuelta_rapida"]:
+        texto += f", más {epoca['vuelta_rapida']} por la vuelta rápida"
+        if epoca["vuelta_rapida_hasta"]:
+            texto += f" (terminando entre los {epoca['vuelta_rapida_hasta']} primeros)"
+    mejores = MEJORES_RESULTADOS.get(year)
+    if isinstance(mejores, tuple):
+        texto += f". Cuentan los {mejores[0]} mejores resultados de la primera mitad y los {mejores[1]} de la segunda"
+    elif mejores:
+        texto += f". Cuentan los {mejores} mejores resultados"
+    return texto + "."
+
+
+# Posición de cada elemento dentro de su grupo (0, 1, 2...), con los grupos ya contiguos
+def puesto_en_grupo(grupos_ordenados):
+    n = len(grupos_ordenados)
+    inicio = np.ones(n, dtype=bool)
+    inicio[1:] = grupos_ordenados[1:] != grupos_ordenados[:-1]
+    posiciones = np.arange(n)
+    return posiciones - np.maximum.accumulate(np.where(inicio, posiciones, 0))
+
+
+# Límite de resultados que cuentan para cada (año, ronda), con la mitad de la temporada si corresponde
+def limites(year, ronda):
+    anios = np.unique(year)
+    mejores = [MEJORES_RESULTADOS.get(int(y), SIN_LIMITE) for y in anios]
+    limite_1 = np.array([m[0] if isinstance(m, tuple) else m for m in mejores], dtype=np.int64)
+    limite_2 = np.array([m[1] if isinstance(m, tuple) else m for m in mejores], dtype=np.int64)
+    por_mitades = np.array([isinstance(m, tuple) for m in mejores], dtype=bool)
+
+    cual = np.searchsorted(anios, year)
+    # La segunda mitad empieza después de la mitad de las carreras de ese año (redondeando para arriba)
+    rondas = np.zeros(len(anios), dtype=np.int64)
+    np.maximum.at(rondas, cual, ronda)
+    mitad = np.where(por_mitades[cual] & (ronda > (rondas[cual] + 1) // 2), 1, 0)
+    return np.where(mitad == 1, limite_2[cual], limite_1[cual]), mitad
+
+
+# Suma los puntos de cada uno por carrera, descarta los que no cuentan y arma la tabla de cada temporada
+def tabla(year, ronda, codigo, nombres, puntos, victorias, columna):
+    if not len(year):
+        return pd.DataFrame({"Year": [], columna: [], "Puntos": [], "Puntos brutos": [], "Victorias": [], "Posición": []})
+    # Un resultado por (año, ronda, entidad)
+    clave = (year.astype(np.int64) * 1000 + ronda) * len(nombres) + codigo
+    claves, inversa = np.unique(clave, return_inverse=True)
+    por_carrera = np.bincount(inversa, weights=puntos)
+    ganadas = np.bincount(inversa, weights=victorias)
+    year_c = claves // len(nombres) // 1000
+    ronda_c = claves // len(nombres) % 1000
+    codigo_c = claves % len(nombres)
+
+    # Mejores N: ordeno los resultados de cada (año, entidad, mitad) de mayor a menor y me quedo con los N primeros
+    limite, mitad = limites(year_c, ronda_c)
+    grupo = (year_c * len(nombres) + codigo_c) * 2 + mitad
+    orden = np.lexsort((-por_carrera, grupo))
+    cuenta = np.empty(len(orden), dtype=bool)
+    cuenta[orden] = puesto_en_grupo(grupo[orden]) < limite[orden]
+
+    # Totales por (año, entidad)
+    total = year_c * len(nombres) + codigo_c
+    totales, inversa = np.unique(total, return_inverse=True)
+    resultado = pd.DataFrame({
+        "Year": totales // len(nombres),
+        columna: nombres[totales % len(nombres)],
+        "Puntos": np.round(np.bincount(inversa, weights=np.where(cuenta, por_carrera, 0)), 2),
+        "Puntos brutos": np.round(np.bincount(inversa, weights=por_carrera), 2),
+        "Victorias": np.bincount(inversa, weights=ganadas).astype(np.int64),
+    })
+    resultado = resultado[(resultado["Puntos brutos"] > 0) | (resultado["Victorias"] > 0)]
+
+    # Posición en el campeonato: por puntos y después por victorias; los empatados comparten puesto (y quedan
+    # en orden alfabético, porque los códigos vienen ordenados)
+    codigo_t = totales[resultado.index] % len(nombres)
+    orden = np.lexsort((codigo_t, -resultado["Victorias"].to_numpy(), -resultado["Puntos"].to_numpy(),
+                        resultado["Year"].to_numpy()))
+    resultado = resultado.iloc[orden].reset_index(drop=True)
+    anio = resultado["Year"].to_numpy()
+    empate = np.zeros(len(resultado), dtype=bool)
+    empate[1:] = ((anio[1:] == anio[:-1]) & (resultado["Puntos"].to_numpy()[1:] == resultado["Puntos"].to_numpy()[:-1])
+                  & (resultado["Victorias"].to_numpy()[1:] == resultado["Victorias"].to_numpy()[:-1]))
+    puesto = puesto_en_grupo(anio) + 1
+    indices = np.arange(len(resultado))
+    resultado["Posición"] = puesto[np.maximum.accumulate(np.where(empate, 0, indices))]
+    return resultado
+
+
+def calcular(resultados_df):
+    df = resultados_df
+    year = df["Year"].to_numpy(dtype=np.int64)
+    ronda = df["Round"].to_numpy(dtype=np.int64)
+    posicion = df["Position"].fillna(0).to_numpy(dtype=np.int64)
+    if "VueltaRapida" in df:
+        vuelta_rapida = df["VueltaRapida"].fillna(False).to_numpy(dtype=bool)
+    else:
+        vuelta_rapida = np.zeros(len(df), dtype=bool)
+    epoca = np.maximum(np.searchsorted(INICIOS, year, side="right") - 1, 0)
+    medios = np.zeros(len(df), dtype=bool)
+    fuera_constructores = np.zeros(len(df), dtype=bool)
+    if "Grand Prix" in df:
+        gp = df["Grand Prix"].to_numpy(dtype=object)
+        for year_medios, gp_medios in MEDIOS_PUNTOS:
+            medios |= (year == year_medios) & (gp == gp_medios)
+        fuera_constructores = np.isin(gp, FUERA_DE_CONSTRUCTORES)
+
+    # Puntos por la posición (las posiciones después de la tabla valen 0), la mitad si la carrera se suspendió
+    base = TABLA_PUNTOS[epoca, np.minimum(posicion, MAX_POSICION)] * np.where(medios, 0.5, 1)
+
+    # Autos compartidos: varios pilotos con la misma posición en la misma carrera
+    carrera = year * 1000 + ronda
+    _, inversa, cantidad = np.unique(carrera * (MAX_POSICION + 1) + np.minimum(posicion, MAX_POSICION),
+                                     return_inverse=True, return_counts=True)
+    compartido = (cantidad[inversa] > 1) & (posicion > 0)
+    divisor = np.where(compartido, cantidad[inversa], 1)
+    base_piloto = np.where(compartido & ~DIVIDE_COMPARTIDOS[epoca], 0, base / divisor)
+
+    # Vuelta rápida, repartida si la comparten varios (en los 50s daba el punto aunque no se terminara la carrera)
+    _, inversa = np.unique(carrera, return_inverse=True)
+    con_vuelta = np.bincount(inversa, weights=vuelta_rapida)[inversa]
+    hasta = VUELTA_RAPIDA_HASTA[epoca]
+    valida = vuelta_rapida & ~medios & ((hasta == 0) | ((posicion > 0) & (posicion <= hasta)))
+    extra = np.where(valida, VUELTA_RAPIDA[epoca] / np.maximum(con_vuelta, 1), 0)
+    victorias = (posicion == 1).astype(float)
+
+    codigos_p, nombres_p = df["Driver"].factorize(sort=True)
+    pilotos = tabla(year, ronda, codigos_p, np.asarray(nombres_p, dtype=object), base_piloto + extra, victorias, "Piloto")
+
+    # Constructores: desde 1958 (sin Indianápolis), con el auto mejor ubicado o todos según la época
+    desde_58 = (year >= PRIMER_ANIO_CONSTRUCTORES) & ~fuera_constructores
+    codigos_e, nombres_e = df["Team"].factorize(sort=True)
+    nombres_e = np.asarray(nombres_e, dtype=object)
+    puntos_e = base + np.where(VUELTA_RAPIDA_CONSTRUCTORES[epoca], extra, 0)
+    if desde_58.any():
+        # Para "mejor auto" dejo solo el máximo de cada (carrera, escudería) y los demás en 0
+        clave = carrera * len(nombres_e) + codigos_e
+        orden = np.lexsort((-puntos_e, clave))
+        primero = np.empty(len(orden), dtype=bool)
+        primero[orden] = puesto_en_grupo(clave[orden]) == 0
+        puntos_e = np.where(MEJOR_AUTO[epoca] & ~primero, 0, puntos_e)
+    escuderias = tabla(year[desde_58], ronda[desde_58], codigos_e[desde_58], nombres_e, puntos_e[desde_58],
+                       victorias[desde_58], "Escudería")
+    return pilotos, escuderias
+
+
+class Campeonatos:
+    def __init__(self, resultados_df, anteriores=(), tablas=None):
+        # Los resultados en partes (los originales y las carreras agregadas después)
+        self._partes = [*anteriores, resultados_df]
+        self.pilotos, self.escuderias = tablas if tablas is not None else calcular(resultados_df)
+
+    def resultados_de(self, year):
+        partes = [parte[parte["Year"].to_numpy(dtype=np.int64) == year] for parte in self._partes]
+        return pd.concat([p for p in partes if len(p)] or partes[:1], ignore_index=True)
+
+    def temporada_pilotos(self, year):
+        return self.de_temporada(self.pilotos, year)
+
+    def temporada_escuderias(self, year):
+        return self.de_temporada(self.escuderias, year)
+
+    @staticmethod
+    def de_temporada(tabla_df, year):
+        anios = tabla_df["Year"].to_numpy()
+        inicio, fin = np.searchsorted(anios, year, side="left"), np.searchsorted(anios, year, side="right")
+        return tabla_df.iloc[inicio:fin].drop(columns="Year").set_index("Posición")
+
+    # Campeonato con una carrera más (o varias): solo se recalculan sus temporadas. Devuelve un objeto nuevo,
+    # así quien esté usando este (otra sesión) no ve un cambio a medias.
+    def con_carrera(self, filas_df):
+        anios = np.unique(filas_df["Year"].to_numpy(dtype=np.int64))
+        nuevas = [pd.concat([self.resultados_de(int(y)), filas_df[filas_df["Year"] == y]], ignore_index=True) for y in anios]
+        pilotos, escuderias = calcular(pd.concat(nuevas, ignore_index=True))
+
+        def reemplazar(vieja, nueva):
+            quedan = vieja[~np.isin(vieja["Year"].to_numpy(), anios)]
+            return pd.concat([quedan, nueva], ignore_index=True).sort_values(["Year", "Posición"], kind="stable").reset_index(drop=True)
+
+        tablas = (reemplazar(self.pilotos, pilotos), reemplazar(self.escuderias, escuderias))
+        return Campeonatos(filas_df, self._partes, tablas)
@@ -0,0 +1,143 @@
+# ===================== IMÁGENES DE LA APP =====================
+# Las imágenes no se cargan desde imgur: el original queda en assets/fuente/ y build_assets.py lo achica a
+# algunos anchos en WebP dentro de static/img/, que Streamlit sirve en app/static/img/ (enableStaticServing en
+# .streamlit/config.toml). Así la página no depende de ningún servidor de afuera y anda sin internet.
+# Hasta que se generen (python build_assets.py --descargar), la imagen sale del link original como antes.
+#
+# Cada archivo lleva en el nombre un hash de su contenido: si la imagen cambia, cambia el nombre. Por eso se
+# pueden cachear para siempre (Streamlit no deja poner Cache-Control, pero un proxy adelante sí, ver README).
+# static/img/manifest.json dice qué archivos hay para cada imagen; la app solo lee ese manifiesto.
+
+import hashlib
+import html
+import json
+import os
+from functools import lru_cache
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+FUENTES = os.path.join(CARPETA, "assets", "fuente")
+ESTATICOS = os.path.join(CARPETA, "static", "img")
+URL_ESTATICOS = "app/static/img/"
+
+# Anchos en píxeles que genero de cada imagen (nunca agrando el original)
+ANCHOS = (480, 960, 1600)
+CALIDAD_WEBP = 80
+
+# De dónde sale cada imagen. "remota" es el link original: build_assets.py --descargar la baja de ahí, y la app
+# la muestra desde ahí solo mientras no estén las versiones locales (así la página nunca se queda sin la imagen).
+IMAGENES = {
+    "portada": {
+        "archivo": "alfa_romeo_158_silverstone_1950.png",
+        "remota": "https://i.imgur.com/tXsjOO5.png",
+    },
+}
+
+
+def ruta_manifiesto(carpeta=None):
+    return os.path.join(carpeta or ESTATICOS, "manifest.json")
+
+
+# ===================== BUILD (usa Pillow) =====================
+
+def descargar(nombre, carpeta_fuentes=None):
+    from urllib.request import urlopen
+
+    ruta = os.path.join(carpeta_fuentes or FUENTES, IMAGENES[nombre]["archivo"])
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with urlopen(IMAGENES[nombre]["remota"], timeout=30) as respuesta:
+        contenido = respuesta.read()
+    with open(ruta + ".tmp", "wb") as f:
+        f.write(contenido)
+    os.replace(ruta + ".tmp", ruta)
+    return ruta
+
+
+def generar_variantes(nombre, ruta_fuente, carpeta):
+    from PIL import Image
+
+    variantes = []
+    with Image.open(ruta_fuente) as original:
+        original = original.convert("RGB")
+        anchos = [ancho for ancho in ANCHOS if ancho < original.width] + [min(original.width, ANCHOS[-1])]
+        for ancho in sorted(set(anchos)):
+            alto = round(original.height * ancho / original.width)
+            copia = original.resize((ancho, alto), Image.LANCZOS)
+            ruta_tmp = os.path.join(carpeta, f"{nombre}-{ancho}.webp.tmp")
+            copia.save(ruta_tmp, "WEBP", quality=CALIDAD_WEBP, method=6)
+            with open(ruta_tmp, "rb") as f:
+                hash_contenido = hashlib.sha256(f.read()).hexdigest()[:12]
+            archivo = f"{nombre}-{ancho}.{hash_contenido}.webp"
+            os.replace(ruta_tmp, os.path.join(carpeta, archivo))
+            variantes.append({"archivo": archivo, "ancho": ancho, "alto": alto, "bytes": os.path.getsize(os.path.join(carpeta, archivo))})
+    return variantes
+
+
+def construir_recursos(carpeta_fuentes=None, carpeta=None):
+    carpeta_fuentes = carpeta_fuentes or FUENTES
+    carpeta = carpeta or ESTATICOS
+    os.makedirs(carpeta, exist_ok=True)
+
+    imagenes = {}
+    for nombre, datos in IMAGENES.items():
+        ruta_fuente = os.path.join(carpeta_fuentes, datos["archivo"])
+        if not os.path.exists(ruta_fuente):
+            continue
+        imagenes[nombre] = {"variantes": generar_variantes(nombre, ruta_fuente, carpeta)}
+
+    # Borro versiones viejas que ya no están en el manifiesto nuevo
+    vigentes = {v["archivo"] for datos in imagenes.values() for v in datos["variantes"]}
+    for archivo in os.listdir(carpeta):
+        if archivo.endswith(".webp") and archivo not in vigentes:
+            os.remove(os.path.join(carpeta, archivo))
+
+    with open(ruta_manifiesto(carpeta) + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(imagenes, f, ensure_ascii=False, indent=2)
+    os.replace(ruta_manifiesto(carpeta) + ".tmp", ruta_manifiesto(carpeta))
+    return imagenes
+
+
+# ===================== LO QUE USA LA APP =====================
+
+# La fecha del manifiesto va en la clave del caché: si build_assets.py lo regenera, se vuelve a leer sin reiniciar
+@lru_cache(maxsize=1)
+def _leer_manifiesto(ruta, mtime_ns):
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def leer_manifiesto():
+    try:
+        return _leer_manifiesto(ruta_manifiesto(), os.stat(ruta_manifiesto()).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+
+# Las imágenes que todavía no tienen versiones locales (hay que correr build_assets.py)
+def faltantes():
+    manifiesto = leer_manifiesto()
+    return [nombre for nombre in IMAGENES if not manifiesto.get(nombre)]
+
+
+# Devuelve el <figure> con srcset para que el navegador baje solo el ancho que necesita. Si la imagen todavía no
+# se generó (falta correr build_assets.py), el <figure> usa el link original
+def html_imagen(nombre, pie):
+    datos = leer_manifiesto().get(nombre)
+    pie = html.escape(pie)
+    if not datos:
+        return f"""
+<figure style="margin: 0 0 1rem 0; text-align: center;">
+    <img src="{html.escape(IMAGENES[nombre]['remota'])}" alt="{pie}" decoding="async" style="width: 100%; height: auto;">
+    <figcaption style="font-size: 0.875rem; color: rgba(49, 51, 63, 0.6); margin-top: 0.25rem;">{pie}</figcaption>
+</figure>
+"""
+    variantes = datos["variantes"]
+    mayor = variantes[-1]
+    srcset = ", ".join(f"{URL_ESTATICOS}{v['archivo']} {v['ancho']}w" for v in variantes)
+    return f"""
+<figure style="margin: 0 0 1rem 0; text-align: center;">
+    <img src="{URL_ESTATICOS}{variantes[0]['archivo']}" srcset="{srcset}" sizes="(max-width: 736px) 100vw, 704px"
+         width="{mayor['ancho']}" height="{mayor['alto']}" alt="{pie}" decoding="async"
+         style="width: 100%; height: auto;">
+    <figcaption style="font-size: 0.875rem; color: rgba(49, 51, 63, 0.6); margin-top: 0.25rem;">{pie}</figcaption>
+</figure>
+"""
@@ -0,0 +1,94 @@
+# ===================== DETALLE DE CADA TEMPORADA =====================
+# Lo que se ve al abrir una temporada en la línea del tiempo: el calendario con los ganadores, las victorias por
+# piloto y por escudería, y los puntos del campeonato con el sistema de puntos de esa época.
+# Se arma recién cuando alguien abre esa temporada y queda en el registro por versión (ver f1_almacen.py), así
+# una línea del tiempo con toda la historia no calcula 75 temporadas en cada rerun. No usa Streamlit.
+#
+# Los puntos los calcula f1_puntos.py con las reglas de cada época. Con el CSV de los 50s solo están los
+# ganadores, así que los puntos salen solo de las victorias; con un almacén completo (export de Ergast) entran
+# todas las posiciones.
+
+from functools import cached_property
+
+import pandas as pd
+
+from f1_consultas import nombre_gp, solo_lectura
+from f1_puntos import PRIMER_ANIO_CONSTRUCTORES, Campeonatos, epoca_de
+
+
+# Victorias de cada uno, de mayor a menor y numeradas desde 1
+def tabla_victorias(ganadores_df, columna, nombre):
+    conteo = ganadores_df[columna].value_counts()
+    conteo = conteo[conteo > 0]
+    tabla = pd.DataFrame({nombre: conteo.index.astype(object), "Victorias": conteo.to_numpy(dtype="int64")})
+    tabla.index += 1
+    return tabla
+
+
+class Temporada:
+    def __init__(self, year, resultados_df):
+        # Todas las filas de la temporada (una por piloto clasificado en cada carrera, como f1_datos.resultados)
+        self.year = year
+        self._resultados = solo_lectura(resultados_df)
+
+    @cached_property
+    def _ganadores(self):
+        df = self._resultados
+        return df[df["Position"] == 1].sort_values(["Round", "Date_Parsed"], kind="stable")
+
+    @property
+    def carreras(self):
+        return self._resultados["Round"].nunique()
+
+    # Solo hay ganadores en los datos (el CSV de los 50s): los puntos cuentan solo las victorias
+    @property
+    def solo_ganadores(self):
+        return bool((self._resultados["Position"].dropna() <= 1).all())
+
+    # La época da un punto por la vuelta rápida pero los datos no dicen quién la hizo (Ergast la trae desde 2004)
+    @property
+    def sin_vuelta_rapida(self):
+        return bool(epoca_de(self.year)["vuelta_rapida"]) and not self._resultados["VueltaRapida"].fillna(False).any()
+
+    @cached_property
+    def calendario(self):
+        df = self._ganadores
+        tabla = pd.DataFrame({
+            "Ronda": df["Round"].to_numpy(dtype="int64"),
+            "Gran Premio": [nombre_gp(gp) for gp in df["Grand Prix"]],
+            "Fecha": df["Date"].to_numpy(dtype=object),
+            "Circuito": df["Circuitos"].to_numpy(dtype=object),
+            "Ganador": df["Driver"].to_numpy(dtype=object),
+            "Escudería": df["Team"].to_numpy(dtype=object),
+        })
+        tabla.index += 1
+        return solo_lectura(tabla)
+
+    @cached_property
+    def victorias_pilotos(self):
+        return solo_lectura(tabla_victorias(self._ganadores, "Driver", "Piloto"))
+
+    @cached_property
+    def victorias_escuderias(self):
+        return solo_lectura(tabla_victorias(self._ganadores, "Team", "Escudería"))
+
+    @cached_property
+    def campeonato(self):
+        return solo_lectura(Campeonatos(self._resultados))
+
+    # Posiciones del campeonato; la columna de puntos sin descartes solo si algún resultado quedó afuera
+    def posiciones(self, tabla):
+        if (tabla["Puntos"] == tabla["Puntos brutos"]).all():
+            tabla = tabla.drop(columns="Puntos brutos")
+        return solo_lectura(tabla)
+
+    @cached_property
+    def posiciones_pilotos(self):
+        return self.posiciones(self.campeonato.temporada_pilotos(self.year))
+
+    # Antes de 1958 no había campeonato de constructores
+    @cached_property
+    def posiciones_escuderias(self):
+        if self.year < PRIMER_ANIO_CONSTRUCTORES:
+            return None
+        return self.posiciones(self.campeonato.temporada_escuderias(self.year))
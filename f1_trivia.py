@@ -0,0 +1,234 @@
+# ===================== BANCO DE PREGUNTAS DE TRIVIA =====================
+# Las preguntas de la trivia salen de los datos, así las respuestas nunca quedan viejas cuando se cargan más
+# temporadas. El banco se arma una sola vez, cuando se escribe el almacén (f1_datos.escribir_historia), y queda
+# guardado junto a las temporadas como una tabla de Arrow más (trivia.<hash>.arrow, en el manifest). Las
+# preguntas y las opciones se guardan como diccionario: cada nombre de piloto, escudería o país se guarda una sola
+# vez aunque aparezca en cientos de preguntas.
+#
+# Tipos de pregunta: quién ganó cada GP, con qué escudería, en qué circuito se corrió, quién y qué escudería
+# ganaron más carreras en cada temporada y en cada década, qué país tuvo más carreras en cada década, en qué país
+# está cada circuito, el año de la primera victoria de cada piloto y (si el almacén tiene todas las posiciones)
+# el campeón de cada temporada. Las opciones incorrectas son creíbles: pilotos o escuderías que ganaron en esa
+# misma temporada o en las cercanas, circuitos y países que también tuvieron carreras, años cercanos.
+#
+# Cada sesión sortea su partida con una semilla: primero un tipo de pregunta y después una pregunta de ese tipo,
+# las dos cosas en O(1), sin recorrer el banco. No usa Streamlit.
+
+import random
+
+import numpy as np
+import pyarrow as pa
+
+from f1_consultas import nombre_gp
+
+OPCIONES = 4
+PREGUNTAS_POR_PARTIDA = 6
+
+ESQUEMA_TRIVIA = pa.schema(
+    [("tipo", pa.dictionary(pa.int16(), pa.string())), ("pregunta", pa.string())]
+    + [(f"opcion_{i}", pa.dictionary(pa.int32(), pa.string())) for i in range(1, OPCIONES + 1)]
+    + [("correcta", pa.int8())]
+)
+
+
+def texto_decada(decada):
+    return f"los años {decada % 100:02d}" if decada < 2000 else f"los años {decada}"
+
+
+# Único con más apariciones (None si hay empate en el primer puesto)
+def lider(serie):
+    conteo = serie.value_counts()
+    conteo = conteo[conteo > 0]
+    if len(conteo) == 0 or (len(conteo) > 1 and conteo.iloc[0] == conteo.iloc[1]):
+        return None
+    return conteo.index[0]
+
+
+class Generador:
+    def __init__(self, df, circuitos=None, semilla=0):
+        self.azar = random.Random(semilla)
+        self.filas = []
+        # Una fila por carrera con su ganador (las carreras con el auto compartido entre dos ganadores no entran
+        # en las preguntas de esa carrera)
+        ganadores = df[df["Position"] == 1]
+        ganadores = ganadores.assign(Year=ganadores["Year"].astype(int)).sort_values(["Year", "Round"], kind="stable")
+        self.ganadores = ganadores
+        self.df = df
+        self.circuitos = circuitos
+        # Quiénes ganaron en cada temporada, para las opciones incorrectas
+        self.por_anio = {
+            columna: {int(year): list(dict.fromkeys(grupo[columna].astype(str))) for year, grupo in ganadores.groupby("Year")}
+            for columna in ("Driver", "Team", "Circuitos", "País")
+        }
+        self.anios = sorted(self.por_anio["Driver"])
+
+    # Opciones incorrectas: primero las de la misma temporada, después las de temporadas cada vez más lejanas
+    def cercanos(self, columna, year, correcta):
+        candidatos = []
+        for distancia in range(0, len(self.anios) + 1):
+            for y in {year - distancia, year + distancia}:
+                candidatos += [c for c in self.por_anio[columna].get(y, ()) if c != correcta and c not in candidatos]
+            if len(candidatos) >= OPCIONES * 2:
+                break
+        return candidatos
+
+    def agregar(self, tipo, pregunta, correcta, candidatos):
+        correcta = str(correcta)
+        candidatos = [str(c) for c in dict.fromkeys(candidatos) if str(c) != correcta and str(c) != "nan"]
+        if len(candidatos) < OPCIONES - 1:
+            return
+        # Entre las más creíbles (las primeras) elijo al azar
+        opciones = self.azar.sample(candidatos[:OPCIONES * 2], OPCIONES - 1) + [correcta]
+        self.azar.shuffle(opciones)
+        self.filas.append((tipo, pregunta, opciones, opciones.index(correcta)))
+
+    # ----- preguntas por carrera -----
+
+    def carreras(self):
+        unicas = self.ganadores.drop_duplicates(["Year", "Round"], keep=False)
+        for year, gp, piloto, escuderia, circuito in unicas[["Year", "Grand Prix", "Driver", "Team", "Circuitos"]].itertuples(index=False, name=None):
+            year, gp, piloto, escuderia = int(year), nombre_gp(gp), str(piloto), str(escuderia)
+            self.agregar("ganador_gp", f"¿Quién ganó el GP de {gp} de {year}?", piloto,
+                         self.cercanos("Driver", year, piloto))
+            self.agregar("escuderia_gp", f"¿Con qué escudería ganó {piloto} el GP de {gp} de {year}?", escuderia,
+                         self.cercanos("Team", year, escuderia))
+            if isinstance(circuito, str) and circuito:
+                self.agregar("circuito_gp", f"¿En qué circuito se corrió el GP de {gp} de {year}?", circuito,
+                             self.cercanos("Circuitos", year, circuito))
+
+    # ----- preguntas por temporada y por década -----
+
+    def temporadas(self):
+        for year, grupo in self.ganadores.groupby("Year"):
+            year = int(year)
+            piloto = lider(grupo["Driver"].astype(str))
+            if piloto is not None:
+                self.agregar("piloto_temporada", f"¿Qué piloto ganó más carreras en {year}?", piloto,
+                             self.cercanos("Driver", year, piloto))
+            escuderia = lider(grupo["Team"].astype(str))
+            if escuderia is not None:
+                self.agregar("escuderia_temporada", f"¿Qué escudería ganó más carreras en {year}?", escuderia,
+                             self.cercanos("Team", year, escuderia))
+
+    def decadas(self):
+        ganadores = self.ganadores.assign(Decada=self.ganadores["Year"] // 10 * 10)
+        for decada, grupo in ganadores.groupby("Decada"):
+            decada = int(decada)
+            for columna, tipo, texto in (("Driver", "piloto_decada", "¿Qué piloto ganó más carreras en {}?"),
+                                         ("Team", "escuderia_decada", "¿Cuál fue la escudería más ganadora en {}?"),
+                                         ("País", "pais_decada", "¿Qué país tuvo más Grandes Premios en {}?")):
+                correcta = lider(grupo[columna].astype(str))
+                if correcta is not None:
+                    # Las opciones: los que más ganaron en esa década después del primero
+                    candidatos = list(grupo[columna].astype(str).value_counts().index[1:])
+                    candidatos += self.cercanos(columna, decada + 5, correcta)
+                    self.agregar(tipo, texto.format(texto_decada(decada)), correcta, candidatos)
+
+    # ----- preguntas por circuito y por piloto -----
+
+    def paises_de_circuitos(self):
+        if self.circuitos is None or not len(self.circuitos):
+            return
+        usados = set(self.ganadores["Circuitos"].dropna().astype(str))
+        circuitos = self.circuitos[self.circuitos["Circuito"].isin(usados)].dropna(subset=["País"])
+        paises = list(dict.fromkeys(circuitos["País"].astype(str)))
+        for fila in circuitos.itertuples(index=False):
+            pais = str(fila.País)
+            # Los países que más se confunden son los otros con carreras; los mezclo para no repetir siempre los mismos
+            candidatos = self.azar.sample(paises, len(paises))
+            self.agregar("pais_circuito", f"¿En qué país está el circuito {fila.Circuito}?", pais, candidatos)
+
+    def primeras_victorias(self):
+        primeras = self.ganadores.groupby(self.ganadores["Driver"].astype(str))["Year"].agg(["min", "size"])
+        for piloto, (year, victorias) in primeras.iterrows():
+            if victorias < 2:
+                continue
+            year = int(year)
+            candidatos = [y for d in range(1, 6) for y in (year - d, year + d) if self.anios[0] <= y <= self.anios[-1]]
+            self.agregar("primera_victoria", f"¿En qué año ganó {piloto} su primera carrera de F1?", year, candidatos)
+
+    # Solo con todas las posiciones: con los ganadores solos el campeón podría no ser el verdadero
+    def campeones(self):
+        if not (self.df["Position"].dropna() > 1).any():
+            return
+        from f1_puntos import calcular  # (f1_puntos no hace falta para armar el resto del banco)
+
+        pilotos, _ = calcular(self.df)
+        campeones = pilotos[pilotos["Posición"] == 1]
+        for year, grupo in campeones.groupby("Year"):
+            if len(grupo) != 1:
+                continue
+            year = int(year)
+            campeon = grupo["Piloto"].iloc[0]
+            candidatos = list(pilotos.loc[(pilotos["Year"] == year) & (pilotos["Posición"] > 1), "Piloto"].head(OPCIONES * 2))
+            self.agregar("campeon", f"¿Quién fue campeón del mundo de pilotos en {year}?", campeon,
+                         candidatos + self.cercanos("Driver", year, campeon))
+
+    def tabla(self):
+        self.carreras()
+        self.temporadas()
+        self.decadas()
+        self.paises_de_circuitos()
+        self.primeras_victorias()
+        self.campeones()
+        # Ordenadas por tipo: así cada tipo es un tramo contiguo del archivo y sortear uno es elegir un número
+        filas = sorted(self.filas, key=lambda fila: fila[0])
+        columnas = {"tipo": [f[0] for f in filas], "pregunta": [f[1] for f in filas]}
+        for i in range(OPCIONES):
+            columnas[f"opcion_{i + 1}"] = [f[2][i] for f in filas]
+        columnas["correcta"] = [f[3] for f in filas]
+        arrays = []
+        for campo in ESQUEMA_TRIVIA:
+            if pa.types.is_dictionary(campo.type):
+                arrays.append(pa.array(columnas[campo.name], type=pa.string()).dictionary_encode().cast(campo.type))
+            else:
+                arrays.append(pa.array(columnas[campo.name], type=campo.type))
+        return pa.Table.from_arrays(arrays, schema=ESQUEMA_TRIVIA)
+
+
+def generar(df, circuitos=None, semilla=0):
+    return Generador(df, circuitos, semilla).tabla()
+
+
+# ===================== LECTURA Y SORTEO =====================
+
+class BancoTrivia:
+    def __init__(self, tabla):
+        self.tabla = tabla
+        # Dónde empieza y termina cada tipo (las filas vienen ordenadas por tipo)
+        tipos = tabla.column("tipo").combine_chunks() if len(tabla) else None
+        if tipos is None:
+            self.tramos = []
+        else:
+            codigos = tipos.indices.to_numpy(zero_copy_only=False)
+            cambios = np.flatnonzero(np.diff(codigos)) + 1
+            inicios = np.concatenate([[0], cambios])
+            fines = np.concatenate([cambios, [len(codigos)]])
+            self.tramos = [(int(a), int(b)) for a, b in zip(inicios, fines)]
+        self.columnas = {nombre: tabla.column(nombre) for nombre in tabla.column_names}
+
+    def __len__(self):
+        return len(self.tabla)
+
+    def pregunta(self, i):
+        opciones = [self.columnas[f"opcion_{j}"][i].as_py() for j in range(1, OPCIONES + 1)]
+        return {
+            "tipo": self.columnas["tipo"][i].as_py(),
+            "pregunta": self.columnas["pregunta"][i].as_py(),
+            "opciones": opciones,
+            "respuesta": opciones[self.columnas["correcta"][i].as_py()],
+        }
+
+    # n preguntas distintas para una partida: cada una de un tipo elegido al azar (así no salen seis "¿quién
+    # ganó el GP...?", que son la mayoría del banco) y dentro del tipo una al azar. Con la misma semilla sale
+    # siempre la misma partida.
+    def partida(self, semilla, n=PREGUNTAS_POR_PARTIDA):
+        azar = random.Random(semilla)
+        elegidas = []
+        n = min(n, len(self))
+        while len(elegidas) < n:
+            inicio, fin = azar.choice(self.tramos)
+            i = azar.randrange(inicio, fin)
+            if i not in elegidas:
+                elegidas.append(i)
+        return [self.pregunta(i) for i in elegidas]
@@ -1,221 +1,118 @@
-# Importo las librerías necesarias para que funcione la app
+# Importo las librerías necesarias para que funcione la app.
+# Arriba solo va lo mínimo para dibujar la intro: pandas y los módulos de datos se importan después de la
+# presentación, y altair / pydeck recién en las secciones que los usan. Así un proceso nuevo manda lo primero
+# al navegador sin esperar a que carguen las librerías pesadas.
 import streamlit as st
-import pandas as pd
-import pydeck as pdk
-import altair as alt
-from datetime import datetime
-import time
-import random
-
-# ====================== ESTILO GENERAL: fondo blanco con patrón de bandera a cuadros ======================
-# Acá le doy estilo a toda la página para que tenga un fondo de banderita a cuadros y los textos sean legibles.
-
-st.markdown(
-    """
-    <style>
-    html, body, .stApp {
-        height: 100%;
-        margin: 0;
-        padding: 0;
-        background-color: white;
-        background-image: repeating-conic-gradient(#fff 0% 25%, #000 0% 50%);
-        background-size: 40px 40px;
-    }
 
-    .block-container {
-        background-color: rgba(255, 255, 255, 0.95);
-        padding: 3rem;
-        border-radius: 15px;
-        box-shadow: 0px 0px 10px rgba(0,0,0,0.3);
-    }
-
-    .block-container h1, .block-container h2, .block-container h3,
-    .block-container h4, .block-container h5, .block-container h6,
-    .block-container p, .block-container label, .block-container div {
-        color: black !important;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-# ====================== ANIMACIÓN INICIAL: auto corriendo de derecha a izquierda ======================
-# Esta parte hace que un emoji de auto rojo de F1 pase al principio para que la app tenga una introducción y no todo sea estático.
-car_animation = """
-<div style="position:relative; height:160px; overflow:hidden;">
-    <div style="
-        position:absolute;
-        left: 100%;
-        top:20px;
-        animation: drive 3s linear forwards;
-        font-size: 120px;">
-        🏎️💨
-    </div>
-</div>
-
-<style>
-@keyframes drive {
-    0% { left: 100%; }
-    100% { left: -500px; }
-}
-</style>
-"""
-
-# Muestro la animación y espero 3.5 segundos para que termine antes de mostrar el resto
-st.markdown(car_animation, unsafe_allow_html=True)
-time.sleep(3.5)
-
-# ====================== TÍTULO Y PRESENTACIÓN ======================
-# Este es el título principal que estará siempre arriba. Debajo, una imagen de los Alfa Romeo 158 en el GP de Gran Bretaña (1950) y un texto que introduce la idea de la app
-
-st.markdown("<h1 style='text-align: center;'>La Fórmula de los 50s</h1>", unsafe_allow_html=True)
-
-st.image("https://i.imgur.com/tXsjOO5.png", caption="Alfa Romeo 158 en el GP de Gran Bretaña, 1950", use_container_width=True)
-
-st.markdown("""
-<div style="background-color: rgba(255, 255, 255, 0.92); padding: 1.5rem; border-radius: 12px; margin-top: 1rem;">
-    <h4 style="color: black;">🏁 Bienvenido a la era dorada de la F1</h4>
-    <p style="color: black; font-size: 16px; line-height: 1.6;">
-        Antes de los autos híbridos, de los cascos ultratecnológicos y de las radios con estrategias complicadas, la Fórmula 1 era puro corazón, instinto y gasolina. Los años 50 fueron el inicio de una leyenda: pilotos temerarios, escuderías míticas y circuitos que permitían la historia vuelta a vuelta.
-    </p>
-    <p style="color: black; font-size: 16px; line-height: 1.6;">
-        Esta página no es solo una base de datos: es un viaje interactivo a la década donde todo comenzó. 
-    </p>
-    <p style="color: black; font-size: 16px; font-weight: bold;">
-        Hoy muchos conocen a Verstappen o Hamilton, y pocos recuerdan las historias de Fangio o Ascari. Esta web busca cambiar eso.<br>
-        Explora, juega y descubre. Porque entender el presente de la F1 también es rendir homenaje a su pasado más bravo. 🏎️✨
-    </p>
-</div>
-""", unsafe_allow_html=True)
+import f1_metricas
 
-# ===================== CARGA DE DATOS =====================
-# Cargo el archivo CSV con los resultados de todas las carreras de los 50s
-# También convierto la fecha a formato datetime para poder usarla luego
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv("F1_1950s_Race_Results_FULL.csv")
-    df["Date_Parsed"] = pd.to_datetime(df["Date"], format="%d %b %Y", errors='coerce')
-    return df.dropna(subset=["Date_Parsed"])
-
-# Llamo a la función y guardo el DataFrame como races_df
-races_df = load_data()
-# ===================== CORRECCIÓN: Agrego las 9 carreras faltantes de Indianápolis =====================
-#En la base de datos general de la página de F1 no están todas registradas, pero luego en algunas tablas aparece que fueron 10 carreras en Indianápolis. Por ello, y para evitar la malinformación decidí agregarlas manualmente.
-
-indy_faltantes = pd.DataFrame([
-    {"Year": 1951, "Grand Prix": "Indianapolis 500", "Date": "30 May 1951", "Winner": "Lee Wallard", "Team": "Kurtis Kraft-Offenhauser"},
-    {"Year": 1952, "Grand Prix": "Indianapolis 500", "Date": "30 May 1952", "Winner": "Troy Ruttman", "Team": "Kuzma"},
-    {"Year": 1953, "Grand Prix": "Indianapolis 500", "Date": "30 May 1953", "Winner": "Bill Vukovich", "Team": "Kurtis Kraft-Offenhauser"},
-    {"Year": 1954, "Grand Prix": "Indianapolis 500", "Date": "30 May 1954", "Winner": "Bill Vukovich", "Team": "Kurtis Kraft-Offenhauser"},
-    {"Year": 1955, "Grand Prix": "Indianapolis 500", "Date": "30 May 1955", "Winner": "Bob Sweikert", "Team": "Kurtis Kraft-Offenhauser"},
-    {"Year": 1956, "Grand Prix": "Indianapolis 500", "Date": "30 May 1956", "Winner": "Pat Flaherty", "Team": "Watson"},
-    {"Year": 1957, "Grand Prix": "Indianapolis 500", "Date": "30 May 1957", "Winner": "Sam Hanks", "Team": "Epperly"},
-    {"Year": 1958, "Grand Prix": "Indianapolis 500", "Date": "30 May 1958", "Winner": "Jimmy Bryan", "Team": "Epperly"},
-    {"Year": 1959, "Grand Prix": "Indianapolis 500", "Date": "30 May 1959", "Winner": "Rodger Ward", "Team": "Watson"}
-])
-
-# Parseo la fecha correctamente
-indy_faltantes["Date_Parsed"] = pd.to_datetime(indy_faltantes["Date"], format="%d %b %Y", errors='coerce')
-
-# Asigno manualmente el país correcto
-indy_faltantes["País"] = "Estados Unidos"
-
-# Uno estas filas al DataFrame original
-races_df = pd.concat([races_df, indy_faltantes], ignore_index=True)
-
-
-# ===================== TRADUCCIÓN DE NOMBRES =====================
-# Para que se entienda mejor, traduzco los nombres de los GP a países, y también los meses a español
-
-gp_to_country = {
-    "British": "Reino Unido", "French": "Francia", "Italian": "Italia", "German": "Alemania",
-    "Monaco": "Mónaco", "Belgian": "Bélgica", "Dutch": "Países Bajos", "Swiss": "Suiza",
-    "Argentine": "Argentina", "Indianapolis 500": "Estados Unidos", "Spanish": "España",
-    "Portuguese": "Portugal", "Moroccan": "Marruecos"
-}
+# Métricas por sección (solo si están activadas con ?debug=1 o F1_DEBUG=1, ver f1_metricas.py)
+f1_metricas.iniciar()
+f1_metricas.empezar("intro")
 
-month_translation = {
-    "Jan": "Enero", "Feb": "Febrero", "Mar": "Marzo", "Apr": "Abril", "May": "Mayo", "Jun": "Junio",
-    "Jul": "Julio", "Aug": "Agosto", "Sep": "Septiembre", "Oct": "Octubre", "Nov": "Noviembre", "Dec": "Diciembre"
-}
+# ====================== ESTILO, ANIMACIÓN Y PRESENTACIÓN ======================
+# El fondo a cuadros, el título, la portada y la presentación son siempre iguales: vienen ya armados en un solo
+# bloque de HTML (ver f1_estatico.py, que no carga pandas, así esto sigue llegando al navegador enseguida).
+import f1_estatico
 
-# Traducción de GP a circuito específico (esto me sirve más adelante para el mapa y los tooltips)
-gp_to_circuits = {
-    "Argentine": ["Autódromo Juan y Oscar Gálvez"],
-    "Belgian": ["Spa-Francorchamps"],
-    "British": ["Silverstone", "Aintree"],
-    "Dutch": ["Zandvoort"],
-    "French": ["Reims-Gueux", "Rouen-Les-Essarts"],
-    "German": ["Nürburgring", "AVUS"],
-    "Indianapolis 500": ["Indianapolis Motor Speedway"],
-    "Italian": ["Autodromo Nazionale Monza", "Circuito di Pescara"],
-    "Monaco": ["Circuit de Monaco"],
-    "Moroccan": ["Ain-Diab Circuit"],
-    "Portuguese": ["Boavista", "Monsanto Park"],
-    "Spanish": ["Pedralbes"],
-    "Swiss": ["Bremgarten"]
-}
+# Muestro la animación solo en la primera carga de cada sesión. La animación corre en el navegador (CSS),
+# así que no hace falta esperar con time.sleep: antes cada rerun (cambiar un selectbox, responder la trivia)
+# bloqueaba el servidor 3.5 segundos. En los reruns siguientes la intro ya no se vuelve a mandar.
+if "intro_vista" not in st.session_state:
+    st.session_state.intro_vista = True
+    st.markdown(f1_estatico.ANIMACION, unsafe_allow_html=True)
 
-# 🗺️ Ahora mapeo correctamente los países
-races_df["País"] = races_df["Grand Prix"].map(gp_to_country)
+st.markdown(f1_estatico.cabecera(), unsafe_allow_html=True)
 
+f1_metricas.empezar("datos")
+# ===================== CARGA DE DATOS =====================
+import json
+import random
 
+import pandas as pd
 
-# ===================== SECCIÓN: ¿POR QUÉ LOS 50S? =====================
-# En vez de decir "justificación", hago esta sección donde implícitamente explico por qué vale la pena mirar esa década
+import f1_almacen
+from f1_datos import month_translation
+from f1_indices import fecha_valida
+from f1_consultas import COLUMNAS_CUMPLEANOS
+from f1_graficos import mapa_circuitos
+from f1_mapa import NIVELES_MAPA, VISTA_MUNDO, JerarquiaClusters, puntos_circuitos
+from f1_puntos import PRIMER_ANIO_CONSTRUCTORES, texto_reglas
+
+# Los datos ya vienen preparados en datos/historia/, una partición por temporada (CSV + las 9 carreras de
+# Indianápolis que faltaban, con país y circuitos resueltos). Ver f1_datos.py y build_dataset.py.
+# Si el almacén tiene toda la historia, en la barra lateral se elige qué temporadas mirar; solo se leen esas.
+
+# Los datos y todo lo que se arma con ellos están en un registro por versión que comparten todas las sesiones
+# (ver f1_almacen.py): si se publica una versión nueva del almacén, se prepara en segundo plano y los reruns
+# siguientes ya la usan, sin reiniciar la app. Este rerun usa la misma versión de principio a fin.
+almacen = f1_almacen.almacen()
+actual = almacen.actual()
+temporadas = actual.temporadas
+version = actual.version  # va en la clave de los gráficos y el mapa cacheados, así se rehacen con datos nuevos
+decadas = sorted({year // 10 * 10 for year in temporadas})
+
+# Por defecto muestro los 50s, que es de lo que trata la página
+with st.sidebar:
+    st.markdown("### 📅 Temporadas")
+    opciones_periodo = [f"Años {d % 100:02d}" if d < 2000 else f"Años {d}" for d in decadas] + ["Toda la historia"]
+    periodo_elegido = st.selectbox("Período", opciones_periodo, index=0)
+    if periodo_elegido == "Toda la historia":
+        minimo, maximo = temporadas[0], temporadas[-1]
+    else:
+        decada = decadas[opciones_periodo.index(periodo_elegido)]
+        minimo = max(decada, temporadas[0])
+        maximo = min(decada + 9, temporadas[-1])
+    if minimo < maximo:
+        desde, hasta = st.slider("Desde / hasta", minimo, maximo, (minimo, maximo))
+    else:
+        desde, hasta = minimo, maximo
 
-st.subheader("⏳ ¿Por qué volver a los 50s?")
-st.markdown("""
-<p style="font-size: 16px; line-height: 1.6;">
-En la era del streaming, las estadísticas y los monoplazas futuristas, a veces olvidamos cómo empezó todo. 
-Los años 50 fueron más que una introducción: fueron una época donde cada victoria era una hazaña y cada circuito, un riesgo real. 
-Pocos conocen esta parte de la historia. Esta plataforma te invita a redescubrirla, interactuar con ella y hacerla tuya.
-</p>
-""", unsafe_allow_html=True)
+# Texto del período para los títulos ("los 50s" si es una década completa)
+periodo, periodo_largo = f1_estatico.textos_periodo(desde, hasta)
 
-# ===================== TOP 5 PILOTOS CON MÁS VICTORIAS =====================
-# Armo una tabla con los 5 pilotos que más ganaron en la década. Le sumo un gráfico de barras con Altair para hacerlo visual
+# Todas las preguntas (cumpleaños, tops, países, explorador) las responde un objeto Consultas por rango de
+# temporadas (ver f1_consultas.py, que no depende de Streamlit). Queda en el registro, así cada rango se lee
+# una sola vez (memory map) y todas las sesiones comparten los datos, el cubo de conteos y los índices, que se
+# arman recién la primera vez que alguna sección los usa. El registro tiene un presupuesto de memoria, así no
+# crece con cada combinación que elige alguien.
+datos = almacen.consultas(actual, desde, hasta)
 
-st.subheader("🏆 Piloto con más victorias en los 50s")
+# Conteos de victorias por piloto, escudería, país, GP y año, con el ranking ya calculado.
+# Todos los gráficos y tablas de abajo leen de acá en vez de hacer su propio value_counts en cada rerun.
+cubo = datos.cubo
 
-top5_winners = races_df["Winner"].value_counts().head(5).reset_index()
-top5_winners.columns = ["Piloto", "Victorias"]
-top5_winners.index += 1  # Para que el ranking empiece desde 1
+f1_metricas.filas(len(datos.ganadores))
 
-# Hago el gráfico de barras
-chart_winners = alt.Chart(top5_winners).mark_bar(color='crimson').encode(
-    x=alt.X("Victorias:Q", axis=alt.Axis(title="Victorias", format="d")),
-    y=alt.Y("Piloto:N", sort='-x', title=""),
-    tooltip=["Piloto", "Victorias"]
-).properties(width=600, height=250)
+f1_metricas.terminar()
 
-# Lo muestro
-st.altair_chart(chart_winners, use_container_width=True)
+# ===================== SECCIONES FIJAS =====================
+# "¿Por qué volver a los 50s?", los dos top 5, los países con más carreras, la vista inicial del mapa y el cierre
+# son iguales para todos: vienen renderizados una sola vez por versión de los datos y período en un paquete
+# (ver f1_estatico.py y build_static.py). Acá solo se incrustan, sin armar nada.
+paquete = almacen.estatico(actual, desde, hasta)
 
-# ===================== TOP 5 ESCUDERÍAS CON MÁS VICTORIAS =====================
-# Igual que con los pilotos, pero ahora muestro las escuderías más exitosas
+# ===================== SECCIÓN: ¿POR QUÉ LOS 50S? =====================
+# En vez de decir "justificación", hago esta sección donde implícitamente explico por qué vale la pena mirar esa década
+st.markdown(paquete.por_que, unsafe_allow_html=True)
 
-st.subheader("🔧 Escudería más dominante de los 50s")
+f1_metricas.empezar("top5", filas=cubo.filas)
 
-top5_teams = races_df["Team"].value_counts().head(5).reset_index()
-top5_teams.columns = ["Escudería", "Victorias"]
-top5_teams.index += 1  # Empiezo desde 1 también
+# ===================== TOP 5 PILOTOS Y ESCUDERÍAS CON MÁS VICTORIAS =====================
+# Gráficos de barras (Vega-Lite) con los 5 pilotos y las 5 escuderías que más ganaron en el período.
+# El spec viene como texto: Streamlit modifica el dict que recibe, así que cada rerun usa su propia copia.
+st.markdown(paquete.titulo_pilotos)
+st.vega_lite_chart(json.loads(paquete.grafico_pilotos), use_container_width=True)
 
-# Hago el gráfico de barras
-chart_teams = alt.Chart(top5_teams).mark_bar(color='steelblue').encode(
-    x=alt.X("Victorias:Q", axis=alt.Axis(title="Victorias", format="d")),
-    y=alt.Y("Escudería:N", sort='-x', title=""),
-    tooltip=["Escudería", "Victorias"]
-).properties(width=600, height=250)
+st.markdown(paquete.titulo_escuderias)
+st.vega_lite_chart(json.loads(paquete.grafico_escuderias), use_container_width=True)
 
-# Lo muestro
-st.altair_chart(chart_teams, use_container_width=True)
+f1_metricas.empezar("linea_de_tiempo")
 
 # ===================== LÍNEA DEL TIEMPO INTERACTIVA =====================
 # Quise resumir los momentos más importantes de cada año en una especie de línea del tiempo simple con desglosables.
 
-st.subheader("📜 Línea del tiempo interactiva: Fórmula 1 en los años 50")
+st.subheader(f"📜 Línea del tiempo interactiva: Fórmula 1 en {periodo_largo}")
 
 eventos_f1_50s = {
     1950: "🏁 Se da el primer campeonato oficial de F1. Farina vence a Fangio y gana el título.",
@@ -230,285 +127,340 @@ eventos_f1_50s = {
     1959: "🧪 Jack Brabham, piloto de Cooper, se quedó sin combustible en la última vuelta, pero logró empujar su carro hasta la meta para asegurar su primer título mundial."
 }
 
-# Cada año aparece como un desglosable para que el usuario vaya abriéndolos como quiera
-for año, evento in eventos_f1_50s.items():
+# El detalle de cada temporada sale de los datos (calendario, victorias y puntos del campeonato, ver
+# f1_temporadas.py). Streamlit ejecuta el contenido de los desglosables aunque estén cerrados, así que el detalle
+# se pide con un interruptor: recién ahí se calcula esa temporada, y queda en el registro para todas las sesiones.
+# Cada temporada es su propio fragment, así abrir una no vuelve a ejecutar la página ni las otras temporadas.
+@st.fragment
+def detalle_temporada(año):
+    if not st.toggle("Ver calendario y campeonato", key=f"temporada_{año}"):
+        return
+    temporada = almacen.temporada(actual, año)
+    f1_metricas.filas(temporada.carreras)
+
+    st.markdown(f"**🗓️ Calendario ({temporada.carreras} carreras)**")
+    st.dataframe(temporada.calendario, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    col1.markdown("**🏎️ Victorias por piloto**")
+    col1.dataframe(temporada.victorias_pilotos, use_container_width=True)
+    col2.markdown("**🔧 Victorias por escudería**")
+    col2.dataframe(temporada.victorias_escuderias, use_container_width=True)
+
+    st.markdown("**🏆 Campeonato**")
+    if temporada.solo_ganadores:
+        aviso = " En los datos solo están los ganadores, así que los puntos cuentan solo las victorias."
+    elif temporada.sin_vuelta_rapida:
+        aviso = (" Los datos no dicen quién hizo la vuelta rápida, así que ese punto no se cuenta y los puntos pueden"
+                 " quedar por debajo de los oficiales.")
+    else:
+        aviso = ""
+    st.caption(texto_reglas(año) + aviso)
+    col1, col2 = st.columns(2)
+    col1.dataframe(temporada.posiciones_pilotos, use_container_width=True)
+    if temporada.posiciones_escuderias is not None:
+        col2.dataframe(temporada.posiciones_escuderias, use_container_width=True)
+    else:
+        col2.info(f"El campeonato de constructores empezó en {PRIMER_ANIO_CONSTRUCTORES}.")
+
+# Cada año aparece como un desglosable para que el usuario vaya abriéndolos como quiera (solo los del período elegido)
+for año in temporadas:
+    if not desde <= año <= hasta:
+        continue
     with st.expander(f"📅 {año}"):
-        st.markdown(f"<div style='font-size:16px'>{evento}</div>", unsafe_allow_html=True)
+        if año in eventos_f1_50s:
+            st.markdown(f"<div style='font-size:16px'>{eventos_f1_50s[año]}</div>", unsafe_allow_html=True)
+        detalle_temporada(año)
 
-# ===================== ¿HUBO UNA CARRERA EN TU CUMPLEAÑOS? =====================
-st.subheader("🎂 ¿Hubo una carrera de F1 en tu cumpleaños durante los años 50?")
-#Una forma interactiva de vincular al usuario con el pasado, y generar curiosidad que los mantenga en la página.
-
-# Uso dos columnas para seleccionar día y mes
-col1, col2 = st.columns(2)
-birth_day = col1.selectbox("Día", [""] + list(range(1, 32)))
-birth_month_name = col2.selectbox("Mes", [""] + list(month_translation.values()))
-
-if birth_day and birth_month_name:
-    # Convierto el mes de texto a número
-    month_number = list(month_translation.values()).index(birth_month_name)
-
-    # Filtro las carreras que coinciden exactamente con ese día
-    matching_races = races_df[
-        (races_df["Date_Parsed"].dt.day == int(birth_day)) &
-        (races_df["Date_Parsed"].dt.month == month_number + 1)
-    ]
-
-    if not matching_races.empty:
-        st.success("🎉 ¡Sí hubo Grand Prix en tu cumpleaños!")
-        st.dataframe(matching_races[["Year", "Grand Prix", "Date", "Winner", "Team"]])
-    else:
-        st.warning("No hubo ningún Grand Prix ese día.")
+f1_metricas.terminar()
 
-        # Como extra, muestro la carrera más cercana al cumpleaños
-        st.subheader("📅 Carrera más cercana a tu cumpleaños")
-        ref_date = datetime(1955, month_number + 1, int(birth_day))
-        races_df["Diff"] = races_df["Date_Parsed"].apply(lambda x: abs((x - ref_date).days))
-        closest = races_df.loc[races_df["Diff"].idxmin()]
+# ===================== ¿HUBO UNA CARRERA EN TU CUMPLEAÑOS? =====================
+# Cada sección interactiva va dentro de un st.fragment: al tocar un widget de la sección solo se vuelve a
+# ejecutar (y a mandar al navegador) esa sección, no los gráficos, el mapa ni el resto de la página.
+@st.fragment
+def seccion_cumpleanos():
+    f1_metricas.empezar("cumpleanos")
+    st.subheader(f"🎂 ¿Hubo una carrera de F1 en tu cumpleaños durante {periodo_largo}?")
+    #Una forma interactiva de vincular al usuario con el pasado, y generar curiosidad que los mantenga en la página.
+
+    # Uso dos columnas para seleccionar día y mes
+    col1, col2 = st.columns(2)
+    birth_day = col1.selectbox("Día", [""] + list(range(1, 32)))
+    birth_month_name = col2.selectbox("Mes", [""] + list(month_translation.values()))
+
+    if birth_day and birth_month_name:
+        # Convierto el mes de texto a número
+        month_number = list(month_translation.values()).index(birth_month_name)
+        mes, dia = month_number + 1, int(birth_day)
+
+        # Busco en el índice las carreras que coinciden exactamente con ese día (sin recorrer todo el DataFrame)
+        matching_races = datos.carreras_del_dia(mes, dia)
+        f1_metricas.filas(len(matching_races))
+
+        if not fecha_valida(mes, dia):
+            st.warning("Esa fecha no existe, revisa el día y el mes.")
+        elif not matching_races.empty:
+            st.success("🎉 ¡Sí hubo Grand Prix en tu cumpleaños!")
+            st.dataframe(matching_races[COLUMNAS_CUMPLEANOS])
+        else:
+            st.warning("No hubo ningún Grand Prix ese día.")
 
-        # Traducción del mes al español
-        fecha_gp = closest["Date_Parsed"]
-        mes_es = month_translation[fecha_gp.strftime("%b")]
-        fecha_str = f"{fecha_gp.day} {mes_es} {fecha_gp.year}"
+            # Como extra, muestro la carrera más cercana al cumpleaños (contando días del calendario,
+            # así el 31 de diciembre también encuentra las carreras de enero)
+            st.subheader("📅 Carrera más cercana a tu cumpleaños")
+            # (con el mes en español y el nombre del GP traducido al país)
+            st.info(datos.mensaje_mas_cercana(mes, dia))
 
-        # 🔧 Corrección al traducir el GP
-        gp_raw = closest["Grand Prix"]
-        gp_name = gp_to_country[gp_raw] if gp_raw in gp_to_country else gp_raw
+    f1_metricas.terminar()
 
-        mensaje = f"El GP de {gp_name} en {fecha_str} fue la carrera más cercana a tu cumple. Ganó {closest['Winner']} con {closest['Team']}."
-        st.info(mensaje[0].upper() + mensaje[1:])
+seccion_cumpleanos()
 
 
 
+f1_metricas.empezar("ranking_paises", filas=cubo.filas)
 # ===================== ¿QUÉ PAÍS TUVO MÁS CARRERAS? =====================
-st.subheader("🌍 País con más carreras en los 50s")
-
-# Ajusto la cantidad de carreras para Indianápolis, que tuvo 10 (una por año entre 1950 y 1959)
-# Me aseguro de que esté correctamente registrado como "Estados Unidos"
-races_df["País"] = races_df["País"].replace({
-    "USA": "Estados Unidos",
-    "U.S.A.": "Estados Unidos",
-    "EEUU": "Estados Unidos"
-})
-
-# Valido que cada edición de Indianápolis esté bien etiquetada
-indy_filter = races_df["Grand Prix"] == "Indianapolis 500"
-races_df.loc[indy_filter, "País"] = "Estados Unidos"
-
-# Cuento cuántas carreras hubo por país
-country_counts = races_df["País"].value_counts()
-top_count = country_counts.max()
-top_countries = country_counts[country_counts == top_count].index.tolist()
-
-# Acá controlo cómo se muestra el texto dependiendo de si hay empate entre países (empatan Reino Unido, Estados Unidos e Italia)
-if len(top_countries) == 1:
-    pais_texto = f"{top_countries[0]} fue el país con más Grandes Premios: {top_count} en total."
-elif len(top_countries) == 2:
-    pais1, pais2 = top_countries
-    conjuncion = "e" if pais2.strip().lower().startswith("i") else "y"
-    lista_paises = f"{pais1} {conjuncion} {pais2}"
-    pais_texto = f"{lista_paises} fueron los países con más Grandes Premios: {top_count} cada uno."
-else:
-    lista_paises = ", ".join(top_countries[:-1]) + f" y {top_countries[-1]}"
-    pais_texto = f"{lista_paises} fueron los países con más Grandes Premios: {top_count} cada uno."
-
-st.success(pais_texto[0].upper() + pais_texto[1:])
+st.markdown(paquete.titulo_paises)
+
+# Indianápolis ya viene con sus 10 ediciones y el país normalizado a "Estados Unidos" desde el artefacto
+
+# El texto cambia si hay empate entre países (en los 50s empatan Reino Unido, Estados Unidos e Italia); ver
+# texto_paises_lideres en f1_consultas.py
+if paquete.texto_paises:
+    st.success(paquete.texto_paises)
 
 with st.expander("📊 Ver el top 5 de países con más carreras"):
-    # Convierto a DataFrame con columnas nombradas
-    country_df = country_counts.reset_index()
-    country_df.columns = ["País", "Carreras"]
-
-    # Obtengo solo las primeras 5 filas, respetando los empates
-    top_5_unique = country_df["Carreras"].unique()[:5]  # toma los 5 valores distintos más altos
-    top5_df = country_df[country_df["Carreras"].isin(top_5_unique)].sort_values("Carreras", ascending=False)
-
-    # Limito a 5 filas exactas si hay más por empate
-    if len(top5_df) > 5:
-        top5_df = top5_df.head(5)
-
-    # Numero desde 1 en la tabla para evitar que numere sumando el número de carreras
-    top5_df.index = range(1, len(top5_df)+1)
-    st.table(top5_df)
-
-# ===================== MAPA INTERACTIVO (por país con circuitos en tooltip) =====================
-
-# Antes que nada, armo las coordenadas manualmente (no sale del CSV)
-country_coords = {
-    "Reino Unido": [51.5, -0.1], "Francia": [48.85, 2.35], "Italia": [41.9, 12.5],
-    "Alemania": [52.52, 13.4], "Mónaco": [43.73, 7.42], "Bélgica": [50.85, 4.35],
-    "Países Bajos": [52.37, 4.89], "Suiza": [46.95, 7.45], "Argentina": [-34.6, -58.38],
-    "Estados Unidos": [39.8, -86.1], "España": [40.42, -3.7], "Portugal": [38.72, -9.14],
-    "Marruecos": [33.58, -7.62]
-}
+    # Las primeras 5 filas respetando los empates, ya numeradas desde 1 y pasadas a HTML en el paquete
+    st.markdown(paquete.tabla_paises, unsafe_allow_html=True)
+
+f1_metricas.terminar()
+
+# ===================== MAPA INTERACTIVO (circuitos agrupados según el zoom) =====================
+# Un punto por circuito (las coordenadas vienen con el almacén, ver datos/circuitos.csv). Con toda la historia
+# son muchos, así que se agrupan según el nivel de detalle elegido (ver f1_mapa.py) y solo se mandan los grupos
+# que entran en la vista. La vista inicial (el mundo entero) viene en el paquete de las secciones fijas; las
+# otras se arman y se pasan a JSON una sola vez por versión de los datos, período y vista, y en los reruns se
+# manda el mismo JSON ya hecho.
+
+@st.cache_resource(max_entries=8)
+def jerarquia_mapa(version, desde, hasta, _datos, _circuitos):
+    carreras_por_circuito = _datos.cubo.conteo("circuito")
+    return JerarquiaClusters(puntos_circuitos(_circuitos, carreras_por_circuito))
+
+@st.cache_resource(max_entries=64)
+def mapa(version, desde, hasta, nivel, centro, _jerarquia):
+    lat, lon = _jerarquia.centros[centro] if centro else VISTA_MUNDO  # sin centro, la vista del mundo entero
+    return mapa_circuitos(_jerarquia, NIVELES_MAPA[nivel], lat, lon)
+
+@st.fragment
+def seccion_mapa():
+    f1_metricas.empezar("mapa")
+    # Título de la sección
+    st.markdown(paquete.titulo_mapa)
+
+    col1, col2 = st.columns(2)
+    nivel = col1.select_slider("Nivel de detalle", options=list(NIVELES_MAPA), value="Mundo")
+    if nivel == "Mundo":
+        mapa_actual = paquete.mapa
+    else:
+        jerarquia = jerarquia_mapa(version, desde, hasta, datos, almacen.circuitos(actual))
+        centro = col2.selectbox("Centrar en", list(jerarquia.centros)) if jerarquia.centros else None
+        mapa_actual = mapa(version, desde, hasta, nivel, centro, jerarquia)
+    f1_metricas.filas(mapa_actual.filas)
+
+    # Muestro el mapa (el tooltip se muestra cuando paso el mouse)
+    st.pydeck_chart(mapa_actual)
+    f1_metricas.terminar()
+
+seccion_mapa()
 
-# Armo un diccionario que relacione país con sus circuitos usados
-circuitos_por_pais = {}
-for gp, pais in gp_to_country.items():
-    if gp in gp_to_circuits:
-        circuitos_por_pais.setdefault(pais, set()).update(gp_to_circuits[gp])
-
-# Título de la sección
-st.subheader("🗺️ Mapa de países con carreras en los años 50")
-
-# Ahora armo los datos para el mapa
-map_data = []
-for country, count in country_counts.items():
-    if country in country_coords:
-        lat, lon = country_coords[country]
-        circuitos = sorted(circuitos_por_pais.get(country, []))
-        tooltip_text = f"{country}: {count} carreras\nCircuitos: {', '.join(circuitos)}"
-        map_data.append({
-            "País": country,
-            "Lat": lat,
-            "Lon": lon,
-            "Carreras": count,
-            "Tooltip": tooltip_text
-        })
-
-# Convierto la lista en un DataFrame para usar en el mapa
-map_df = pd.DataFrame(map_data)
-
-# Creo la capa de puntos del mapa
-layer = pdk.Layer(
-    "ScatterplotLayer",
-    data=map_df,
-    get_position='[Lon, Lat]',  # cada punto se ubica en su lat/lon
-    get_radius="Carreras * 30000",  # cuanto más carreras, más grande el círculo
-    get_fill_color=[255, 0, 0, 180],  # color rojo translúcido
-    pickable=True,  # para que tenga tooltip
-    auto_highlight=True
-)
-
-# Vista inicial del mapa (centrada en el mundo)
-view_state = pdk.ViewState(latitude=20, longitude=0, zoom=1.2, pitch=0)
-
-# Muestro el mapa
-st.pydeck_chart(pdk.Deck(
-    layers=[layer],
-    initial_view_state=view_state,
-    tooltip={"text": "{Tooltip}"}  # el tooltip se muestra cuando paso el mouse
-))
 # ===================== EXPLORAR DESEMPEÑO DE PILOTOS Y ESCUDERÍAS =====================
 
-# Título general de esta sección
-st.subheader("🔍 Explora el desempeño de pilotos y escuderías")
-
-# Instrucción para el usuario
-st.markdown("Selecciona **una sola opción** para ver el historial de victorias de un piloto o una escudería:")
-
-# Creo dos pestañas (tabs): una para pilotos, otra para escuderías
-tab1, tab2 = st.tabs(["🏎️ Ver por piloto", "🔧 Ver por escudería"])
-
-# ==== TAB 1: Por piloto ====
-with tab1:
-    # Extraigo la lista de pilotos que hayan ganado al menos una carrera
-    pilotos_unicos = sorted(races_df["Winner"].dropna().unique())
-    # Agrego opción por defecto "--"
-    piloto = st.selectbox("Selecciona un piloto ganador", ["--"] + pilotos_unicos)
-
-    if piloto != "--":
-        # Muestro la tabla con todas sus victorias
-        st.markdown(f"### 🏁 Victorias de **{piloto}** en los años 50")
-        victorias_piloto = races_df[races_df["Winner"] == piloto][["Year", "Grand Prix", "Date", "Team"]].sort_values("Year")
-        # Reseteo el índice para que la tabla se vea ordenada
-        victorias_piloto.reset_index(drop=True, inplace=True)
-        victorias_piloto.index += 1
-        victorias_piloto.index.name = "N°"
-        st.dataframe(victorias_piloto, use_container_width=True)
-
-# ==== TAB 2: Por escudería ====
-with tab2:
-    # Lista de escuderías únicas que hayan ganado al menos una carrera
-    escuderias_unicas = sorted(races_df["Team"].dropna().unique())
-    escuderia = st.selectbox("Selecciona una escudería ganadora", ["--"] + escuderias_unicas)
-
-    if escuderia != "--":
-        st.markdown(f"### 🏆 Victorias de **{escuderia}** en los años 50")
-        victorias_escuderia = races_df[races_df["Team"] == escuderia][["Year", "Grand Prix", "Date", "Winner"]].sort_values("Year")
-        # Ordeno bien el índice para que se vea claro
-        victorias_escuderia.reset_index(drop=True, inplace=True)
-        victorias_escuderia.index += 1
-        victorias_escuderia.index.name = "N°"
-        st.dataframe(victorias_escuderia, use_container_width=True)
-# ===================== TEST: ¿DE QUÉ ESCUDERÍA SERÍAS? =====================
+# Cuántas opciones se mandan como máximo a cada selectbox
+MAX_OPCIONES = 25
+
+@st.fragment
+def seccion_explorar():
+    f1_metricas.empezar("explorador")
+    # Título general de esta sección
+    st.subheader("🔍 Explora el desempeño de pilotos y escuderías")
+
+    # Instrucción para el usuario
+    st.markdown("Selecciona **una sola opción** para ver el historial de victorias de un piloto o una escudería:")
+
+    # Creo dos pestañas (tabs): una para pilotos, otra para escuderías
+    tab1, tab2 = st.tabs(["🏎️ Ver por piloto", "🔧 Ver por escudería"])
+
+    # ==== TAB 1: Por piloto ====
+    with tab1:
+        # Con toda la historia son cientos de pilotos: en vez de mandar la lista entera, el buscador del índice
+        # (sin tildes, por prefijo y tolerante a errores de tipeo) devuelve solo los mejores resultados.
+        # Sin nada escrito aparecen los que más ganaron.
+        pilotos = datos.pilotos
+        buscado = st.text_input("Buscar piloto", placeholder="Por ejemplo: fangio, jose froilan", key="buscar_piloto")
+        # Agrego opción por defecto "--"
+        piloto = st.selectbox("Selecciona un piloto ganador", ["--", *pilotos.busqueda.buscar(buscado, MAX_OPCIONES)])
+
+        if piloto != "--":
+            # Muestro la tabla con todas sus victorias (ya ordenada y numerada desde 1 en el índice)
+            st.markdown(f"### 🏁 Victorias de **{piloto}** en {periodo_largo}")
+            st.dataframe(pilotos.victorias(piloto), use_container_width=True)
+
+    # ==== TAB 2: Por escudería ====
+    with tab2:
+        # Lo mismo con las escuderías que hayan ganado al menos una carrera
+        escuderias = datos.escuderias
+        buscada = st.text_input("Buscar escudería", placeholder="Por ejemplo: ferrari", key="buscar_escuderia")
+        escuderia = st.selectbox("Selecciona una escudería ganadora", ["--", *escuderias.busqueda.buscar(buscada, MAX_OPCIONES)])
+
+        if escuderia != "--":
+            st.markdown(f"### 🏆 Victorias de **{escuderia}** en {periodo_largo}")
+            st.dataframe(escuderias.victorias(escuderia), use_container_width=True)
+
+    f1_metricas.terminar()
+
+seccion_explorar()
+
+# ===================== CARA A CARA =====================
+# Dos pilotos (o dos escuderías) frente a frente: carreras que corrieron juntos, cuántas veces terminó cada uno
+# delante y sus victorias por temporada. Todo sale de una matriz de pares armada una sola vez por versión y rango
+# de temporadas (ver f1_duelos.py), así elegir otro par es leer una rebanada, sin cruzar los resultados.
+
+def cara_a_cara(columna, singular, clave, ejemplos):
+    duelos = almacen.duelos(actual, desde, hasta, columna)
+    col1, col2 = st.columns(2)
+    elegidos = []
+    for col, lado in ((col1, "a"), (col2, "b")):
+        with col:
+            buscado = st.text_input(f"Buscar {singular}", placeholder=f"Por ejemplo: {ejemplos[lado]}", key=f"{clave}_buscar_{lado}")
+            elegidos.append(st.selectbox(f"Elige un {singular}" if columna == "Driver" else f"Elige una {singular}",
+                                         ["--", *duelos.busqueda.buscar(buscado, MAX_OPCIONES)], key=f"{clave}_{lado}"))
+    a, b = elegidos
+    if a == "--" or b == "--":
+        return
+    if a == b:
+        st.info("Elige dos distintos para compararlos.")
+        return
+
+    duelo = duelos.duelo(a, b)
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Carreras juntos", duelo["carreras"])
+    m2.metric(f"Delante: {a}", duelo["delante_a"])
+    m3.metric(f"Delante: {b}", duelo["delante_b"])
+    if duelo["tabla"] is not None:
+        st.dataframe(duelo["tabla"], use_container_width=True)
+    elif duelos.solo_ganadores:
+        st.caption("En los datos solo están los ganadores de cada carrera, así que no hay carreras en común para"
+                   " comparar; con un almacén completo (export de Ergast) aparecen todas.")
+    else:
+        st.caption(f"No corrieron ninguna carrera juntos en {periodo_largo}.")
 
-# Título de la sección
-st.subheader("🛠️ ¿De qué escudería serías?")
+    st.markdown(f"**🏁 Victorias por temporada en {periodo_largo}**")
+    st.bar_chart(duelos.victorias_por_temporada(a, b), stack=False)
 
-# Texto introductorio
-st.markdown("Responde este breve test y descubre qué escudería de los 50s encaja mejor contigo.")
+@st.fragment
+def seccion_cara_a_cara():
+    f1_metricas.empezar("cara_a_cara")
+    st.subheader("⚔️ Cara a cara")
+    st.markdown("Elige dos pilotos o dos escuderías para ver quién terminó delante cuando corrieron juntos:")
+    tab1, tab2 = st.tabs(["🏎️ Pilotos", "🔧 Escuderías"])
+    with tab1:
+        cara_a_cara("Driver", "piloto", "duelo_piloto", {"a": "fangio", "b": "ascari"})
+    with tab2:
+        cara_a_cara("Team", "escudería", "duelo_escuderia", {"a": "ferrari", "b": "maserati"})
+    f1_metricas.terminar()
 
-# Diccionario con las preguntas y opciones. Cada opción tiene un perfil asociado
-preguntas = {
-    "¿Cuál es tu estilo de conducción?": {
-        "Conservador, prefiero la estrategia": "estratega",
-        "A la ofensiva, siempre al límite": "agresivo",
-        "Equilibrado, me adapto": "equilibrado"
-    },
-    "¿Qué valoras más en una escudería?": {
-        "Innovación y tecnología": "innovador",
-        "Pasión y tradición": "tradicional",
-        "Precisión y eficiencia": "preciso"
-    },
-    "¿Qué tipo de piloto te identificas más?": {
-        "Líder calmado y analítico": "calculador",
-        "Carismático y arriesgado": "valiente",
-        "Constante y técnico": "disciplinado"
-    }
-}
+seccion_cara_a_cara()
 
-# Lista para guardar las respuestas del usuario
-respuestas = []
-todo_listo = True  # Flag para comprobar que no falte ninguna pregunta
-
-# Itero sobre cada pregunta y sus opciones
-for i, (pregunta, opciones) in enumerate(preguntas.items()):
-    st.markdown(f"**{i+1}. {pregunta}**")
-    # Agrego una opción por defecto al inicio
-    opciones_con_placeholder = ["Selecciona una opción..."] + list(opciones.keys())
-    # Uso un selectbox con clave distinta para cada pregunta
-    seleccion = st.selectbox("", opciones_con_placeholder, key=f"preg_{i}")
-    
-    # Si el usuario no responde una pregunta, marco que no está todo listo
-    if seleccion == "Selecciona una opción...":
-        todo_listo = False
-    else:
-        respuestas.append(opciones[seleccion])  # Guardo el perfil
+# ===================== TEST: ¿DE QUÉ ESCUDERÍA SERÍAS? =====================
 
-# Botón para ver el resultado
-if st.button("Descubrir mi escudería ideal"):
-    if not todo_listo:
-        st.warning("Por favor responde todas las preguntas antes de continuar.")
-    else:
-        # Cuento cuántas veces se repite cada perfil en las respuestas
-        conteo = pd.Series(respuestas).value_counts()
-        resultado = conteo.idxmax()  # Me quedo con el perfil dominante
-
-        # Diccionario que relaciona perfil con escudería
-        perfil_to_team = {
-            "agresivo": "Maserati",
-            "estratega": "Ferrari",
-            "equilibrado": "Vanwall",
-            "tradicional": "Alfa Romeo",
-            "innovador": "Cooper",
-            "preciso": "Mercedes",
-            "valiente": "BRM",
-            "calculador": "Ferrari",
-            "disciplinado": "Gordini"
+@st.fragment
+def seccion_test_escuderia():
+    f1_metricas.empezar("test_escuderia")
+    # Título de la sección
+    st.subheader("🛠️ ¿De qué escudería serías?")
+
+    # Texto introductorio
+    st.markdown("Responde este breve test y descubre qué escudería de los 50s encaja mejor contigo.")
+
+    # Diccionario con las preguntas y opciones. Cada opción tiene un perfil asociado
+    preguntas = {
+        "¿Cuál es tu estilo de conducción?": {
+            "Conservador, prefiero la estrategia": "estratega",
+            "A la ofensiva, siempre al límite": "agresivo",
+            "Equilibrado, me adapto": "equilibrado"
+        },
+        "¿Qué valoras más en una escudería?": {
+            "Innovación y tecnología": "innovador",
+            "Pasión y tradición": "tradicional",
+            "Precisión y eficiencia": "preciso"
+        },
+        "¿Qué tipo de piloto te identificas más?": {
+            "Líder calmado y analítico": "calculador",
+            "Carismático y arriesgado": "valiente",
+            "Constante y técnico": "disciplinado"
         }
+    }
+
+    # Lista para guardar las respuestas del usuario
+    respuestas = []
+    todo_listo = True  # Flag para comprobar que no falte ninguna pregunta
+
+    # Itero sobre cada pregunta y sus opciones
+    for i, (pregunta, opciones) in enumerate(preguntas.items()):
+        st.markdown(f"**{i+1}. {pregunta}**")
+        # Agrego una opción por defecto al inicio
+        opciones_con_placeholder = ["Selecciona una opción..."] + list(opciones.keys())
+        # Uso un selectbox con clave distinta para cada pregunta. La pregunta ya está escrita arriba: va también
+        # como etiqueta (oculta) para los lectores de pantalla, en vez de una etiqueta vacía
+        seleccion = st.selectbox(pregunta, opciones_con_placeholder, key=f"preg_{i}", label_visibility="collapsed")
+
+        # Si el usuario no responde una pregunta, marco que no está todo listo
+        if seleccion == "Selecciona una opción...":
+            todo_listo = False
+        else:
+            respuestas.append(opciones[seleccion])  # Guardo el perfil
+
+    # Botón para ver el resultado
+    if st.button("Descubrir mi escudería ideal"):
+        if not todo_listo:
+            st.warning("Por favor responde todas las preguntas antes de continuar.")
+        else:
+            # Cuento cuántas veces se repite cada perfil en las respuestas
+            conteo = pd.Series(respuestas).value_counts()
+            resultado = conteo.idxmax()  # Me quedo con el perfil dominante
+
+            # Diccionario que relaciona perfil con escudería
+            perfil_to_team = {
+                "agresivo": "Maserati",
+                "estratega": "Ferrari",
+                "equilibrado": "Vanwall",
+                "tradicional": "Alfa Romeo",
+                "innovador": "Cooper",
+                "preciso": "Mercedes",
+                "valiente": "BRM",
+                "calculador": "Ferrari",
+                "disciplinado": "Gordini"
+            }
+
+            # Busco la escudería final
+            escuderia = perfil_to_team.get(resultado, "Ferrari")
+            # Muestro el resultado al usuario
+            st.success(f"🏁 ¡Serías de **{escuderia}**!")
+
+    f1_metricas.terminar()
+
+seccion_test_escuderia()
 
-        # Busco la escudería final
-        escuderia = perfil_to_team.get(resultado, "Ferrari")
-        # Muestro el resultado al usuario
-        st.success(f"🏁 ¡Serías de **{escuderia}**!")
 # ===================== TRIVIA INTERACTIVA =====================
 
 # Título
 st.subheader("🧠 Trivia")
 
-# 📋 Lista de preguntas tipo test. Cada una tiene una pregunta, opciones y respuesta correcta.
-trivia_preguntas = [
+# 📋 Las preguntas salen de un banco generado con los datos cuando se arma el almacén (ver f1_trivia.py), así
+# las respuestas siempre coinciden con lo que muestra la app. Cada sesión sortea su partida con una semilla
+# propia (leer 6 preguntas del banco, sin calcular nada). Si el almacén es de antes de que existiera el banco,
+# uso estas preguntas escritas a mano, que valen para los 50s.
+trivia_fija = [
     {
         "pregunta": "¿Qué piloto ganó más carreras en la década de 1950?",
         "opciones": ["Juan Manuel Fangio", "Alberto Ascari", "Stirling Moss", "Mike Hawthorn"],
@@ -541,6 +493,20 @@ trivia_preguntas = [
     }
 ]
 
+banco_trivia = almacen.trivia(actual)
+if "trivia_semilla" not in st.session_state:
+    st.session_state.trivia_semilla = random.randrange(2 ** 32)
+
+# La partida queda guardada en la sesión (si se publica una versión nueva de los datos, la partida en curso
+# sigue con sus preguntas); se sortea la primera vez y cada vez que se pide jugar otra vez
+def preguntas_trivia():
+    if "trivia_preguntas" not in st.session_state:
+        if banco_trivia is not None and len(banco_trivia):
+            st.session_state.trivia_preguntas = banco_trivia.partida(st.session_state.trivia_semilla)
+        else:
+            st.session_state.trivia_preguntas = trivia_fija
+    return st.session_state.trivia_preguntas
+
 # 👉 Variables de estado para guardar progreso y puntaje (uso st.session_state)
 if "trivia_index" not in st.session_state:
     st.session_state.trivia_index = 0  # índice actual
@@ -552,13 +518,19 @@ if "trivia_resultado" not in st.session_state:
     st.session_state.trivia_resultado = False  # si fue correcta
 if "trivia_puntaje" not in st.session_state:
     st.session_state.trivia_puntaje = 0  # puntaje total
+if "trivia_aviso" not in st.session_state:
+    st.session_state.trivia_aviso = False  # si hay que pedir que elija una opción
 
 # 👉 Función para comprobar si la opción elegida es correcta
+# (dentro de un fragment los callbacks no pueden dibujar elementos, así que el aviso lo muestra la sección)
 def comprobar_respuesta():
+    # Leo la opción directo del radio para no depender del valor guardado en el rerun anterior
+    st.session_state.trivia_opcion = st.session_state.get(f"radio_{st.session_state.trivia_index}")
+    st.session_state.trivia_aviso = False
     if st.session_state.trivia_opcion == "Selecciona una opción" or st.session_state.trivia_opcion is None:
-        st.warning("Selecciona una opción válida.")
+        st.session_state.trivia_aviso = True
     else:
-        correcta = trivia_preguntas[st.session_state.trivia_index]["respuesta"]
+        correcta = preguntas_trivia()[st.session_state.trivia_index]["respuesta"]
         st.session_state.trivia_resultado = st.session_state.trivia_opcion == correcta
         st.session_state.trivia_respondida = True
         if st.session_state.trivia_resultado:
@@ -571,56 +543,60 @@ def siguiente_pregunta():
     st.session_state.trivia_respondida = False
     st.session_state.trivia_resultado = False
 
-# 👉 Mostrar pregunta actual
-if st.session_state.trivia_index < len(trivia_preguntas):
-    q = trivia_preguntas[st.session_state.trivia_index]
-    opciones = ["Selecciona una opción"] + q["opciones"]
-
-    st.markdown(f"**{q['pregunta']}**")
-    st.session_state.trivia_opcion = st.radio(
-        "Opciones:",
-        opciones,
-        index=0,
-        key=f"radio_{st.session_state.trivia_index}"
-    )
-
-    # Mostrar botón para responder o siguiente pregunta según el caso
-    if not st.session_state.trivia_respondida:
-        st.button("Comprobar respuesta", on_click=comprobar_respuesta)
-    else:
-        if st.session_state.trivia_resultado:
-            st.success("✅ ¡Correcto!")
+# 👉 Función para empezar otra partida con preguntas nuevas (se sortean cuando se vuelve a mostrar la trivia)
+def nueva_partida():
+    st.session_state.trivia_semilla += 1
+    del st.session_state.trivia_preguntas
+    st.session_state.trivia_index = 0
+    st.session_state.trivia_puntaje = 0
+    st.session_state.trivia_opcion = None
+    st.session_state.trivia_respondida = False
+    st.session_state.trivia_resultado = False
+
+# 👉 Mostrar pregunta actual. Va en un fragment para que responder o pasar de pregunta solo vuelva a
+# ejecutar la trivia (los botones con on_click también reejecutan solo el fragment)
+@st.fragment
+def seccion_trivia():
+    f1_metricas.empezar("trivia")
+    trivia_preguntas = preguntas_trivia()
+    if st.session_state.trivia_index < len(trivia_preguntas):
+        q = trivia_preguntas[st.session_state.trivia_index]
+        opciones = ["Selecciona una opción"] + q["opciones"]
+
+        st.markdown(f"**{q['pregunta']}**")
+        st.session_state.trivia_opcion = st.radio(
+            "Opciones:",
+            opciones,
+            index=0,
+            key=f"radio_{st.session_state.trivia_index}"
+        )
+
+        # Mostrar botón para responder o siguiente pregunta según el caso
+        if not st.session_state.trivia_respondida:
+            if st.session_state.trivia_aviso:
+                st.warning("Selecciona una opción válida.")
+            st.button("Comprobar respuesta", on_click=comprobar_respuesta)
         else:
-            st.error(f"❌ Incorrecto. La respuesta correcta era: {q['respuesta']}")
-        st.button("Siguiente pregunta", on_click=siguiente_pregunta)
+            if st.session_state.trivia_resultado:
+                st.success("✅ ¡Correcto!")
+            else:
+                st.error(f"❌ Incorrecto. La respuesta correcta era: {q['respuesta']}")
+            st.button("Siguiente pregunta", on_click=siguiente_pregunta)
 
-else:
-    # Cuando se termina la trivia, mostrar puntaje final
-    st.success(f"🎉 ¡Has terminado la trivia! Obtuviste {st.session_state.trivia_puntaje} de {len(trivia_preguntas)} puntos.")
+    else:
+        # Cuando se termina la trivia, mostrar puntaje final
+        st.success(f"🎉 ¡Has terminado la trivia! Obtuviste {st.session_state.trivia_puntaje} de {len(trivia_preguntas)} puntos.")
+        if banco_trivia is not None and len(banco_trivia):
+            st.button("Jugar otra vez", on_click=nueva_partida)
 
-# ===================== CIERRE REFLEXIVO / CONTEXTO FINAL =====================
+    f1_metricas.terminar()
+
+seccion_trivia()
 
-# Esta sección cierra la web dándole sentido a todo el recorrido sin necesidad de decir “esta es una justificación”.
-
-st.markdown("## 📦 ¿Qué nos deja volver al pasado?")
-
-st.markdown("""
-<div style="background-color: #ffffffdd; padding: 1.5rem; border-radius: 12px; margin-top: 1rem;">
-    <p style="color: black; font-size: 16px; line-height: 1.7;">
-        A lo largo de esta página vimos que los años 50 no fueron una simple etapa temprana de la Fórmula 1. 
-        Fueron un laboratorio de riesgo, de ingenio y de pasión desmedida. 
-        Sus protagonistas no tenían simuladores ni telemetría, pero sí una voluntad inquebrantable.
-    </p>
-    <p style="color: black; font-size: 16px; line-height: 1.7;">
-        Quizá al principio te preguntabas por qué mirar tan atrás. Ahora sabes que Fangio no es solo una calle 
-        o una estatua, que los circuitos no eran simples pistas y que cada escudería tenía algo que decir.
-        Explorar esta década es también entender de dónde venimos, por qué la F1 es lo que es hoy y a quiénes 
-        les debemos cada vuelta de rueda.
-    </p>
-    <p style="color: black; font-size: 16px; line-height: 1.7; font-weight: bold;">
-        Hoy más que nunca, conocer la historia no es nostalgia: es memoria, es homenaje, es conexión.
-    </p>
-</div>
-""", unsafe_allow_html=True)
+# ===================== CIERRE REFLEXIVO / CONTEXTO FINAL =====================
 
+# Esta sección cierra la web dándole sentido a todo el recorrido (el texto viene en el paquete de las secciones fijas)
+st.markdown(paquete.cierre, unsafe_allow_html=True)
 
+# Panel de métricas en la barra lateral (no muestra nada si no están activadas)
+f1_metricas.panel()
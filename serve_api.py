@@ -0,0 +1,29 @@
+# ===================== API LOCAL =====================
+# Levanta la API de solo lectura de f1_api.py (JSON con ETag y respuestas ya comprimidas) con uvicorn (está en
+# requirements.txt junto con starlette). Por defecto escucha solo en esta máquina.
+# Uso:
+#   python serve_api.py                     -> http://127.0.0.1:8600/api
+#   python serve_api.py --puerto 9000
+# Ejemplos:
+#   curl http://127.0.0.1:8600/api/top/pilotos?n=10
+#   curl "http://127.0.0.1:8600/api/cumpleanos?mes=5&dia=13&desde=1950&hasta=1959"
+#   curl http://127.0.0.1:8600/api/pilotos/Juan%20Manuel%20Fangio
+
+import argparse
+import time
+
+import uvicorn
+
+import f1_api
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API local de solo lectura con los datos de la app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8600)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    app = f1_api.crear_app()
+    estado = app.state.api.estado
+    print(f"Almacén {estado.version.version}: {len(estado.fijas)} respuestas precalculadas en {time.perf_counter() - inicio:.1f} s")
+    uvicorn.run(app, host=args.host, port=args.puerto, log_level="warning")
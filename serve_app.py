@@ -0,0 +1,176 @@
+# ===================== ARRANQUE DE LA APP CON CALENTAMIENTO =====================
+# Con "streamlit run" todo lo que se guarda en memoria (el almacén leído, el cubo, los índices, la trivia, los
+# specs de los gráficos y del mapa) se arma recién cuando entra el primer visitante, que espera todo eso después
+# de cada deploy o de cada proceso nuevo. Este script lo arma antes de aceptar conexiones:
+# 1. el registro (f1_almacen.Almacen.calentar): consultas, cubo e índices de la primera década (lo que se ve al
+#    entrar) y de toda la historia, las secciones fijas (el paquete de build_static.py, o armadas si falta), las
+#    matrices del cara a cara, los circuitos, la trivia y el detalle de las temporadas de la primera década;
+# 2. levanta el servidor de Streamlit en este mismo proceso y, en cuanto contesta, le abre una sesión como la de
+#    un navegador (por el websocket, como benchmarks/bench_sesiones.py) que corre la app con la primera década y
+#    con toda la historia: así quedan importados todos los módulos de la app y compilado el script;
+# 3. recién ahí lo da por listo, si la sesión terminó sin errores.
+# Mientras tanto responde en un puerto local si ya está listo, para que el supervisor (systemd, un healthcheck de
+# Docker, el balanceador) no le mande tráfico antes: GET http://127.0.0.1:8599/listo contesta 503 mientras calienta
+# y 200 cuando terminó la sesión de calentamiento, con la versión del almacén y cuánto tardó cada paso. Con
+# --archivo-listo además escribe ese mismo JSON en un archivo (y lo borra al empezar). (Streamlit ya acepta
+# conexiones durante el paso 2; el que decide cuándo mandar tráfico es el supervisor, mirando /listo.)
+# Si la sesión de calentamiento falla o la app muestra un error, /listo se queda en 503 con estado "error" y los
+# errores en el JSON (y no se escribe el archivo): un deploy roto no recibe tráfico.
+# Uso:
+#   python serve_app.py                                   -> http://localhost:8501, listo en :8599/listo
+#   python serve_app.py --puerto 8502 --salud-puerto 0 --archivo-listo /run/f1/listo.json
+#   python serve_app.py -- --server.headless true         (lo que va después de -- se le pasa a streamlit run)
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(CARPETA, "f_1_birthday_gp_app.py")
+
+estado = {"listo": False, "estado": "calentando"}
+
+
+class Salud(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/listo"):
+            self.send_error(404)
+            return
+        cuerpo = json.dumps(estado, ensure_ascii=False).encode()
+        self.send_response(200 if estado["listo"] else 503)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+def escribir_listo(archivo):
+    temporal = archivo + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, archivo)  # el supervisor nunca ve el archivo a medio escribir
+
+
+# Una sesión como la del navegador: pide la primera corrida (rerun_script sin widgets) y, si hay más de un
+# rango, otra con "Toda la historia" en el selector de período. Devuelve cuánto tardó cada corrida y los
+# errores que mostró la app.
+async def sesion_de_calentamiento(puerto, toda_la_historia):
+    import websockets
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    pasos, errores, periodo = [], [], {}
+
+    async def correr(ws, nombre, estados):
+        mensaje = BackMsg()
+        mensaje.rerun_script.query_string = ""
+        mensaje.rerun_script.page_script_hash = ""
+        mensaje.rerun_script.widget_states.widgets.extend(estados)
+        inicio = time.perf_counter()
+        await ws.send(mensaje.SerializeToString())
+        while True:
+            respuesta = ForwardMsg()
+            respuesta.ParseFromString(await ws.recv())
+            tipo = respuesta.WhichOneof("type")
+            if tipo == "script_finished":
+                break
+            if tipo != "delta" or respuesta.delta.WhichOneof("type") != "new_element":
+                continue
+            elemento = respuesta.delta.new_element
+            if elemento.WhichOneof("type") == "exception":
+                errores.append(elemento.exception.message)
+            elif elemento.WhichOneof("type") == "selectbox" and elemento.selectbox.label == "Período":
+                periodo["id"] = elemento.selectbox.id
+        pasos.append((nombre, time.perf_counter() - inicio))
+
+    async with websockets.connect(f"ws://127.0.0.1:{puerto}/_stcore/stream", subprotocols=["streamlit"],
+                                  max_size=None) as ws:
+        await correr(ws, "app primera década", [])
+        if toda_la_historia and "id" in periodo:
+            await correr(ws, "app toda la historia", [WidgetState(id=periodo["id"], string_value="Toda la historia")])
+    return pasos, errores
+
+
+# Espera a que Streamlit conteste, corre la sesión de calentamiento y recién ahí marca el servidor como listo (o
+# como roto, si la sesión no pudo correr la app sin errores)
+def calentar_y_avisar(puerto, toda_la_historia, archivo):
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{puerto}/_stcore/health", timeout=2) as respuesta:
+                if respuesta.status == 200:
+                    break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    estado.update(estado="calentando la app")
+    try:
+        pasos, errores = asyncio.run(sesion_de_calentamiento(puerto, toda_la_historia))
+    except Exception as error:
+        pasos, errores = [], [repr(error)]
+    for nombre, segundos in pasos:
+        estado["pasos"][nombre] = round(segundos, 3)
+        print(f"  {nombre:<28} {segundos * 1000:9.1f} ms", flush=True)
+    if errores:
+        estado.update(estado="error", errores=errores)
+        for error in errores:
+            print(f"Error en la sesión de calentamiento: {error}", flush=True)
+        print("No queda listo: /listo sigue en 503", flush=True)
+        return
+    estado.update(listo=True, estado="listo")
+    if archivo:
+        escribir_listo(archivo)
+    print(f"Listo: http://localhost:{puerto}", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calienta los cachés y después levanta la app de Streamlit")
+    parser.add_argument("--puerto", type=int, default=8501)
+    parser.add_argument("--salud-puerto", type=int, default=8599, help="puerto local de /listo (0 = no levantarlo)")
+    parser.add_argument("--archivo-listo", default=None, help="archivo JSON que se escribe cuando está listo")
+    parser.add_argument("streamlit", nargs="*", help="opciones extra para streamlit run (después de --)")
+    args = parser.parse_args()
+
+    if args.archivo_listo and os.path.exists(args.archivo_listo):
+        os.remove(args.archivo_listo)
+    if args.salud_puerto:
+        salud = ThreadingHTTPServer(("127.0.0.1", args.salud_puerto), Salud)
+        threading.Thread(target=salud.serve_forever, name="f1-salud", daemon=True).start()
+
+    import f1_almacen
+    from f1_estatico import rangos_por_defecto
+
+    inicio = time.perf_counter()
+    almacen = f1_almacen.almacen()
+    actual = almacen.actual()
+    rangos = rangos_por_defecto(actual.temporadas)
+    primera = [year for year in actual.temporadas if rangos[0][0] <= year <= rangos[0][1]]
+    pasos = [("almacén", time.perf_counter() - inicio)]
+    pasos += almacen.calentar(actual, rangos, primera)
+
+    total = time.perf_counter() - inicio
+    estado.update(
+        estado="arrancando",
+        version=actual.version,
+        temporadas=[actual.temporadas[0], actual.temporadas[-1]],
+        calentamiento_s=round(total, 3),
+        pasos={nombre: round(segundos, 3) for nombre, segundos in pasos},
+    )
+    print(f"Almacén {actual.version}: registro caliente en {total:.1f} s", flush=True)
+    for nombre, segundos in pasos:
+        print(f"  {nombre:<28} {segundos * 1000:9.1f} ms", flush=True)
+
+    threading.Thread(target=calentar_y_avisar, args=(args.puerto, len(rangos) > 1, args.archivo_listo),
+                     name="f1-calentar", daemon=True).start()
+
+    from streamlit.web import cli
+
+    cli.main(["run", APP, "--server.port", str(args.puerto), *args.streamlit], prog_name="streamlit", standalone_mode=True)
@@ -0,0 +1,7 @@
+# Las pruebas importan los módulos de la raíz del repo (como los benchmarks), corran desde donde corran
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
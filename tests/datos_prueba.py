@@ -0,0 +1,36 @@
+# ===================== RESULTADOS CHICOS PARA LAS PRUEBAS =====================
+# Arma resultados con el mismo esquema y los mismos tipos que el almacén (f1_datos.ESQUEMA pasado por Arrow:
+# Position es int8 con vacíos para los no clasificados, los textos repetidos son categóricas), así las pruebas
+# pasan por los mismos caminos que los datos reales.
+# Cada carrera es (año, ronda, gran premio, fecha "13 May 1950", participaciones) y cada participación es
+# (piloto, escudería, posición o None) o (piloto, escudería, posición, número, vuelta rápida).
+
+import pandas as pd
+import pyarrow as pa
+
+import f1_datos
+
+
+def resultados(carreras):
+    filas = []
+    for year, ronda, gp, fecha, participaciones in carreras:
+        for participacion in participaciones:
+            if len(participacion) == 3:
+                participacion = (*participacion, None, False)
+            piloto, escuderia, posicion, numero, vuelta = participacion
+            filas.append({
+                "Year": year, "Round": ronda, "Grand Prix": gp, "Date": fecha,
+                "Date_Parsed": pd.to_datetime(fecha, format="%d %b %Y"),
+                "Driver": piloto, "Team": escuderia, "Position": posicion, "Numero": numero, "VueltaRapida": vuelta,
+                "País": gp, "Circuitos": f"Circuito de {gp}", "Fuente": "prueba",
+            })
+    df = pd.DataFrame(filas, columns=f1_datos.ESQUEMA.names)
+    df["Position"] = df["Position"].astype("Int8")
+    df["Numero"] = df["Numero"].astype("Int16")
+    return f1_datos.a_pandas(pa.Table.from_pandas(df, schema=f1_datos.ESQUEMA, preserve_index=False))
+
+
+# Solo los ganadores, con las columnas de la vista de ganadores (f1_datos.ganadores)
+def ganadores(carreras):
+    df = resultados(carreras)
+    return df[(df["Position"] == 1).fillna(False)].rename(columns={"Driver": "Winner"}).reset_index(drop=True)
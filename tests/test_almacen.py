@@ -0,0 +1,119 @@
+# ===================== REGISTRO POR VERSIÓN (f1_almacen.py) =====================
+# Cuando cambia el almacén, revisar() publica la versión nueva con lo que estaba en uso ya armado, sin tocar lo
+# que tienen en la mano las sesiones; y con poco presupuesto se descarta primero lo de versiones viejas y después
+# lo usado hace más tiempo.
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import f1_datos
+from datos_prueba import resultados
+from f1_almacen import Almacen
+
+CARRERAS = [
+    (1950, 1, "British", "13 May 1950", [("Farina", "Alfa Romeo", 1), ("Fangio", "Alfa Romeo", 2)]),
+    (1950, 2, "Monaco", "21 May 1950", [("Fangio", "Alfa Romeo", 1), ("Ascari", "Ferrari", 2)]),
+    (1951, 1, "Swiss", "27 May 1951", [("Fangio", "Alfa Romeo", 1), ("Farina", "Alfa Romeo", 2)]),
+]
+NUEVA = (1952, 1, "Swiss", "18 May 1952", [("Taruffi", "Ferrari", 1), ("Fischer", "Ferrari", 2)])
+
+
+@pytest.fixture
+def historia(tmp_path):
+    anterior = f1_datos.HISTORIA
+    carpeta = str(tmp_path / "historia")
+    f1_datos.escribir_historia(resultados(CARRERAS), [], carpeta)
+    f1_datos.usar_historia(carpeta)
+    yield carpeta
+    f1_datos.usar_historia(anterior)
+
+
+def test_revisar_publica_la_version_nueva_ya_armada(historia):
+    almacen = Almacen(intervalo=0)
+    vieja = almacen.actual()
+    assert vieja.temporadas == [1950, 1951]
+    consultas = almacen.consultas(vieja, 1950, 1951)
+    assert len(consultas.cumpleanos) == 3
+    # Sin cambios en los archivos no se hace nada
+    assert not almacen.revisar()
+
+    f1_datos.escribir_historia(resultados(CARRERAS + [NUEVA]), [], historia)
+    assert almacen.revisar()
+    nueva = almacen.actual()
+    assert nueva.version != vieja.version
+    assert nueva.temporadas == [1950, 1951, 1952]
+
+    # Lo que estaba en uso ya está armado para la versión nueva, con sus índices calculados
+    assert (nueva.version, ("consultas", 1950, 1951)) in claves(almacen)
+    preparada = almacen.consultas(nueva, 1950, 1951)
+    assert preparada is not consultas
+    assert "cumpleanos" in vars(preparada)
+    # La sesión que todavía tiene la versión vieja la sigue pudiendo usar
+    assert consultas.carreras_del_dia(5, 13)["Winner"].tolist() == ["Farina"]
+    assert almacen.consultas(nueva, 1950, 1952).carreras_del_dia(5, 18)["Winner"].tolist() == ["Taruffi"]
+
+
+def test_cambiar_de_almacen(historia, tmp_path):
+    almacen = Almacen(intervalo=0)
+    vieja = almacen.actual()
+    otra = str(tmp_path / "otra")
+    f1_datos.escribir_historia(resultados([NUEVA]), [], otra)
+    f1_datos.usar_historia(otra)
+    nueva = almacen.actual()
+    assert nueva.carpeta == otra and nueva.version != vieja.version
+    assert nueva.temporadas == [1952]
+
+
+# ----- presupuesto de memoria (con versiones de mentira y arrays de tamaño conocido) -----
+
+def de_bytes(n):
+    return lambda: np.zeros(n, dtype=np.uint8)
+
+
+def claves(almacen):
+    return [(entrada["version"], entrada["clave"]) for entrada in almacen.memoria()]
+
+
+def test_presupuesto_descarta_primero_versiones_viejas():
+    almacen = Almacen(presupuesto_mb=2500 / 2 ** 20, intervalo=0)
+    vieja, actual = SimpleNamespace(version="v1"), SimpleNamespace(version="v2")
+    almacen._actual = actual
+    almacen.obtener(actual, "a", de_bytes(1000))
+    almacen.obtener(vieja, "b", de_bytes(1000))
+    almacen.obtener(actual, "c", de_bytes(1000))
+    assert claves(almacen) == [("v2", "a"), ("v2", "c")]
+    assert almacen.total == 2000
+
+
+def test_presupuesto_descarta_lo_usado_hace_mas_tiempo():
+    almacen = Almacen(presupuesto_mb=2500 / 2 ** 20, intervalo=0)
+    actual = SimpleNamespace(version="v2")
+    almacen._actual = actual
+    almacen.obtener(actual, "a", de_bytes(1000))
+    almacen.obtener(actual, "b", de_bytes(1000))
+    almacen.obtener(actual, "a", de_bytes(1000))  # (ya estaba: solo pasa a ser lo más reciente)
+    almacen.obtener(actual, "c", de_bytes(1000))
+    assert claves(almacen) == [("v2", "a"), ("v2", "c")]
+
+
+def test_lo_ultimo_no_se_descarta_aunque_no_entre():
+    almacen = Almacen(presupuesto_mb=500 / 2 ** 20, intervalo=0)
+    actual = SimpleNamespace(version="v1")
+    almacen._actual = actual
+    almacen.obtener(actual, "a", de_bytes(100))
+    grande = almacen.obtener(actual, "b", de_bytes(1000))
+    assert len(grande) == 1000
+    assert claves(almacen) == [("v1", "b")]
+
+
+def test_remedir_cuenta_lo_que_crecio():
+    almacen = Almacen(presupuesto_mb=1, intervalo=0)
+    actual = SimpleNamespace(version="v1")
+    almacen._actual = actual
+    valor = almacen.obtener(actual, "a", lambda: SimpleNamespace(datos=np.zeros(100, dtype=np.uint8)))
+    antes = almacen.total
+    valor.indice = np.zeros(5000, dtype=np.uint8)
+    almacen.remedir(actual, "a")
+    assert almacen.total >= antes + 5000
@@ -0,0 +1,151 @@
+# ===================== API (f1_api.py) =====================
+# ETag y 304 (If-None-Match con comparación débil, listas y "*"), elección de la codificación según
+# Accept-Encoding y las rutas de punta a punta contra un almacén chico. La app se llama directo por ASGI, sin
+# levantar un servidor.
+
+import asyncio
+import gzip
+import json
+
+import pytest
+from starlette.requests import Request
+
+import f1_almacen
+import f1_datos
+from datos_prueba import resultados
+from f1_api import RespuestaJSON, codificaciones_aceptadas, crear_app
+
+CARRERAS = [
+    (1950, 1, "British", "13 May 1950", [("Farina", "Alfa Romeo", 1), ("Fangio", "Alfa Romeo", 2)]),
+    (1950, 2, "Monaco", "21 May 1950", [("Fangio", "Alfa Romeo", 1), ("Ascari", "Ferrari", 2)]),
+    (1951, 1, "Swiss", "27 May 1951", [("Fangio", "Alfa Romeo", 1), ("Farina", "Alfa Romeo", 2)]),
+]
+# Lo bastante grande para que se guarde comprimido
+DATOS = {"filas": [{"piloto": f"Piloto {i}", "victorias": i} for i in range(50)]}
+
+
+def pedido(cabeceras=()):
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(nombre.encode(), valor.encode()) for nombre, valor in cabeceras]})
+
+
+def test_codificaciones_aceptadas():
+    assert codificaciones_aceptadas("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert codificaciones_aceptadas("gzip;q=0, br;q=0.5") == {"br"}
+    assert codificaciones_aceptadas("GZIP;q=x") == set()
+    assert {"br", "gzip"} <= codificaciones_aceptadas("*")
+    assert codificaciones_aceptadas("") == set()
+
+
+def test_codificacion_elegida():
+    respuesta = RespuestaJSON(DATOS, "v1")
+    assert respuesta.codificacion("gzip") == "gzip"
+    assert respuesta.codificacion("identity") == "identity"
+    assert respuesta.codificacion("gzip;q=0") == "identity"
+    if "br" in respuesta.cuerpos:
+        assert respuesta.codificacion("gzip, br") == "br"
+    # Una respuesta chica no se comprime
+    assert RespuestaJSON({"a": 1}, "v1").codificacion("gzip") == "identity"
+
+
+def test_etag_fuerte_por_codificacion_y_version():
+    respuesta = RespuestaJSON(DATOS, "v1")
+    assert respuesta.etags["identity"].startswith('"v1-') and respuesta.etags["gzip"].endswith('-gzip"')
+    assert len(set(respuesta.etags.values())) == len(respuesta.cuerpos)
+    assert RespuestaJSON(DATOS, "v2").etags["identity"] != respuesta.etags["identity"]
+
+
+def test_if_none_match():
+    respuesta = RespuestaJSON(DATOS, "v1")
+    etag = respuesta.etags["identity"]
+    assert respuesta.coincide(etag)
+    assert respuesta.coincide(f"W/{etag}")  # comparación débil
+    assert respuesta.coincide(f'"otro", W/"otro-mas",{etag}')
+    assert respuesta.coincide("*")
+    assert not respuesta.coincide('"otro"')
+    assert not respuesta.coincide(etag.strip('"'))  # sin comillas no es un ETag
+    assert not respuesta.coincide(None) and not respuesta.coincide("")
+
+
+def test_responder_con_cuerpo_y_304():
+    respuesta = RespuestaJSON(DATOS, "v1")
+    completa = respuesta.responder(pedido([("accept-encoding", "gzip")]))
+    assert completa.status_code == 200
+    assert completa.headers["content-encoding"] == "gzip"
+    assert completa.headers["vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(completa.body)) == DATOS
+
+    etag = completa.headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", "*"):
+        no_cambio = respuesta.responder(pedido([("accept-encoding", "gzip"), ("if-none-match", if_none_match)]))
+        assert no_cambio.status_code == 304
+        assert no_cambio.body == b""
+        assert no_cambio.headers["etag"] == etag
+
+
+# ===================== DE PUNTA A PUNTA =====================
+
+def pedir(app, ruta, cabeceras=()):
+    ruta, _, consulta = ruta.partition("?")
+    alcance = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+               "path": ruta, "raw_path": ruta.encode(), "query_string": consulta.encode(), "root_path": "",
+               "headers": [(nombre.encode(), valor.encode()) for nombre, valor in cabeceras],
+               "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80)}
+    mensajes = []
+
+    async def recibir():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def enviar(mensaje):
+        mensajes.append(mensaje)
+
+    asyncio.run(app(alcance, recibir, enviar))
+    cabeceras = {nombre.decode(): valor.decode() for nombre, valor in mensajes[0]["headers"]}
+    return mensajes[0]["status"], cabeceras, b"".join(mensaje.get("body", b"") for mensaje in mensajes[1:])
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    anterior = f1_datos.HISTORIA
+    carpeta = str(tmp_path / "historia")
+    f1_datos.escribir_historia(resultados(CARRERAS), [], carpeta)
+    f1_datos.usar_historia(carpeta)
+    # Un registro propio, sin vigía
+    monkeypatch.setattr(f1_almacen, "_almacen", f1_almacen.Almacen(intervalo=0))
+    yield crear_app(precalcular=True)
+    f1_datos.usar_historia(anterior)
+
+
+def test_rutas(app):
+    estado, _, cuerpo = pedir(app, "/api/top/pilotos?n=1")
+    assert estado == 200
+    assert json.loads(cuerpo)["datos"] == [{"puesto": 1, "Piloto": "Fangio", "Victorias": 2}]
+
+    estado, _, cuerpo = pedir(app, "/api/cumpleanos?mes=5&dia=13&desde=1950&hasta=1950")
+    datos = json.loads(cuerpo)
+    assert (datos["desde"], datos["hasta"]) == (1950, 1950)
+    assert [carrera["ganador"] for carrera in datos["datos"]["carreras"]] == ["Farina"]
+
+    estado, _, cuerpo = pedir(app, "/api/pilotos/Fangio")
+    assert json.loads(cuerpo)["datos"]["victorias"] == 2
+
+
+def test_errores(app):
+    assert pedir(app, "/api/cumpleanos?mes=2&dia=30")[0] == 400
+    assert pedir(app, "/api/top/pistas")[0] == 404
+    assert pedir(app, "/api/pilotos/Nadie")[0] == 404
+    assert pedir(app, "/api/top/pilotos?desde=1990")[0] == 400
+
+
+def test_revalidar_da_304(app):
+    estado, cabeceras, cuerpo = pedir(app, "/api/paises", [("accept-encoding", "gzip")])
+    assert estado == 200 and cuerpo
+    etag = cabeceras["etag"]
+    estado, cabeceras, cuerpo = pedir(app, "/api/paises", [("accept-encoding", "gzip"), ("if-none-match", f'"x", W/{etag}')])
+    assert estado == 304 and cuerpo == b""
+    assert cabeceras["etag"] == etag
+    # El mismo ETag sirve para otro orden de los parámetros (la clave es el rango ya resuelto)
+    assert pedir(app, "/api/paises?hasta=1951&desde=1950", [("accept-encoding", "gzip"), ("if-none-match", etag)])[0] == 304
+    # Sin gzip la representación es otra, con su propio ETag
+    estado, cabeceras, _ = pedir(app, "/api/paises", [("if-none-match", '"otro"')])
+    assert estado == 200 and cabeceras["etag"] != etag
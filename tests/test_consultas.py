@@ -0,0 +1,77 @@
+# ===================== CUMPLEAÑOS EN LOTE (f1_consultas.py, cumpleanos_csv.py) =====================
+# Consultas.cumpleanos_lote tiene que dar lo mismo que preguntar fecha por fecha como lo hace la app, y las
+# fechas que no existen quedan marcadas como no válidas en vez de romper el lote.
+
+import io
+
+import numpy as np
+import pandas as pd
+
+import cumpleanos_csv
+from datos_prueba import ganadores
+from f1_consultas import Consultas
+from f1_indices import DIAS_POR_MES
+
+CARRERAS = [
+    (1950, 1, "British", "13 May 1950", [("Farina", "Alfa Romeo", 1)]),
+    (1950, 2, "Monaco", "21 May 1950", [("Fangio", "Alfa Romeo", 1)]),
+    (1951, 1, "Swiss", "13 May 1951", [("Fangio", "Alfa Romeo", 1)]),
+    (1952, 1, "Argentine", "30 Dec 1952", [("Ascari", "Ferrari", 1)]),
+    (1953, 1, "Argentine", "18 Jan 1953", [("Ascari", "Ferrari", 1)]),
+]
+
+
+def test_lote_igual_que_fecha_por_fecha():
+    consultas = Consultas(ganadores(CARRERAS))
+    meses = [mes for mes in range(1, 13) for _ in range(DIAS_POR_MES[mes - 1])]
+    dias = [dia for mes in range(1, 13) for dia in range(1, DIAS_POR_MES[mes - 1] + 1)]
+    lote = consultas.cumpleanos_lote(meses, dias)
+    assert len(lote) == len(meses)
+    assert lote["valida"].all()
+
+    for (mes, dia), fila in zip(zip(meses, dias), lote.itertuples(index=False)):
+        del_dia = consultas.carreras_del_dia(mes, dia)
+        assert fila.carreras_ese_dia == len(del_dia)
+        if len(del_dia):
+            primera = del_dia.iloc[0]
+            assert (fila.ganador, fila.escuderia, fila.fecha_gp) == (
+                primera["Winner"], primera["Team"], primera["Date_Parsed"].strftime("%Y-%m-%d"))
+        else:
+            assert fila.ganador == ""
+        cercana = consultas.carrera_mas_cercana(mes, dia)
+        assert (fila.cercana_ganador, fila.cercana_fecha_gp) == (
+            cercana["Winner"], cercana["Date_Parsed"].strftime("%Y-%m-%d"))
+
+
+def test_distancia_da_la_vuelta_por_anio_nuevo():
+    consultas = Consultas(ganadores(CARRERAS))
+    lote = consultas.cumpleanos_lote([1, 5, 5], [2, 13, 17])
+    assert lote["dias_de_distancia"].tolist() == [3, 0, 4]
+    assert lote["cercana_fecha_gp"].tolist() == ["1952-12-30", "1950-05-13", "1950-05-13"]
+
+
+def test_fechas_invalidas():
+    consultas = Consultas(ganadores(CARRERAS))
+    lote = consultas.cumpleanos_lote([2, 2, 4, 13, 0], [29, 30, 31, 1, 0])
+    assert lote["valida"].tolist() == [True, False, False, False, False]
+    assert lote["dias_de_distancia"].tolist()[1:] == [-1, -1, -1, -1]
+    assert (lote["cercana_ganador"].iloc[1:] == "").all()
+
+
+def test_sin_carreras():
+    consultas = Consultas(ganadores(CARRERAS).iloc[:0])
+    lote = consultas.cumpleanos_lote(np.array([5]), np.array([13]))
+    assert lote["carreras_ese_dia"].tolist() == [0]
+    assert lote["cercana_ganador"].tolist() == [""]
+
+
+def test_csv_con_fechas_en_varios_lotes():
+    consultas = Consultas(ganadores(CARRERAS))
+    entrada = io.StringIO("nombre,fecha\nAna,1990-05-13\nBeto,2000-02-29\nCiro,no sé\nDino,1985-01-02\n")
+    salida = io.StringIO()
+    assert cumpleanos_csv.procesar(consultas, entrada, salida, 3) == 4
+    resultado = pd.read_csv(io.StringIO(salida.getvalue()), keep_default_na=False)
+    assert resultado["nombre"].tolist() == ["Ana", "Beto", "Ciro", "Dino"]
+    assert resultado["valida"].tolist() == [True, True, False, True]
+    assert resultado["carreras_ese_dia"].tolist() == [2, 0, 0, 0]
+    assert resultado["cercana_ganador"].tolist() == ["Farina", "Ascari", "", "Ascari"]
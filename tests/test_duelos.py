@@ -0,0 +1,73 @@
+# ===================== CARA A CARA (f1_duelos.py) =====================
+# Los no clasificados (Position vacía en el almacén) quedan detrás de cualquier clasificado, y cada par de la
+# matriz tiene que dar lo mismo que cruzar los resultados a mano.
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from datos_prueba import resultados
+from f1_duelos import MatrizDuelos
+
+CARRERAS = [
+    (1970, 1, "British", "10 May 1970", [("Ana", "Roja", 1), ("Beto", "Azul", 2), ("Ciro", "Roja", None)]),
+    (1970, 2, "Monaco", "24 May 1970", [("Beto", "Azul", 1), ("Ciro", "Roja", 2), ("Ana", "Roja", None)]),
+    (1971, 1, "Swiss", "9 May 1971", [("Ana", "Roja", 1), ("Dino", "Verde", 2)]),
+]
+
+
+def test_no_clasificado_queda_detras():
+    matriz = MatrizDuelos(resultados(CARRERAS), "Driver")
+    assert not matriz.solo_ganadores
+
+    duelo = matriz.duelo("Ana", "Beto")
+    assert (duelo["carreras"], duelo["delante_a"], duelo["delante_b"]) == (2, 1, 1)
+    duelo = matriz.duelo("Ana", "Ciro")
+    assert (duelo["carreras"], duelo["delante_a"], duelo["delante_b"]) == (2, 1, 1)
+    assert duelo["tabla"]["Ana"].tolist() == ["1", "NC"]
+    assert duelo["tabla"]["Ciro"].tolist() == ["NC", "2"]
+
+
+def test_par_sin_carreras_en_comun():
+    matriz = MatrizDuelos(resultados(CARRERAS), "Driver")
+    assert matriz.duelo("Beto", "Dino") == {"carreras": 0, "delante_a": 0, "delante_b": 0, "tabla": None}
+
+
+def test_escuderias_cuenta_el_mejor_auto():
+    matriz = MatrizDuelos(resultados(CARRERAS), "Team")
+    duelo = matriz.duelo("Roja", "Azul")
+    assert (duelo["carreras"], duelo["delante_a"], duelo["delante_b"]) == (2, 1, 1)
+    assert duelo["tabla"]["Roja"].tolist() == ["1", "2"]
+
+
+def test_victorias_por_temporada():
+    tabla = MatrizDuelos(resultados(CARRERAS), "Driver").victorias_por_temporada("Ana", "Beto")
+    assert tabla.to_dict("index") == {1970: {"Ana": 1, "Beto": 1}, 1971: {"Ana": 1, "Beto": 0}}
+
+
+# Comparo todos los pares contra un cruce a mano, con carreras al azar y no clasificados
+def test_igual_que_cruzar_a_mano():
+    rng = np.random.default_rng(7)
+    pilotos = [f"P{i}" for i in range(12)]
+    carreras = []
+    for ronda in range(1, 31):
+        participantes = rng.choice(pilotos, size=rng.integers(2, 9), replace=False)
+        posiciones = list(range(1, len(participantes) + 1))
+        filas = [(p, f"E{int(p[1:]) % 4}", pos if rng.random() > 0.3 else None)
+                 for p, pos in zip(participantes, posiciones)]
+        carreras.append((1980 + ronda // 16, ronda % 16 + 1, f"GP {ronda}", f"{ronda % 28 + 1} Jun 1980", filas))
+    df = resultados(carreras)
+    matriz = MatrizDuelos(df, "Driver")
+
+    posicion = {}
+    for fila in df.itertuples():
+        clave = (fila.Year, fila.Round)
+        valor = 99 if pd.isna(fila.Position) else int(fila.Position)
+        posicion.setdefault(clave, {})[fila.Driver] = valor
+    for a, b in itertools.permutations(sorted(set(df["Driver"])), 2):
+        comunes = [c for c in posicion.values() if a in c and b in c]
+        duelo = matriz.duelo(a, b)
+        assert duelo["carreras"] == len(comunes)
+        assert duelo["delante_a"] == sum(c[a] < c[b] for c in comunes)
+        assert duelo["delante_b"] == sum(c[b] < c[a] for c in comunes)
@@ -0,0 +1,41 @@
+# ===================== MAPA YA SERIALIZADO (f1_graficos.py) =====================
+# MapaSerializado reemplaza al Deck de pydeck en st.pydeck_chart. Si otra versión de Streamlit o de pydeck le
+# pide otra cosa al Deck, esta prueba lo nota: lo que llega al navegador tiene que ser igual con los dos.
+
+import json
+
+from streamlit.testing.v1 import AppTest
+
+from f1_graficos import TOOLTIP_MAPA, MapaSerializado
+
+
+def app_con_los_dos_mapas():
+    import pandas as pd
+    import streamlit as st
+
+    from f1_graficos import deck_circuitos, mapa_circuitos
+    from f1_mapa import JerarquiaClusters
+
+    puntos = pd.DataFrame({"Nombre": ["Monza", "Imola"], "Lat": [45.62, 44.34], "Lon": [9.28, 11.71],
+                           "País": ["Italia", "Italia"], "Carreras": [70, 30]})
+    jerarquia = JerarquiaClusters(puntos)
+    st.pydeck_chart(deck_circuitos(jerarquia.vista(5, 45, 10), 5, 45, 10))
+    st.pydeck_chart(mapa_circuitos(jerarquia, 5, 45, 10))
+
+
+def test_pydeck_chart_manda_lo_mismo_que_con_el_deck():
+    at = AppTest.from_function(app_con_los_dos_mapas)
+    at.run()
+    assert not at.exception
+    deck, serializado = (elemento.proto for elemento in at.get("deck_gl_json_chart"))
+    assert json.loads(serializado.json) == json.loads(deck.json)
+    assert json.loads(serializado.tooltip) == json.loads(deck.tooltip) == TOOLTIP_MAPA
+    assert serializado.mapbox_token == deck.mapbox_token
+    # El JSON compacto, que es para lo que existe
+    assert len(serializado.json) < len(deck.json)
+
+
+def test_mapa_serializado_desde_el_paquete():
+    mapa = MapaSerializado('{"layers":[]}', TOOLTIP_MAPA, 0)
+    assert mapa.to_json() == '{"layers":[]}'
+    assert mapa.tooltip == TOOLTIP_MAPA
@@ -0,0 +1,135 @@
+# ===================== ÍNDICES (f1_indices.py) =====================
+# El índice de cumpleaños tiene que dar lo mismo que recorrer todas las carreras a mano (incluida la vuelta
+# por Año Nuevo y los empates), y el buscador tiene que encontrar nombres sin tildes, por prefijos y con
+# errores de tipeo.
+
+import numpy as np
+import pandas as pd
+
+from datos_prueba import ganadores
+from f1_indices import DIAS_DEL_ANIO, DIAS_POR_MES, IndiceBusqueda, IndiceCumpleanos, IndiceEntidades, dia_del_anio
+
+CARRERAS = [
+    (1950, 1, "British", "13 May 1950", [("Farina", "Alfa Romeo", 1)]),
+    (1950, 2, "Monaco", "21 May 1950", [("Fangio", "Alfa Romeo", 1)]),
+    (1951, 1, "Swiss", "13 May 1951", [("Fangio", "Alfa Romeo", 1)]),
+    (1952, 1, "Argentine", "30 Dec 1952", [("Ascari", "Ferrari", 1)]),
+    (1953, 1, "Argentine", "18 Jan 1953", [("Ascari", "Ferrari", 1)]),
+    (1953, 2, "Dutch", "7 Jun 1953", [("Ascari", "Ferrari", 1)]),
+    (1954, 1, "Belgian", "17 Jun 1954", [("González", "Ferrari", 1)]),
+]
+
+
+def indice():
+    df = ganadores(CARRERAS)
+    return df, IndiceCumpleanos(df["Date_Parsed"])
+
+
+# La respuesta "a mano": la carrera con menor distancia en el calendario (dando la vuelta por Año Nuevo),
+# en empate la del día anterior al cumpleaños y dentro del mismo día la más vieja
+def mas_cercana_a_mano(df, mes, dia):
+    objetivo = dia_del_anio(mes, dia)
+    mejor = None
+    for pos, fecha in enumerate(df["Date_Parsed"]):
+        diferencia = dia_del_anio(fecha.month, fecha.day) - objetivo
+        distancia = min(abs(diferencia), DIAS_DEL_ANIO - abs(diferencia))
+        antes = (objetivo - dia_del_anio(fecha.month, fecha.day)) % DIAS_DEL_ANIO <= DIAS_DEL_ANIO // 2
+        clave = (distancia, not antes, fecha)
+        if mejor is None or clave < mejor[0]:
+            mejor = (clave, pos)
+    return mejor[1]
+
+
+def test_exactas_en_orden_cronologico():
+    df, cumpleanos = indice()
+    assert df["Grand Prix"].iloc[cumpleanos.exactas(5, 13)].tolist() == ["British", "Swiss"]
+    assert len(cumpleanos.exactas(5, 14)) == 0
+
+
+def test_mas_cercana_da_la_vuelta_por_anio_nuevo():
+    df, cumpleanos = indice()
+    # El 2 de enero queda a 3 días del 30 de diciembre y a 16 del 18 de enero
+    assert df["Date"].iloc[cumpleanos.mas_cercana(1, 2)] == "30 Dec 1952"
+    assert df["Date"].iloc[cumpleanos.mas_cercana(12, 31)] == "30 Dec 1952"
+
+
+def test_mas_cercana_empate_queda_en_la_anterior():
+    df, cumpleanos = indice()
+    # El 17 de mayo está a 4 días del 13 y del 21: gana el 13, y de ese día la carrera de 1950
+    assert df["Date"].iloc[cumpleanos.mas_cercana(5, 17)] == "13 May 1950"
+
+
+def test_lote_igual_que_a_mano():
+    df, cumpleanos = indice()
+    meses = np.array([mes for mes in range(1, 13) for _ in range(DIAS_POR_MES[mes - 1])])
+    dias = np.array([dia for mes in range(1, 13) for dia in range(1, DIAS_POR_MES[mes - 1] + 1)])
+
+    cantidad, primera = cumpleanos.exactas_lote(meses, dias)
+    cercanas = cumpleanos.mas_cercanas(meses, dias)
+    for mes, dia, n, pos, cercana in zip(meses, dias, cantidad, primera, cercanas):
+        exactas = cumpleanos.exactas(int(mes), int(dia))
+        assert n == len(exactas)
+        assert pos == (exactas[0] if len(exactas) else -1)
+        assert cercana == mas_cercana_a_mano(df, int(mes), int(dia)), (mes, dia)
+
+
+def test_indice_vacio():
+    cumpleanos = IndiceCumpleanos(pd.Series([], dtype="datetime64[ms]"))
+    assert cumpleanos.mas_cercana(5, 13) is None
+    assert len(cumpleanos.exactas(5, 13)) == 0
+
+
+def test_entidades_numera_las_victorias():
+    entidades = IndiceEntidades(ganadores(CARRERAS), "Winner", ["Year", "Grand Prix"])
+    assert entidades.opciones == ("Ascari", "Fangio", "Farina", "González")
+    tabla = entidades.victorias("Ascari")
+    assert tabla.index.tolist() == [1, 2, 3]
+    assert tabla["Grand Prix"].tolist() == ["Argentine", "Argentine", "Dutch"]
+    assert entidades.victorias("Nadie") is None
+    # Con más victorias primero
+    assert entidades.busqueda.buscar("")[:2] == ["Ascari", "Fangio"]
+
+
+# ===================== BUSCADOR =====================
+
+NOMBRES = ["Juan Manuel Fangio", "José Froilán González", "Giuseppe Farina", "Alberto Ascari", "Jochen Rindt"]
+PESOS = [24, 2, 5, 13, 6]
+
+
+def test_sin_consulta_devuelve_el_ranking():
+    busqueda = IndiceBusqueda(NOMBRES, PESOS)
+    assert busqueda.buscar("", k=3) == ["Juan Manuel Fangio", "Alberto Ascari", "Jochen Rindt"]
+    # Sin pesos, alfabético (sin tildes)
+    assert IndiceBusqueda(["Óscar", "Ana", "Nino"]).buscar("") == ["Ana", "Nino", "Óscar"]
+
+
+def test_sin_tildes_ni_mayusculas():
+    busqueda = IndiceBusqueda(NOMBRES, PESOS)
+    assert busqueda.buscar("JOSE FROILAN")[0] == "José Froilán González"
+    assert busqueda.buscar("gonzález")[0] == "José Froilán González"
+
+
+def test_prefijos_de_cada_palabra():
+    busqueda = IndiceBusqueda(NOMBRES, PESOS)
+    assert busqueda.buscar("fan")[0] == "Juan Manuel Fangio"
+    assert busqueda.buscar("j m fangio")[0] == "Juan Manuel Fangio"
+    # "j" solo: los que tienen alguna palabra con j, por ranking
+    assert busqueda.buscar("j", k=3) == ["Juan Manuel Fangio", "Jochen Rindt", "José Froilán González"]
+
+
+def test_primero_los_que_empiezan_con_la_consulta():
+    busqueda = IndiceBusqueda(["Pedro Rodríguez", "Ricardo Rodríguez", "Rodrigo Pérez"], [7, 1, 0])
+    assert busqueda.buscar("rodri") == ["Rodrigo Pérez", "Pedro Rodríguez", "Ricardo Rodríguez"]
+
+
+def test_error_de_tipeo_por_trigramas():
+    busqueda = IndiceBusqueda(NOMBRES, PESOS)
+    assert busqueda.buscar("fango")[0] == "Juan Manuel Fangio"
+    assert busqueda.buscar("ascrai")[0] == "Alberto Ascari"
+    assert busqueda.buscar("xyzzy") == []
+
+
+def test_k_limita_los_resultados():
+    busqueda = IndiceBusqueda(NOMBRES, PESOS)
+    assert len(busqueda.buscar("j", k=2)) == 2
+    assert len(busqueda.buscar("", k=50)) == len(NOMBRES)
@@ -0,0 +1,68 @@
+# ===================== MAPA (f1_mapa.py) =====================
+# Cada nivel de la jerarquía tiene que conservar las carreras de todos los circuitos, y una vista cerca de ±180°
+# de longitud tiene que traer también los grupos del otro lado del antimeridiano.
+
+import numpy as np
+import pandas as pd
+
+from f1_mapa import ZOOMS, JerarquiaClusters, mercator, mercator_inversa
+
+PUNTOS = pd.DataFrame({
+    "Nombre": ["Monza", "Imola", "Mugello", "Silverstone", "Suzuka", "Fuji", "Auckland", "Apia"],
+    "Lat": [45.62, 44.34, 43.99, 52.07, 34.84, 35.37, -36.85, -13.83],
+    "Lon": [9.28, 11.71, 11.37, -1.02, 136.54, 138.93, 174.76, -171.76],
+    "País": ["Italia", "Italia", "Italia", "Reino Unido", "Japón", "Japón", "Nueva Zelanda", "Samoa"],
+    "Carreras": [70, 30, 1, 58, 33, 2, 1, 1],
+})
+
+
+def test_mercator_ida_y_vuelta():
+    x, y = mercator(PUNTOS["Lat"], PUNTOS["Lon"])
+    lat, lon = mercator_inversa(x, y)
+    assert np.allclose(lat, PUNTOS["Lat"]) and np.allclose(lon, PUNTOS["Lon"])
+
+
+def test_cada_nivel_conserva_las_carreras():
+    jerarquia = JerarquiaClusters(PUNTOS)
+    total = PUNTOS["Carreras"].sum()
+    anteriores = 1
+    for zoom in (*ZOOMS, ZOOMS[-1] + 1):
+        grupos = jerarquia.nivel(zoom)
+        assert grupos["Carreras"].sum() == total
+        # Con más zoom nunca hay menos grupos
+        assert len(grupos) >= anteriores
+        anteriores = len(grupos)
+    assert len(jerarquia.nivel(ZOOMS[-1] + 1)) == len(PUNTOS)
+
+
+def test_grupo_con_el_circuito_principal_primero():
+    grupos = JerarquiaClusters(PUNTOS).nivel(2)
+    italia = grupos[grupos["Tooltip"].str.contains("Monza")].iloc[0]
+    assert italia["Carreras"] >= 101
+    assert italia["Tooltip"].split("\n")[1].startswith("Monza")
+
+
+def test_nivel_entre_zooms():
+    jerarquia = JerarquiaClusters(PUNTOS)
+    assert jerarquia.nivel(0) is jerarquia.niveles[ZOOMS[0]]
+    assert jerarquia.nivel(3.5) is jerarquia.niveles[3]
+
+
+def test_centro_del_pais_en_su_circuito_principal():
+    jerarquia = JerarquiaClusters(PUNTOS)
+    assert jerarquia.centros["Italia"] == (45.62, 9.28)
+    assert list(jerarquia.centros)[0] == "Italia"
+
+
+def test_vista_da_la_vuelta_por_el_antimeridiano():
+    jerarquia = JerarquiaClusters(PUNTOS)
+    # Centrada en 179°: Apia (-171.76°) queda a 9° y se dibuja corrida a 188.24°
+    vista = jerarquia.vista(4, -25, 179)
+    assert any(vista["Tooltip"].str.startswith("Apia"))
+    assert any(vista["Tooltip"].str.startswith("Auckland"))
+    apia = vista[vista["Tooltip"].str.startswith("Apia")].iloc[0]
+    assert abs(apia["Lon"] - (360 - 171.76)) < 0.01
+    # Lejos del antimeridiano no se corre nada y no entra Europa
+    vista = jerarquia.vista(4, 45, 10)
+    assert not any(vista["Tooltip"].str.contains("Apia|Suzuka"))
+    assert (vista["Lon"].abs() <= 180).all()
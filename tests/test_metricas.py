@@ -0,0 +1,67 @@
+# ===================== MÉTRICAS POR SECCIÓN (f1_metricas.py) =====================
+# Los bytes se cuentan envolviendo ScriptRunContext._enqueue, que es interno de Streamlit (por eso el rango de
+# versiones en requirements.txt). Si una versión nueva lo cambia, las métricas siguen andando sin bytes; esta
+# prueba es la que avisa: cada mensaje que manda una sección tiene que quedar contado, con sus bytes.
+
+import json
+import os
+
+from streamlit.testing.v1 import AppTest
+
+import f1_metricas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "f_1_birthday_gp_app.py")
+
+
+def app_con_tres_mensajes():
+    import streamlit as st
+
+    import f1_metricas
+
+    f1_metricas.iniciar()
+    f1_metricas.empezar("tres", filas=3)
+    st.markdown("uno")
+    st.markdown("dos")
+    st.markdown("tres " * 100)
+    f1_metricas.empezar("vacia")
+    f1_metricas.terminar()
+
+
+def test_cuenta_un_mensaje_por_elemento(tmp_path, monkeypatch):
+    monkeypatch.setenv("F1_DEBUG", "1")
+    monkeypatch.setattr(f1_metricas, "LOG", str(tmp_path / "metricas.jsonl"))
+    at = AppTest.from_function(app_con_tres_mensajes)
+    at.run()
+    assert not at.exception
+    tres, vacia = at.session_state["_metricas"]
+    assert (tres["seccion"], tres["filas"], tres["mensajes"]) == ("tres", 3, 3)
+    assert tres["bytes"] > 500
+    assert (vacia["mensajes"], vacia["bytes"]) == (0, 0)
+
+    lineas = [json.loads(linea) for linea in (tmp_path / "metricas.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [linea["seccion"] for linea in lineas] == ["tres", "vacia"]
+    assert lineas[0]["bytes"] == tres["bytes"]
+
+
+def test_apagadas_no_miden_nada(tmp_path, monkeypatch):
+    monkeypatch.delenv("F1_DEBUG", raising=False)
+    monkeypatch.setattr(f1_metricas, "LOG", str(tmp_path / "metricas.jsonl"))
+    at = AppTest.from_function(app_con_tres_mensajes)
+    at.run()
+    assert not at.exception
+    assert list(at.session_state["_metricas"]) == []
+    assert not (tmp_path / "metricas.jsonl").exists()
+
+
+def test_todas_las_secciones_de_la_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("F1_DEBUG", "1")
+    monkeypatch.setattr(f1_metricas, "LOG", str(tmp_path / "metricas.jsonl"))
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    assert not at.exception
+    metricas = list(at.session_state["_metricas"])
+    assert {"intro", "datos", "top5", "mapa"} <= {m["seccion"] for m in metricas}
+    for metrica in metricas:
+        assert metrica["bytes"] is not None and metrica["mensajes"] is not None, metrica
+    assert sum(m["mensajes"] for m in metricas) > 0
@@ -0,0 +1,133 @@
+# ===================== PUNTOS DEL CAMPEONATO (f1_puntos.py) =====================
+# Cada regla de época con una temporada chica armada a mano, y agregar una carrera contra recalcular todo.
+
+import pandas as pd
+
+from datos_prueba import resultados
+from f1_puntos import Campeonatos, calcular
+from f1_temporadas import Temporada
+
+FECHAS = ["7 May", "14 May", "21 May", "28 May", "4 Jun", "11 Jun", "18 Jun", "25 Jun", "2 Jul", "9 Jul", "16 Jul"]
+
+
+def carrera(year, ronda, participaciones, gp=None):
+    return (year, ronda, gp or f"GP {ronda}", f"{FECHAS[ronda - 1]} {year}", participaciones)
+
+
+def puntos(tabla, year, columna="Piloto"):
+    filas = tabla[tabla["Year"] == year]
+    return dict(zip(filas[columna], filas["Puntos"]))
+
+
+def test_tabla_y_vuelta_rapida_de_los_50():
+    df = resultados([carrera(1950, 1, [("A", "X", 1, 1, True), ("B", "Y", 2, 2, False), ("C", "X", 3, 3, False),
+                                       ("D", "Y", 4, 4, False), ("E", "Z", 5, 5, False), ("F", "Z", 6, 6, False)])])
+    pilotos, escuderias = calcular(df)
+    assert puntos(pilotos, 1950) == {"A": 9, "B": 6, "C": 4, "D": 3, "E": 2}
+    assert escuderias.empty  # todavía no había campeonato de constructores
+
+
+def test_vuelta_rapida_compartida_se_reparte_aunque_no_termine():
+    df = resultados([carrera(1954, 1, [("A", "X", 1, 1, True), ("B", "Y", 2, 2, True), ("C", "X", None, 3, True)])])
+    assert puntos(calcular(df)[0], 1954) == {"A": 8.33, "B": 6.33, "C": 0.33}
+
+
+def test_sin_dato_de_vuelta_rapida_no_hay_punto():
+    df = resultados([carrera(1955, 1, [("A", "X", 1, 1, None), ("B", "Y", 2, 2, None)])])
+    assert puntos(calcular(df)[0], 1955) == {"A": 8, "B": 6}
+    assert Temporada(1955, df).sin_vuelta_rapida
+    assert not Temporada(1960, resultados([carrera(1960, 1, [("A", "X", 1, 1, None), ("B", "Y", 2, 2, None)])])).sin_vuelta_rapida
+
+
+def test_auto_compartido_se_divide_hasta_1957_y_no_suma_desde_1958():
+    compartido = [("A", "X", 1, 4, False), ("B", "X", 1, 4, False), ("C", "Y", 2, 8, False)]
+    assert puntos(calcular(resultados([carrera(1956, 1, compartido)]))[0], 1956) == {"A": 4, "B": 4, "C": 6}
+    pilotos, escuderias = calcular(resultados([carrera(1958, 1, compartido)]))
+    assert puntos(pilotos, 1958) == {"C": 6, "A": 0, "B": 0}
+    assert puntos(escuderias, 1958, "Escudería") == {"X": 8, "Y": 6}
+
+
+def test_solo_cuentan_los_mejores_resultados():
+    df = resultados([carrera(1950, r, [("A", "X", 1, 1, False), ("B", "Y", 2, 2, False)]) for r in range(1, 7)])
+    pilotos = calcular(df)[0].set_index("Piloto")
+    assert pilotos.loc["A", "Puntos"] == 4 * 8 and pilotos.loc["A", "Puntos brutos"] == 6 * 8
+    assert pilotos.loc["B", "Puntos"] == 4 * 6
+
+
+def test_mejores_resultados_por_mitades():
+    # 1967: los 5 mejores de la primera mitad (rondas 1 a 5 de 10) y los 4 mejores de la segunda
+    df = resultados([carrera(1967, r, [("A", "X", 1, 1, False), ("B", "Y", 2, 2, False)]) for r in range(1, 11)])
+    pilotos = calcular(df)[0].set_index("Piloto")
+    assert pilotos.loc["A", "Puntos"] == 5 * 9 + 4 * 9
+    assert pilotos.loc["A", "Puntos brutos"] == 10 * 9
+
+
+def test_constructores_mejor_auto_hasta_1978_y_todos_desde_1979():
+    participaciones = [("A", "X", 1, 1, False), ("B", "X", 2, 2, False), ("C", "Y", 3, 3, False)]
+    assert puntos(calcular(resultados([carrera(1978, 1, participaciones)]))[1], 1978, "Escudería") == {"X": 9, "Y": 4}
+    assert puntos(calcular(resultados([carrera(1979, 1, participaciones)]))[1], 1979, "Escudería") == {"X": 15, "Y": 4}
+
+
+def test_indianapolis_no_cuenta_para_constructores():
+    df = resultados([
+        carrera(1958, 1, [("A", "X", 1, 1, False), ("B", "Y", 2, 2, False)]),
+        carrera(1958, 2, [("I", "Indy", 1, 9, False), ("B", "Y", 2, 2, False)], gp="Indianapolis 500"),
+    ])
+    pilotos, escuderias = calcular(df)
+    assert puntos(pilotos, 1958) == {"A": 8, "B": 12, "I": 8}
+    assert puntos(escuderias, 1958, "Escudería") == {"X": 8, "Y": 6}
+
+
+def test_vuelta_rapida_2019_solo_entre_los_10_primeros():
+    arriba = [("A", "X", 1, 1, True)] + [(f"P{i}", "Y", i, i, False) for i in range(2, 12)]
+    abajo = [("A", "X", 1, 1, False)] + [(f"P{i}", "Y", i, i, i == 11) for i in range(2, 12)]
+    pilotos, escuderias = calcular(resultados([carrera(2019, 1, arriba), carrera(2019, 2, abajo)]))
+    assert puntos(pilotos, 2019)["A"] == 25 + 1 + 25
+    assert "P11" not in puntos(pilotos, 2019)
+    assert puntos(escuderias, 2019, "Escudería")["X"] == 51  # desde 2019 también suma para la escudería
+    assert puntos(calcular(resultados([carrera(2025, 1, arriba)]))[0], 2025)["A"] == 25
+
+
+def test_carrera_suspendida_da_la_mitad():
+    df = resultados([carrera(2009, 2, [("A", "X", 1, 1, True), ("B", "Y", 2, 2, False)], gp="Malaysian")])
+    assert puntos(calcular(df)[0], 2009) == {"A": 5, "B": 4}
+
+
+def test_empate_se_desempata_por_victorias_y_si_no_comparten_puesto():
+    # A: una victoria (9); B: 2º y 4º (6 + 3) -> mismos puntos, A adelante por victorias
+    df = resultados([
+        carrera(1961, 1, [("A", "X", 1, 1, False), ("B", "Y", 2, 2, False)]),
+        carrera(1961, 2, [("C", "Z", 1, 3, False), ("B", "Y", 4, 2, False)]),
+    ])
+    tabla = calcular(df)[0]
+    assert tabla[["Piloto", "Puntos", "Posición"]].values.tolist() == [["A", 9, 1], ["C", 9, 1], ["B", 9, 3]]
+    # Mismos puntos y mismas victorias: comparten el puesto
+    df = resultados([carrera(1961, 1, [("A", "X", 1, 1, False), ("B", "Y", 2, 2, False)]),
+                     carrera(1961, 2, [("B", "Y", 1, 2, False), ("A", "X", 2, 1, False)])])
+    assert calcular(df)[0]["Posición"].tolist() == [1, 1]
+
+
+def test_agregar_una_carrera_da_lo_mismo_que_recalcular():
+    carreras = [carrera(1959, r, [("A", "X", 1, 1, r == 1), ("B", "Y", 2, 2, False), ("C", "X", 3, 3, False)])
+                for r in range(1, 5)]
+    carreras += [carrera(1960, 1, [("B", "Y", 1, 2, False), ("A", "X", 2, 1, False)])]
+    nueva = [carrera(1959, 5, [("C", "X", 1, 3, True), ("A", "X", 2, 1, False)])]
+    campeonato = Campeonatos(resultados(carreras)).con_carrera(resultados(nueva))
+    pilotos, escuderias = calcular(resultados(carreras + nueva))
+    pd.testing.assert_frame_equal(campeonato.pilotos, pilotos, check_dtype=False)
+    pd.testing.assert_frame_equal(campeonato.escuderias, escuderias, check_dtype=False)
+
+
+def test_sin_resultados():
+    pilotos, escuderias = calcular(resultados([]))
+    assert pilotos.empty and escuderias.empty
+
+
+# Del export de Ergast: rank == 1, o el menor tiempo si falta el rank; sin ninguno de los dos, no se sabe
+def test_vuelta_rapida_desde_ergast():
+    import f1_datos
+
+    df = pd.DataFrame({"raceId": [1, 1, 2, 2, 3, 3],
+                       "rank": [None, None, 2, 1, None, None],
+                       "fastestLapTime": [None, None, "1:30.100", "1:29.900", "1:05.500", "59.900"]})
+    assert f1_datos.vueltas_rapidas(df).tolist() == [pd.NA, pd.NA, False, True, False, True]
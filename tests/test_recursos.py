@@ -0,0 +1,25 @@
+# ===================== IMÁGENES (f1_recursos.py) =====================
+# Sin las versiones locales la portada sale del link original; con el manifiesto, de static/img/ con srcset.
+
+import json
+
+import f1_recursos
+
+
+def test_sin_manifiesto_usa_el_link_original(tmp_path, monkeypatch):
+    monkeypatch.setattr(f1_recursos, "ESTATICOS", str(tmp_path))
+    html = f1_recursos.html_imagen("portada", "Alfa Romeo 158")
+    assert f1_recursos.IMAGENES["portada"]["remota"] in html
+    assert f1_recursos.faltantes() == ["portada"]
+
+
+def test_con_manifiesto_usa_las_versiones_locales(tmp_path, monkeypatch):
+    monkeypatch.setattr(f1_recursos, "ESTATICOS", str(tmp_path))
+    variantes = [{"archivo": "portada-480.abc.webp", "ancho": 480, "alto": 300, "bytes": 1},
+                 {"archivo": "portada-960.def.webp", "ancho": 960, "alto": 600, "bytes": 2}]
+    (tmp_path / "manifest.json").write_text(json.dumps({"portada": {"variantes": variantes}}), encoding="utf-8")
+    html = f1_recursos.html_imagen("portada", "Alfa <158>")
+    assert "imgur" not in html
+    assert 'srcset="app/static/img/portada-480.abc.webp 480w, app/static/img/portada-960.def.webp 960w"' in html
+    assert "Alfa &lt;158&gt;" in html
+    assert f1_recursos.faltantes() == []
@@ -0,0 +1,43 @@
+# ===================== PRESUPUESTO DE TIEMPO DE LOS RERUNS =====================
+# La app antes dormía 3.5 s en cada rerun por la animación de la intro. Esta prueba corre la app sin navegador
+# (AppTest) y falla si un rerun con los cachés ya llenos tarda más que el presupuesto, así no vuelve a pasar.
+# Uso:
+#   python -m pytest -q tests/
+#   F1_PRESUPUESTO_RERUN=1.0 python -m pytest -q tests/       (otro presupuesto, en segundos)
+
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "f_1_birthday_gp_app.py")
+# Un rerun caliente tarda unos 65 ms; dejo margen para máquinas lentas pero muy lejos de los 3.5 s de antes
+PRESUPUESTO = float(os.environ.get("F1_PRESUPUESTO_RERUN", "0.5"))
+RERUNS = 5
+
+
+def test_rerun_caliente_dentro_del_presupuesto():
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()  # primera corrida: carga el almacén y llena los cachés
+    assert not at.exception
+
+    tiempos = []
+    for _ in range(RERUNS):
+        inicio = time.perf_counter()
+        at.run()
+        tiempos.append(time.perf_counter() - inicio)
+        assert not at.exception
+    # Tomo el mejor de varios para que una pausa del sistema no haga fallar la prueba; el sleep viejo no se salva
+    assert min(tiempos) < PRESUPUESTO, f"rerun en {min(tiempos):.3f} s (presupuesto {PRESUPUESTO} s): {tiempos}"
+    assert sorted(tiempos)[len(tiempos) // 2] < PRESUPUESTO * 2, f"mediana fuera del presupuesto: {tiempos}"
+
+
+def test_la_intro_se_manda_una_sola_vez():
+    at = AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    assert at.session_state["intro_vista"]
+    primera = sum("drive" in bloque.value for bloque in at.markdown)
+    at.run()
+    assert primera == 1
+    assert not any("drive" in bloque.value for bloque in at.markdown)
@@ -0,0 +1,83 @@
+# ===================== TRIVIA (f1_trivia.py) =====================
+# Cada pregunta del banco tiene cuatro opciones distintas con la respuesta entre ellas, el banco sale igual con
+# la misma semilla y una partida nunca repite preguntas.
+
+import itertools
+
+import pyarrow as pa
+
+from datos_prueba import resultados
+from f1_trivia import OPCIONES, PREGUNTAS_POR_PARTIDA, ESQUEMA_TRIVIA, BancoTrivia, generar
+
+PILOTOS = [("Ana", "Roja"), ("Beto", "Azul"), ("Ciro", "Verde"), ("Dino", "Negra"), ("Eva", "Roja"), ("Fede", "Azul")]
+GPS = ["British", "Monaco", "Italian", "Belgian"]
+MESES = ["May", "Jun", "Jul", "Sep"]
+
+
+def carreras():
+    rotacion = itertools.count()
+    lista = []
+    for year in range(1958, 1964):
+        for ronda, (gp, mes) in enumerate(zip(GPS, MESES), start=1):
+            inicio = next(rotacion) % len(PILOTOS)
+            orden = PILOTOS[inicio:] + PILOTOS[:inicio]
+            lista.append((year, ronda, gp, f"10 {mes} {year}",
+                          [(piloto, escuderia, posicion) for posicion, (piloto, escuderia) in enumerate(orden, start=1)]))
+    return lista
+
+
+def banco(semilla=0):
+    return generar(resultados(carreras()), semilla=semilla)
+
+
+def test_opciones_distintas_con_la_respuesta():
+    tabla = banco()
+    assert tabla.schema.equals(ESQUEMA_TRIVIA)
+    trivia = BancoTrivia(tabla)
+    assert len(trivia) > 0
+    tipos = set()
+    for i in range(len(trivia)):
+        pregunta = trivia.pregunta(i)
+        tipos.add(pregunta["tipo"])
+        assert len(set(pregunta["opciones"])) == OPCIONES, pregunta
+        assert pregunta["respuesta"] in pregunta["opciones"]
+    # Con todas las posiciones también hay preguntas de campeones
+    assert {"ganador_gp", "escuderia_gp", "campeon", "primera_victoria"} <= tipos
+
+
+def test_respuestas_de_los_datos():
+    trivia = BancoTrivia(banco())
+    preguntas = [trivia.pregunta(i) for i in range(len(trivia))]
+    ganador = next(p for p in preguntas if p["pregunta"] == "¿Quién ganó el GP de Reino Unido de 1958?")
+    assert ganador["respuesta"] == "Ana"
+    escuderia = next(p for p in preguntas if p["pregunta"] == "¿Con qué escudería ganó Beto el GP de Mónaco de 1958?")
+    assert escuderia["respuesta"] == "Azul"
+
+
+def test_misma_semilla_mismo_banco():
+    assert banco(1).equals(banco(1))
+    assert not banco(1).equals(banco(2))
+
+
+def test_tipos_en_tramos_contiguos():
+    trivia = BancoTrivia(banco())
+    tipos = trivia.tabla.column("tipo").to_pylist()
+    assert [a for a, b in trivia.tramos] == [0] + [i for i in range(1, len(tipos)) if tipos[i] != tipos[i - 1]]
+    assert trivia.tramos[-1][1] == len(tipos)
+
+
+def test_partida_sin_repetir_y_repetible():
+    trivia = BancoTrivia(banco())
+    for semilla in range(20):
+        partida = trivia.partida(semilla)
+        assert len(partida) == PREGUNTAS_POR_PARTIDA
+        assert len({p["pregunta"] for p in partida}) == PREGUNTAS_POR_PARTIDA
+        assert partida == trivia.partida(semilla)
+    assert trivia.partida(0) != trivia.partida(1)
+
+
+def test_partida_con_banco_chico():
+    trivia = BancoTrivia(banco().slice(0, 3))
+    assert len(trivia.partida(0)) == 3
+    vacio = BancoTrivia(pa.Table.from_pylist([], schema=ESQUEMA_TRIVIA))
+    assert vacio.partida(0) == []